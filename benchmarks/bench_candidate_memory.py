@@ -0,0 +1,113 @@
+"""
+Память на кандидата при загрузке из БД: словари RealDictCursor и обычный
+Candidate против кортежей и Candidate со __slots__.
+
+Строки запроса генерируются заранее, поэтому учитываются только объекты,
+которые создает загрузка (сами значения колонок общие в обоих случаях).
+
+Запуск из корня репозитория:
+    python benchmarks/bench_candidate_memory.py [--count 500000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import RealDictRow
+
+from database.models import Candidate
+
+
+class LegacyCandidate:
+    """Прежняя модель кандидата с __dict__"""
+    def __init__(self, data=None):
+        data = data or {}
+        self.filename = data.get('filename', '')
+        self.fio = data.get('fio', 'ФИО не указано')
+        self.age = data.get('age', 0)
+        self.experience = data.get('experience', 0)
+        self.education = data.get('education', 0)
+        self.salary = data.get('salary', 0)
+        self.about = data.get('about', '')
+        self.source_file = data.get('source_file', '')
+        self.original_category = data.get('original_category', 'Не подходит')
+        self.category_color = data.get('category_color', '#888')
+
+
+def make_rows(count):
+    return [
+        (f"resume_{i}.docx", f"Кандидат {i}", 20 + i % 40, i % 30, i % 5, 1000 * (i % 300),
+         "о себе " * 10, f"resumes/resume_{i}.docx", "Подходит" if i % 3 else "Не подходит", "#2ecc71",
+         (i % 100) / 100)
+        for i in range(count)
+    ]
+
+
+def load_legacy(rows):
+    """Как раньше: fetchall() RealDictCursor (RealDictRow на строку), затем словарь для конструктора"""
+    columns = Candidate.COLUMNS
+    results = [RealDictRow(zip(columns, values)) for values in rows]
+    candidates = {}
+    for row in results:
+        candidate = LegacyCandidate({
+            'filename': row['filename'],
+            'fio': row['fio'],
+            'age': row['age'],
+            'experience': row['experience'],
+            'education': row['education'],
+            'salary': row['salary'],
+            'about': row['about'],
+            'source_file': row['source_file'],
+            'original_category': row['status'],
+            'category_color': row['category_color']
+        })
+        candidates[row['filename']] = candidate
+    # Как в прежнем коде, строки запроса живут до конца загрузки
+    del results
+    return candidates
+
+
+def load_slotted(rows):
+    """Сейчас: кортежи сразу в Candidate.from_rows"""
+    return {c.filename: c for c in Candidate.from_rows(rows)}
+
+
+def measure(loader, rows):
+    """Время (без трассировки памяти), удерживаемая и пиковая память загрузки"""
+    gc.collect()
+    start = time.perf_counter()
+    result = loader(rows)
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = loader(rows)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=500000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.count)
+    print(f"Кандидатов: {args.count}\n")
+    print(f"{'Загрузка':<32} {'время, с':>9} {'байт/канд.':>11} {'пик, байт/канд.':>16}")
+    for title, loader in (("dict + Candidate с __dict__", load_legacy),
+                          ("кортежи + Candidate.__slots__", load_slotted)):
+        elapsed, current, peak = measure(loader, rows)
+        print(f"{title:<32} {elapsed:>9.2f} {current / args.count:>11.0f} {peak / args.count:>16.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
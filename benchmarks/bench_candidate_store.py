@@ -0,0 +1,135 @@
+"""
+Фильтрация кандидатов в памяти: построчная проверка и колонки CandidateStore.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_candidate_store.py [--count 1000000] [--checks 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.candidate_store import CandidateStore
+from database.models import Candidate
+
+
+STATUSES = ["Подходит", "Не подходит", "На рассмотрении"]
+
+
+def legacy_filter(candidates, filters):
+    """Прежняя построчная фильтрация FilterHandler._filter_in_memory (без формирования словарей)"""
+    filtered = []
+    for candidate in candidates.values():
+        if candidate.original_category == "Подходит" and not filters['show_suitable']:
+            continue
+        if candidate.original_category == "Не подходит" and not filters['show_not_suitable']:
+            continue
+        if filters['age_from'] > 0 and candidate.age < filters['age_from']:
+            continue
+        if filters['age_to'] > 0 and candidate.age > filters['age_to']:
+            continue
+        if filters['exp_from'] > 0 and candidate.experience < filters['exp_from']:
+            continue
+        if filters['exp_to'] > 0 and candidate.experience > filters['exp_to']:
+            continue
+        if candidate.salary:
+            if filters['sal_from'] > 0 and candidate.salary < filters['sal_from']:
+                continue
+            if filters['sal_to'] > 0 and candidate.salary > filters['sal_to']:
+                continue
+        if filters['education_levels'] and candidate.education not in filters['education_levels']:
+            continue
+        filtered.append(candidate)
+    return filtered
+
+
+def make_candidate(rng, i):
+    return Candidate({
+        'filename': f"resume_{i}.docx",
+        'fio': f"Кандидат {i}",
+        'age': rng.choice([0, rng.randint(18, 70)]),
+        'experience': rng.randint(0, 45),
+        'education': rng.randint(0, 4),
+        'salary': rng.choice([0, rng.randint(20000, 400000)]),
+        'original_category': rng.choice(STATUSES),
+    })
+
+
+def random_filters(rng):
+    return {
+        'show_suitable': rng.random() < 0.8,
+        'show_not_suitable': rng.random() < 0.8,
+        'age_from': rng.choice([0, rng.randint(18, 50)]),
+        'age_to': rng.choice([0, 100, rng.randint(25, 70)]),
+        'exp_from': rng.choice([0, rng.randint(0, 20)]),
+        'exp_to': rng.choice([0, 50, rng.randint(5, 40)]),
+        'sal_from': rng.choice([0, rng.randint(20000, 200000)]),
+        'sal_to': rng.choice([0, 9999999, rng.randint(50000, 400000)]),
+        'education_levels': set(rng.sample([1, 2, 3, 4], rng.randint(0, 4))),
+    }
+
+
+def measure(func, repeat=3):
+    """Лучшее время выполнения в миллисекундах"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--checks", type=int, default=200, help="случайных фильтров для проверки совпадения")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    plain = {}
+    store = CandidateStore()
+    for i in range(args.count):
+        candidate = make_candidate(rng, i)
+        plain[candidate.filename] = candidate
+        store[candidate.filename] = candidate
+
+    # Удаление и повторная вставка меняют порядок одинаково в словаре и в хранилище
+    for i in rng.sample(range(args.count), args.count // 10):
+        key = f"resume_{i}.docx"
+        candidate = plain.pop(key)
+        del store[key]
+        if i % 2:
+            plain[key] = candidate
+            store[key] = candidate
+
+    # Результаты должны совпадать, иначе сравнение скорости не имеет смысла
+    for _ in range(args.checks):
+        filters = random_filters(rng)
+        if legacy_filter(plain, filters) != store.filter(filters):
+            print(f"✗ Результаты различаются для фильтров {filters}")
+            return 1
+    print(f"✓ {args.checks} случайных фильтров дают одинаковый результат")
+
+    filters = {
+        'show_suitable': True, 'show_not_suitable': False,
+        'age_from': 25, 'age_to': 35, 'exp_from': 3, 'exp_to': 0,
+        'sal_from': 0, 'sal_to': 150000, 'education_levels': {3, 4},
+    }
+    legacy_ms = measure(lambda: legacy_filter(plain, filters))
+    mask_ms = measure(lambda: store.filter_mask(filters))
+    store_ms = measure(lambda: store.filter(filters))
+
+    print(f"\nКандидатов: {len(store)}, найдено: {len(store.filter(filters))}")
+    print(f"{'построчная проверка':<30} {legacy_ms:>10.1f} мс")
+    print(f"{'CandidateStore (маска)':<30} {mask_ms:>10.1f} мс")
+    print(f"{'CandidateStore (кандидаты)':<30} {store_ms:>10.1f} мс")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
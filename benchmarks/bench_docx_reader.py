@@ -0,0 +1,79 @@
+"""
+Сравнение скорости извлечения текста: python-docx и потоковый читатель.
+
+python-docx приложению не нужен и в зависимости не входит, для сравнения
+его нужно установить отдельно (pip install python-docx).
+
+Запуск из корня репозитория:
+    python benchmarks/bench_docx_reader.py [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.docx_reader import read_text
+
+
+def read_with_python_docx(path):
+    from docx import Document
+
+    doc = Document(path)
+    return "\n".join(p.text for p in doc.paragraphs)
+
+
+def measure(func, files, repeat):
+    """Среднее время обработки одного файла в миллисекундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in files:
+            func(path)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(files))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", default="resumes", help="директория с .docx")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.dir, "**", "*.docx"), recursive=True))
+    if not files:
+        print(f"Нет .docx файлов в {args.dir}")
+        return 1
+
+    try:
+        import docx  # noqa: F401
+    except ImportError:
+        print("Для сравнения нужен python-docx: pip install python-docx")
+        return 1
+
+    # Результаты должны совпадать, иначе сравнение скорости не имеет смысла
+    for path in files:
+        if read_with_python_docx(path) != read_text(path):
+            print(f"✗ Тексты различаются: {path}")
+            return 1
+
+    header_stop = lambda text: "о себе" in text.lower()
+
+    results = [
+        ("python-docx", measure(read_with_python_docx, files, args.repeat)),
+        ("docx_reader", measure(read_text, files, args.repeat)),
+        ("docx_reader (шапка)", measure(lambda p: read_text(p, stop_when=header_stop), files, args.repeat)),
+        ("docx_reader (+таблицы, надписи, колонтитулы)",
+         measure(lambda p: read_text(p, tables=True, textboxes=True, headers=True), files, args.repeat)),
+    ]
+
+    baseline = results[0][1]
+    print(f"Файлов: {len(files)}, повторов: {args.repeat}")
+    for name, ms in results:
+        print(f"  {name:<45} {ms:8.3f} мс/файл  x{baseline / ms:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
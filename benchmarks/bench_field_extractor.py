@@ -0,0 +1,128 @@
+"""
+Сравнение скорости извлечения полей резюме: отдельные re.search на каждое
+поле и однопроходный FieldExtractor.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_field_extractor.py [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.docx_reader import read_text
+from database.field_extractor import FieldExtractor
+
+
+class LegacyExtractor:
+    """Прежняя реализация ResumeParser._extract_* (без отладочного вывода)"""
+
+    def __init__(self, current_date):
+        self.current_date = current_date
+
+    def extract(self, text):
+        return {
+            'fio': self._extract_fio(text),
+            'age': self._extract_age(text),
+            'experience': self._extract_experience(text),
+            'education': self._extract_education(text),
+            'salary': self._extract_salary(text),
+            'about': self._extract_about_section(text),
+        }
+
+    def _extract_fio(self, text):
+        m = re.search(r'фио[:\s]*([^:\n]+)', text, re.IGNORECASE)
+        if m:
+            return m.group(1).strip().title()
+        for line in text.split('\n')[:6]:
+            line = line.strip()
+            if re.match(r'^[А-ЯЁ]{2,}\s+[А-ЯЁ]+\s+[А-ЯЁ]+', line, re.I):
+                return line.title()
+        return "ФИО не указано"
+
+    def _extract_age(self, text):
+        m = re.search(r'(\d{4})\s*(год\s*рождения|д\.р\.?)', text)
+        if m:
+            return self.current_date.year - int(m.group(1))
+        m = re.search(r'возраст[а]?:\s*(\d+)', text)
+        if m:
+            return int(m.group(1))
+        return 0
+
+    def _extract_experience(self, text):
+        m = re.search(r'(стаж|опыт\s*работы)[\s:]*(\d+)', text)
+        return int(m.group(2)) if m else 0
+
+    def _extract_education(self, text):
+        if re.search(r'ph\.?d|доктор', text):
+            return 4
+        if re.search(r'магистр|master', text):
+            return 3
+        if re.search(r'бакалавр|bachelor', text):
+            return 2
+        if re.search(r'среднее|колледж', text):
+            return 1
+        return 0
+
+    def _extract_salary(self, text):
+        m = re.search(r'(зарплат[аы]|salary)[\s:]*(\d+)', text)
+        return int(m.group(2)) if m else 0
+
+    def _extract_about_section(self, text):
+        for pat in [r'о\s*себе[:\s]*([^.?!]{20,})', r'личные\s*качества[:\s]*([^.?!]{20,})']:
+            m = re.search(pat, text, re.I | re.S)
+            if m:
+                return m.group(1).strip()[:300] + ("..." if len(m.group(1)) > 300 else "")
+        return ""
+
+
+def measure(extractor, texts, repeat):
+    """Среднее время извлечения полей из одного резюме в микросекундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            extractor.extract(text)
+    return (time.perf_counter() - start) * 1_000_000 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", default="resumes", help="директория с .docx")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.dir, "**", "*.docx"), recursive=True))
+    if not files:
+        print(f"Нет .docx файлов в {args.dir}")
+        return 1
+    texts = [read_text(path).lower() for path in files]
+
+    # Длинное резюме: поля в конце, перед ними несколько страниц опыта работы
+    filler = "участвовал в проектах компании, вел документацию, общался с клиентами\n" * 60
+    long_texts = [filler + text for text in texts]
+
+    now = datetime.now()
+    legacy = LegacyExtractor(now)
+    extractor = FieldExtractor(now)
+
+    for text in texts + long_texts:
+        if legacy.extract(text) != extractor.extract(text):
+            print("✗ Результаты извлечения различаются")
+            return 1
+
+    print(f"Резюме: {len(texts)}, повторов: {args.repeat}")
+    for name, sample in (("образцы из resumes/", texts), ("длинные резюме", long_texts)):
+        before = measure(legacy, sample, args.repeat)
+        after = measure(extractor, sample, args.repeat)
+        print(f"  {name:<22} было {before:8.1f} мкс  стало {after:8.1f} мкс  x{before / after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
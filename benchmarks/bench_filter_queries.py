@@ -0,0 +1,165 @@
+"""
+Планы и время запросов фильтрации кандидатов с индексами и без них.
+
+Во временной схеме создаются таблицы (миграция 1 и колонка оценки, без
+индексов), туда
+загружается N синтетических кандидатов, и для стандартных комбинаций
+фильтров выполняется EXPLAIN ANALYZE. Затем применяются остальные
+миграции (индексы) и замеры повторяются. Рабочие таблицы не затрагиваются,
+временная схема удаляется в конце.
+
+Запуск из корня репозитория (настройки подключения - как у приложения):
+    python benchmarks/bench_filter_queries.py [--rows 200000] [--repeat 5] [--plans]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+
+from database.config import DatabaseConfig
+from database.migrations import MIGRATIONS, Migrator
+from database.queries import build_filter_query
+
+
+SCHEMA = "bench_filter_queries"
+
+DEFAULT_FILTERS = {
+    'show_suitable': True,
+    'show_not_suitable': True,
+    'age_from': 0,
+    'age_to': 100,
+    'exp_from': 0,
+    'exp_to': 50,
+    'sal_from': 0,
+    'sal_to': 9999999,
+    'education_levels': {1, 2, 3, 4},
+    # Как в окне: лучшие кандидаты по оценке
+    'limit': 1000,
+}
+
+# Стандартные комбинации фильтров панели поиска
+SCENARIOS = [
+    ("без фильтров", {}),
+    ("только подходящие", {'show_not_suitable': False}),
+    ("возраст 25-35", {'age_from': 25, 'age_to': 35}),
+    ("стаж от 10 лет", {'exp_from': 10}),
+    ("зарплата 100-150 тыс.", {'sal_from': 100000, 'sal_to': 150000}),
+    ("высшее и выше", {'education_levels': {3, 4}}),
+    ("подходящие, 25-35, высшее, зп до 120 тыс.",
+     {'show_not_suitable': False, 'age_from': 25, 'age_to': 35,
+      'education_levels': {3, 4}, 'sal_from': 1, 'sal_to': 120000}),
+]
+
+SEED_SQL = """
+    INSERT INTO candidates (filename, fio, age, experience, education, salary,
+                            about, status, category_color, source_file, created_at, score)
+    SELECT
+        'bench_' || i || '.docx',
+        'кандидат ' || i,
+        18 + (random() * 47)::int,
+        (random() * 40)::int,
+        (random() * 4)::int,
+        CASE WHEN random() < 0.4 THEN 0 ELSE 30000 + (random() * 270000)::int END,
+        repeat('опыт работы с python и sql, ', 5),
+        CASE WHEN random() < 0.3 THEN 'Подходит' ELSE 'Не подходит' END,
+        '#888',
+        'resumes/bench_' || i || '.docx',
+        now() - random() * interval '3 years',
+        random()
+    FROM generate_series(1, %s) AS i
+"""
+
+
+def explain(cur, sql, params, repeat):
+    """Лучшее время выполнения (мс) и план запроса"""
+    best = None
+    plan = None
+    for _ in range(repeat):
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+        result = cur.fetchone()[0]
+        result = result[0] if isinstance(result, list) else json.loads(result)[0]
+        if best is None or result['Execution Time'] < best:
+            best = result['Execution Time']
+            plan = result['Plan']
+    return best, plan
+
+
+def plan_nodes(plan):
+    """Краткое описание плана: узлы и используемые индексы"""
+    nodes = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        name = node['Node Type']
+        if 'Index Name' in node:
+            name += f" ({node['Index Name']})"
+        nodes.append(name)
+        stack.extend(reversed(node.get('Plans', [])))
+    return " -> ".join(nodes)
+
+
+def run_scenarios(cur, repeat):
+    results = []
+    for title, overrides in SCENARIOS:
+        filters = dict(DEFAULT_FILTERS, **overrides)
+        sql, params = build_filter_query(filters)
+        results.append((title,) + explain(cur, sql, params, repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--plans", action="store_true", help="выводить узлы планов")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DatabaseConfig.load().connect_params())
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {SCHEMA}")
+            cur.execute(f"SET search_path TO {SCHEMA}")
+        conn.commit()
+
+        # Схема без индексов
+        Migrator(conn, MIGRATIONS[:1]).migrate()
+        with conn.cursor() as cur:
+            cur.execute("ALTER TABLE candidates ADD COLUMN score REAL NOT NULL DEFAULT 0")
+            cur.execute(SEED_SQL, (args.rows,))
+            cur.execute("ANALYZE candidates")
+        conn.commit()
+        print(f"Загружено {args.rows} кандидатов")
+
+        with conn.cursor() as cur:
+            before = run_scenarios(cur, args.repeat)
+        conn.rollback()
+
+        # Остальные миграции - индексы
+        Migrator(conn).migrate()
+        with conn.cursor() as cur:
+            after = run_scenarios(cur, args.repeat)
+        conn.rollback()
+
+        print(f"\n{'Фильтр':<45} {'без индексов, мс':>18} {'с индексами, мс':>18}")
+        for (title, t_before, plan_before), (_, t_after, plan_after) in zip(before, after):
+            print(f"{title:<45} {t_before:>18.2f} {t_after:>18.2f}")
+            if args.plans:
+                print(f"    было:  {plan_nodes(plan_before)}")
+                print(f"    стало: {plan_nodes(plan_after)}")
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
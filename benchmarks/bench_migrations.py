@@ -0,0 +1,139 @@
+"""
+Проверка миграций схемы на временной схеме PostgreSQL и время повторного запуска.
+
+Для каждой выпущенной версии схемы N во временной схеме применяются
+миграции до N, добавляется кандидат, затем применяются все остальные
+миграции (как при обновлении приложения). Проверяется, что:
+
+- итоговые колонки и индексы совпадают со схемой, созданной с нуля;
+- кандидат, добавленный до обновления, сохранился;
+- повторный запуск ничего не применяет и занимает миллисекунды.
+
+Рабочие таблицы не затрагиваются, временная схема удаляется в конце.
+
+Запуск из корня репозитория (настройки подключения - как у приложения):
+    python benchmarks/bench_migrations.py [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+
+from database.config import DatabaseConfig
+from database.migrations import MIGRATIONS, Migrator
+
+
+SCHEMA = "bench_migrations"
+
+# Цель - повторный запуск без новых миграций
+TARGET_RESTART_MS = 50
+
+SCHEMA_SQL = """
+    SELECT 'column ' || table_name || '.' || column_name || ' ' || data_type
+    FROM information_schema.columns WHERE table_schema = %(schema)s
+    UNION ALL
+    SELECT 'index ' || indexdef FROM pg_indexes WHERE schemaname = %(schema)s
+    ORDER BY 1
+"""
+
+
+def reset_schema(conn):
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        cur.execute(f"SET search_path TO {SCHEMA}")
+    conn.commit()
+
+
+def schema_objects(conn):
+    """Колонки и индексы временной схемы (имя схемы убрано из определений)"""
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_SQL, {'schema': SCHEMA})
+        rows = [row[0].replace(f"{SCHEMA}.", "") for row in cur.fetchall()]
+    conn.commit()
+    return rows
+
+
+def fetch_one(conn, sql, params=()):
+    with conn.cursor() as cur:
+        cur.execute(sql, params)
+        row = cur.fetchone()
+    conn.commit()
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    latest = MIGRATIONS[-1].version
+    errors = 0
+    conn = psycopg2.connect(**DatabaseConfig.load().connect_params())
+    try:
+        # Схема с нуля
+        reset_schema(conn)
+        started = time.perf_counter()
+        applied = Migrator(conn).migrate()
+        full_ms = (time.perf_counter() - started) * 1000
+        if applied != [m.version for m in MIGRATIONS]:
+            print(f"✗ С нуля применены миграции {applied}")
+            errors += 1
+        expected = schema_objects(conn)
+        print(f"Схема с нуля: {len(applied)} миграций за {full_ms:.1f} мс")
+
+        # Обновление с каждой выпущенной версии с данными в таблице
+        for base in range(1, latest):
+            reset_schema(conn)
+            Migrator(conn, MIGRATIONS[:base]).migrate()
+            with conn.cursor() as cur:
+                cur.execute("INSERT INTO candidates (filename, fio, age) VALUES (%s, %s, %s)",
+                            ("resume_1.docx", "Иван Иванов", 40))
+            conn.commit()
+
+            applied = Migrator(conn).migrate()
+            problems = []
+            if applied != [m.version for m in MIGRATIONS if m.version > base]:
+                problems.append(f"применены миграции {applied}")
+            if schema_objects(conn) != expected:
+                problems.append("схема отличается от созданной с нуля")
+            if fetch_one(conn, "SELECT fio, age FROM candidates WHERE filename = %s",
+                         ("resume_1.docx",)) != ("Иван Иванов", 40):
+                problems.append("кандидат не сохранился")
+            if fetch_one(conn, "SELECT MAX(version) FROM schema_version")[0] != latest:
+                problems.append("версия схемы не обновлена")
+            mark = "✗" if problems else "✓"
+            print(f"  {mark} обновление с версии {base} до {latest}" + (": " + "; ".join(problems) if problems else ""))
+            errors += bool(problems)
+
+        # Повторный запуск: новых миграций нет
+        times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            applied = Migrator(conn).migrate()
+            times.append((time.perf_counter() - started) * 1000)
+            if applied:
+                print(f"✗ Повторный запуск применил миграции {applied}")
+                errors += 1
+                break
+        restart_ms = statistics.median(times)
+        mark = "✓" if restart_ms <= TARGET_RESTART_MS else "✗"
+        print(f"\n{mark} Повторный запуск: {restart_ms:.2f} мс (цель {TARGET_RESTART_MS} мс)")
+        errors += restart_ms > TARGET_RESTART_MS
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Оценка кандидатов для вакансии: пересчет для новой вакансии и выбор лучших.
+
+Кандидаты и тексты резюме генерируются, тексты добавляются в поисковый
+индекс (TextIndex). Сравниваются:
+
+- пересчет оценок всех кандидатов для новой вакансии по колонкам и
+  спискам документов индекса (ScoringEngine.rescore) и поиск ключевых
+  слов в каждом тексте заново (как при повторной классификации);
+- выбор K лучших кучей (top_k) и сортировка всех кандидатов.
+
+Оценки по индексу проверяются на совпадение с оценками по текстам.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_scoring.py [--docs 100000] [--words 40] [--top 1000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.classifier import KeywordClassifier
+from database.models import Candidate
+from database.scoring import ScoringEngine, Vacancy, top_k
+from database.text_index import TEXT_INDEX_NAME, TextIndex
+
+
+# Цель - пересчет оценок всех кандидатов для новой вакансии
+TARGET_RESCORE_MS = 200
+
+SKILLS = ["python", "sql", "django", "flask", "kubernetes", "docker", "java", "linux", "excel",
+          "менеджер", "аналитик", "разработчик", "бухгалтер", "продажи", "маркетолог", "тестировщик"]
+
+VACANCY = Vacancy({"python": 3, "django": 2, "sql": 1, "docker": 1, "аналитик": 1},
+                  experience=3, education=3, salary_from=100000, salary_to=200000)
+
+
+def make_candidates(rng, count, words):
+    vocabulary = [f"слово{i}" for i in range(5000)]
+    candidates = []
+    for i in range(count):
+        text = rng.choices(vocabulary, k=words) + rng.sample(SKILLS, rng.randint(0, 5))
+        rng.shuffle(text)
+        candidates.append(Candidate({
+            'filename': f"resume_{i}.docx",
+            'experience': rng.randint(0, 20),
+            'education': rng.randint(0, 4),
+            'salary': rng.choice([0, rng.randint(30, 400) * 1000]),
+            'resume_text': " ".join(text),
+        }))
+    return candidates
+
+
+def timed(func, repeat=5):
+    """Медиана времени выполнения в миллисекундах"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=40, help="слов в тексте резюме")
+    parser.add_argument("--top", type=int, default=1000, help="сколько лучших кандидатов выбирать")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    candidates = make_candidates(rng, args.docs, args.words)
+    texts = [c.resume_text for c in candidates]
+
+    workdir = tempfile.mkdtemp(prefix="scoring_")
+    try:
+        index = TextIndex(os.path.join(workdir, TEXT_INDEX_NAME))
+        start = time.perf_counter()
+        for candidate in candidates:
+            index.add(candidate.filename, candidate.resume_text)
+        index.save()
+        print(f"Кандидатов: {len(candidates)}, индекс построен за {time.perf_counter() - start:.1f} с")
+
+        # Оценки по текстам (как при загрузке) и по индексу (как при пересчете) совпадают
+        engine = ScoringEngine(VACANCY, index)
+        by_text = np.array(engine.score_candidates(candidates))
+        filenames = [c.filename for c in candidates]
+        experience = np.array([c.experience for c in candidates])
+        education = np.array([c.education for c in candidates])
+        salary = np.array([c.salary for c in candidates])
+        by_index = engine.rescore(filenames, experience, education, salary)
+        if not np.allclose(by_text, by_index):
+            print(f"✗ Оценки по индексу отличаются от оценок по текстам: "
+                  f"{int((~np.isclose(by_text, by_index)).sum())} кандидатов")
+            return 1
+        print("✓ Оценки по индексу совпадают с оценками по текстам")
+
+        # Новая вакансия: движок создается заново (IDF слов считается по индексу)
+        rescore_ms = timed(lambda: ScoringEngine(VACANCY, index).rescore(filenames, experience, education, salary))
+        classifier = KeywordClassifier.for_keywords(list(VACANCY.keywords))
+        reparse_ms = timed(lambda: [classifier.find(text) for text in texts], repeat=1)
+        mark = "✓" if rescore_ms <= TARGET_RESCORE_MS else "✗"
+        print(f"\nПересчет оценок для новой вакансии (цель {TARGET_RESCORE_MS} мс):")
+        print(f"  {mark} по колонкам и индексу      {rescore_ms:>9.1f} мс")
+        print(f"    поиск слов в каждом тексте {reparse_ms:>9.1f} мс")
+
+        key = lambda c: c.score
+        heap_ms = timed(lambda: top_k(candidates, args.top, key))
+        sort_ms = timed(lambda: sorted(candidates, key=key, reverse=True)[:args.top])
+        if top_k(candidates, args.top, key) != sorted(candidates, key=key, reverse=True)[:args.top]:
+            print("✗ Лучшие кандидаты из кучи не совпадают с сортировкой")
+            return 1
+        print(f"\nЛучшие {args.top} из {len(candidates)}:")
+        print(f"  куча (top_k)          {heap_ms:>9.1f} мс")
+        print(f"  сортировка всех       {sort_ms:>9.1f} мс")
+
+        index.close()
+        return 0 if rescore_ms <= TARGET_RESCORE_MS else 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
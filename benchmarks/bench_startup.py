@@ -0,0 +1,135 @@
+"""
+Запуск приложения: время импорта runner и время до первой отрисовки окна.
+
+Каждый замер - отдельный процесс Python, время до отрисовки считается от
+запуска процесса (вместе со стартом интерпретатора). Второй вариант
+запускается с недоступным сервером БД: окно не должно ждать таймаута
+подключения.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_startup.py [--repeat 5] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Цель: окно отрисовано не позже чем через столько миллисекунд после запуска процесса
+TARGET_FIRST_PAINT_MS = 600
+
+# Модули, которые не должны загружаться до отрисовки окна
+DEFERRED_MODULES = ('psycopg2', 'numpy', 'lxml', 'docx')
+
+# Адрес из диапазона для документации (RFC 5737): подключение к нему не проходит
+UNREACHABLE_DB_HOST = "192.0.2.1"
+
+CHILD = r"""
+import sys
+sys.path.insert(0, {root!r})
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+import runner
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            print("FIRST_PAINT", flush=True)
+            QTimer.singleShot(0, app.quit)
+        return False
+
+window = runner.ResumeSorterApp()
+watcher = FirstPaint()
+window.ui.installEventFilter(watcher)
+window.show()
+app.exec()
+"""
+
+
+def child_env(**extra):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env.update(extra)
+    return env
+
+
+def import_profile(env):
+    """Модули, загруженные при 'import runner': {имя: накопленное время, мкс}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import runner'],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def first_paint_ms(env):
+    """Время от запуска процесса до первой отрисовки окна"""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', CHILD.format(root=ROOT)],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        for line in proc.stdout:
+            if line.startswith("FIRST_PAINT"):
+                return (time.perf_counter() - started) * 1000
+        return float('nan')
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    env = child_env()
+    modules = import_profile(env)
+    if 'runner' not in modules:
+        print("✗ Не удалось импортировать runner")
+        return 1
+
+    print(f"import runner: {modules['runner'] / 1000:.1f} мс, самые долгие модули:")
+    top = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    for name, cumulative in top:
+        print(f"  {name:<40} {cumulative / 1000:>8.1f} мс")
+
+    loaded = [name for name in DEFERRED_MODULES if name in modules]
+    if loaded:
+        print(f"✗ До отрисовки окна загружаются: {', '.join(loaded)}")
+    else:
+        print(f"✓ До отрисовки окна не загружаются: {', '.join(DEFERRED_MODULES)}")
+
+    ok = not loaded
+    variants = [
+        ("БД из настроек", env),
+        ("БД недоступна", child_env(RESUME_DB_HOST=UNREACHABLE_DB_HOST, RESUME_DB_CONNECT_TIMEOUT="5")),
+    ]
+    print(f"\nВремя до первой отрисовки (медиана из {args.repeat}, цель {TARGET_FIRST_PAINT_MS} мс):")
+    for title, variant_env in variants:
+        times = [first_paint_ms(variant_env) for _ in range(args.repeat)]
+        median = statistics.median(times)
+        mark = "✓" if median <= TARGET_FIRST_PAINT_MS else "✗"
+        ok = ok and median <= TARGET_FIRST_PAINT_MS
+        print(f"  {mark} {title:<20} {median:>8.0f} мс  (мин {min(times):.0f}, макс {max(times):.0f})")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Поиск по тексту резюме без БД: поисковый индекс (TextIndex) и просмотр текстов.
+
+Тексты генерируются из словаря с частотами по закону Ципфа (немного очень
+частых слов и много редких), в них вставлены реальные слова резюме в разных
+формах. Индекс строится по журналу и сливается в основной файл, затем
+открывается заново (как при запуске приложения) и проверяется на совпадение
+с прямой проверкой основ каждого текста.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_text_index.py [--docs 100000] [--words 80]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.stemmer import terms
+from database.text_index import TEXT_INDEX_NAME, TextIndex, parse_query
+
+
+# Цель - время поиска по индексу (без получения имен файлов)
+TARGET_QUERY_MS = 1.0
+
+REAL_WORDS = [
+    "python", "sql", "django", "flask", "kubernetes", "docker", "java", "linux", "english",
+    "менеджер", "менеджером", "менеджеры", "аналитик", "аналитики", "аналитическим",
+    "разработчик", "разработки", "лидерские", "лидерскими", "качествами", "опыт", "опытом",
+    "ответственность", "ответственный", "продажи", "продаж", "бухгалтер", "бухгалтерии",
+]
+
+QUERIES = [
+    "python",
+    "kubernetes docker",
+    "менеджеры продаж",
+    "python django OR flask",
+    "аналитик sql -java",
+    "лидерские качества ответственность",
+    "бухгалтер или аналитик",
+]
+
+
+def make_texts(rng, count, words):
+    vocabulary = [f"слово{i}" if i % 2 else f"word{i}" for i in range(20000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    texts = []
+    for _ in range(count):
+        text = rng.choices(vocabulary, weights, k=words)
+        text += rng.sample(REAL_WORDS, rng.randint(0, 6))
+        rng.shuffle(text)
+        texts.append(" ".join(text))
+    return texts
+
+
+def expected(query, doc_terms):
+    groups, excluded = parse_query(query)
+    return {
+        name for name, stems in doc_terms.items()
+        if any(all(term in stems for term in group) for group in groups)
+        and not any(term in stems for term in excluded)
+    }
+
+
+def scan(query, texts):
+    """Просмотр текстов без индекса: все слова запроса вхождением подстроки"""
+    words = query.lower().split()
+    return [name for name, text in texts.items() if all(word in text for word in words)]
+
+
+def timed(func, repeat=20):
+    """Медиана времени выполнения в миллисекундах"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--words", type=int, default=80, help="слов в тексте резюме")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = {f"resume_{i}.docx": text for i, text in enumerate(make_texts(rng, args.docs, args.words))}
+
+    workdir = tempfile.mkdtemp(prefix="text_index_")
+    try:
+        path = os.path.join(workdir, TEXT_INDEX_NAME)
+        index = TextIndex(path)
+
+        start = time.perf_counter()
+        for name, text in texts.items():
+            index.add(name, text)
+        added = time.perf_counter()
+        # Журнал больше порога: при записи он сливается в основной файл
+        index.save()
+        compacted = time.perf_counter()
+
+        # Несколько новых резюме после построения - они попадают в журнал
+        for i in range(100):
+            name = f"new_{i}.docx"
+            texts[name] = "python kubernetes опыт " + texts[f"resume_{i}.docx"]
+            index.add(name, texts[name])
+        index.save()
+        index.close()
+
+        start_open = time.perf_counter()
+        index = TextIndex(path)
+        index.load()
+        opened = time.perf_counter()
+
+        size = os.path.getsize(path) / (1024 * 1024)
+        print(f"Резюме: {len(texts)}, файл индекса {size:.1f} МБ")
+        print(f"  разбор текстов {added - start:.1f} с, запись и слияние в основной файл "
+              f"{(compacted - added) * 1000:.0f} мс, открытие {(opened - start_open) * 1000:.0f} мс")
+
+        doc_terms = {name: set(terms(text)) for name, text in texts.items()}
+        for query in QUERIES:
+            found = set(index.search(query).names)
+            if found != expected(query, doc_terms):
+                print(f"✗ Результат запроса {query!r} не совпадает с прямой проверкой")
+                return 1
+        print(f"✓ {len(QUERIES)} запросов совпадают с прямой проверкой основ")
+
+        # Поиск по индексу (номера документов) отдельно от получения имен файлов:
+        # время второго растет с числом найденных резюме
+        ok = True
+        print(f"\n{'запрос':<38} {'найдено':>8} {'индекс, мс':>11} {'с именами, мс':>14} {'просмотр, мс':>13}")
+        for query in QUERIES:
+            found = len(index.search(query))
+            match_ms = timed(lambda: index.match(query))
+            search_ms = timed(lambda: index.search(query))
+            scan_ms = timed(lambda: scan(query, texts), repeat=3)
+            mark = "✓" if match_ms <= TARGET_QUERY_MS else "✗"
+            ok = ok and match_ms <= TARGET_QUERY_MS
+            print(f"{mark} {query:<36} {found:>8} {match_ms:>11.3f} {search_ms:>14.3f} {scan_ms:>13.1f}")
+        index.close()
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Командная строка без графического интерфейса (PyQt6 не импортируется).
+
+    python cli.py ingest <папка> [-r] [--workers N]   загрузка резюме из папки
+    python cli.py reclassify [--workers N]            повторный разбор загруженных резюме
+    python cli.py filter [фильтры] [--format csv]     отбор кандидатов в JSON/CSV
+    python cli.py sort [--rollback]                   раскладка файлов по категориям
+    python cli.py rescore --keywords ... [требования] пересчет оценок кандидатов для вакансии
+    python cli.py profile list|save|delete ...        профили вакансий в БД
+    python cli.py screen [профиль]                    классификация всех кандидатов по профилю
+
+Используются те же разбор, классификация и фильтры, что и в приложении.
+В конце каждой команды печатается скорость обработки.
+
+Модули, которые при импорте подключаются к БД, импортируются в командах:
+filter перед этим переключает диагностику в stderr, чтобы в stdout был
+только результат.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from database.queries import AGE_MAX, EXPERIENCE_MAX, SALARY_MAX
+from handlers.ingest import RESUME_DIR
+
+
+# Поля кандидата в выводе filter
+OUTPUT_FIELDS = ('filename', 'fio', 'age', 'experience', 'education', 'salary',
+                 'status', 'category_color', 'about', 'score', 'rank')
+
+
+class HeadlessApp:
+    """Данные приложения, которые нужны FilterHandler, без окна"""
+
+    def __init__(self, resume_dir):
+        from database.candidate_store import CandidateStore
+
+        self.resume_dir = resume_dir
+        self.sorted_dir = os.path.join(resume_dir, "sorted")
+        self.candidates = CandidateStore()
+
+
+def _size(paths) -> int:
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def _report(action, count, nbytes, started, unit="файлов"):
+    """Итоговая скорость обработки (nbytes=None - без объема)"""
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    if nbytes is None:
+        print(f"\n{action}: {count} {unit} за {elapsed:.2f} с - {count / elapsed:.1f} {unit}/с")
+        return
+    mb = nbytes / (1024 * 1024)
+    print(f"\n{action}: {count} {unit}, {mb:.1f} МБ за {elapsed:.2f} с - "
+          f"{count / elapsed:.1f} {unit}/с, {mb / elapsed:.2f} МБ/с")
+
+
+def _load_candidates(app, ingestor):
+    """Кандидаты для фильтрации и сортировки: из БД, а без БД - разбор рабочей директории"""
+    from database import db, Candidate
+    from database.pager import LIGHT_SQL_COLUMNS
+
+    if db.is_connected:
+        rows = db.fetch_tuples(f"SELECT {LIGHT_SQL_COLUMNS} FROM candidates ORDER BY created_at DESC")
+        candidates = Candidate.from_rows(rows)
+    else:
+        print("БД не подключена: кандидаты читаются из файлов рабочей директории")
+        candidates = ingestor.reprocess(ingestor.stored_items())
+    app.candidates.update((c.filename, c) for c in candidates)
+    return candidates
+
+
+def _filter_params(args):
+    """Параметры фильтрации в том же виде, что собирает панель фильтров"""
+    return {
+        'show_suitable': args.status in ('all', 'suitable'),
+        'show_not_suitable': args.status in ('all', 'not_suitable'),
+        'age_from': args.age_from,
+        'age_to': args.age_to or AGE_MAX,
+        'exp_from': args.exp_from,
+        'exp_to': args.exp_to or EXPERIENCE_MAX,
+        'sal_from': args.salary_from,
+        'sal_to': args.salary_to or SALARY_MAX,
+        'education_levels': set(args.education or ()),
+        'text': args.text,
+        'limit': args.limit,
+    }
+
+
+def cmd_ingest(args):
+    from handlers.batch import BatchIngestor, find_resumes
+
+    files = find_resumes(args.directory, args.recursive)
+    if not files:
+        print(f"В папке {args.directory} нет файлов .docx")
+        return 1
+
+    started = time.perf_counter()
+    ingestor = BatchIngestor(args.resume_dir, max_workers=args.workers)
+    ingestor.ingest(files)
+    print(f"Добавлено {ingestor.added}, повторов {ingestor.duplicates}, ошибок {ingestor.failed}")
+    _report("Загрузка", len(files), _size(files), started)
+    return 0
+
+
+def cmd_reclassify(args):
+    from handlers.batch import BatchIngestor
+
+    started = time.perf_counter()
+    ingestor = BatchIngestor(args.resume_dir, max_workers=args.workers)
+    items = ingestor.stored_items()
+    updated = ingestor.reprocess(items)
+    print(f"Обновлено {len(updated)} резюме, ошибок {ingestor.failed}")
+    _report("Повторный разбор", len(items), _size(path for path, _ in items), started)
+    return 0
+
+
+def cmd_filter(args):
+    # Результат пишется в stdout, поэтому диагностика (в том числе процессов пула) - в stderr
+    out = None
+    if args.output == '-':
+        sys.stdout.flush()
+        out = os.fdopen(os.dup(1), 'w', encoding='utf-8', newline='')
+        os.dup2(2, 1)
+
+    from database import db
+    from handlers.batch import BatchIngestor
+    from handlers.filter_handler import FilterHandler
+
+    started = time.perf_counter()
+    app = HeadlessApp(args.resume_dir)
+    if not db.is_connected:
+        _load_candidates(app, BatchIngestor(args.resume_dir, max_workers=args.workers))
+    rows = FilterHandler(app).run_filters(_filter_params(args))
+    rows = [{field: row.get(field) for field in OUTPUT_FIELDS} for row in rows]
+
+    if out is None:
+        out = open(args.output, 'w', encoding='utf-8', newline='')
+    with out:
+        if args.format == 'csv':
+            writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, out, ensure_ascii=False, indent=2)
+            out.write("\n")
+    _report("Фильтрация", len(rows), None, started, unit="кандидатов")
+    return 0
+
+
+def cmd_sort(args):
+    from database import db
+    from handlers.batch import BatchIngestor
+    from handlers.filter_handler import FilterHandler
+
+    started = time.perf_counter()
+    app = HeadlessApp(args.resume_dir)
+    # С БД список кандидатов для сортировки берется из нее
+    if not db.is_connected:
+        _load_candidates(app, BatchIngestor(args.resume_dir, max_workers=args.workers))
+    moved = FilterHandler(app).sort_files(rollback=args.rollback)
+
+    if args.rollback:
+        print(f"Возвращено {len(moved)} файлов")
+    else:
+        print(f"Перемещено {len(moved)} файлов в {app.sorted_dir}")
+    _report("Сортировка", len(moved), _size(dst for _, _, dst in moved), started)
+    return 0
+
+
+def _parse_keywords(values):
+    """Ключевые слова вакансии: 'слово' или 'слово:вес'"""
+    keywords = {}
+    for value in values:
+        word, _, weight = value.rpartition(':') if ':' in value else (value, '', '1')
+        keywords[word] = float(weight)
+    return keywords
+
+
+def cmd_rescore(args):
+    from database import db
+    from database.scoring import Vacancy, top_k
+    from handlers.batch import BatchIngestor
+
+    started = time.perf_counter()
+    vacancy = Vacancy(_parse_keywords(args.keywords), experience=args.experience, education=args.education,
+                      salary_from=args.salary_from, salary_to=args.salary_to)
+    ingestor = BatchIngestor(args.resume_dir, max_workers=args.workers, vacancy=vacancy)
+    app = HeadlessApp(args.resume_dir)
+    if not db.is_connected:
+        _load_candidates(app, ingestor)
+
+    count = ingestor.rescore(app.candidates)
+    if db.is_connected:
+        rows = db.fetch_tuples("SELECT filename, fio, score FROM candidates ORDER BY score DESC LIMIT %s",
+                               (args.top,))
+    else:
+        rows = [(c.filename, c.fio, c.score)
+                for c in top_k(app.candidates.values(), args.top, key=lambda c: c.score)]
+    print(f"Пересчитаны оценки {count} кандидатов, лучшие:")
+    for filename, fio, score in rows:
+        print(f"  {score:.3f}  {fio} ({filename})")
+    _report("Пересчет оценок", count, None, started, unit="кандидатов")
+    return 0
+
+
+def cmd_profile(args):
+    from database import db
+    from database.profiles import ProfileStore, VacancyProfile
+
+    if not db.is_connected:
+        print("БД не подключена: профили вакансий хранятся в БД")
+        return 1
+    store = ProfileStore()
+    if args.action != 'list' and not args.name:
+        print(f"Для {args.action} нужно имя профиля")
+        return 1
+
+    if args.action == 'list':
+        active = store.active()
+        for profile in store.list():
+            mark = "*" if active is not None and profile.name == active.name else " "
+            print(f"{mark} {profile.name}: {profile.describe()}")
+        return 0
+
+    if args.action == 'delete':
+        if not store.delete(args.name):
+            print(f"Профиль \"{args.name}\" не найден")
+            return 1
+        print(f"Профиль \"{args.name}\" удален")
+        return 0
+
+    if not args.keywords:
+        print("Для профиля нужны ключевые слова (--keywords)")
+        return 1
+    profile = VacancyProfile(args.name, _parse_keywords(args.keywords), threshold=args.threshold,
+                             required_fields=args.require or (), experience=args.experience,
+                             education=args.education, salary_from=args.salary_from, salary_to=args.salary_to)
+    store.save(profile)
+    if args.activate:
+        store.activate(profile.name)
+    print(f"Профиль \"{profile.name}\" сохранен{' и выбран' if args.activate else ''}: {profile.describe()}")
+    return 0
+
+
+def cmd_screen(args):
+    from database import db
+    from database.profiles import ProfileStore
+    from handlers.screening import ScreeningJob
+
+    if not db.is_connected:
+        print("БД не подключена: профили вакансий и тексты резюме хранятся в БД")
+        return 1
+    store = ProfileStore()
+    if args.name:
+        profile = store.get(args.name)
+        if profile is None:
+            print(f"Профиль \"{args.name}\" не найден")
+            return 1
+        # Загружаемые дальше резюме классифицируются по тому же профилю
+        store.activate(profile.name)
+    else:
+        profile = store.active()
+        if profile is None:
+            print("Активный профиль не выбран: укажите имя профиля")
+            return 1
+
+    started = time.perf_counter()
+    job = ScreeningJob(profile, args.resume_dir, args.workers)
+    changes = job.run()
+    for filename, category in changes[:args.show]:
+        print(f"  {category}: {filename}")
+    if len(changes) > args.show:
+        print(f"  ... еще {len(changes) - args.show}")
+    print(f"Профиль \"{profile.name}\": изменена категория у {len(changes)} кандидатов, "
+          f"обновлено строк {job.updated}, без текста резюме {job.without_text}")
+    _report("Классификация по профилю", job.total, None, started, unit="кандидатов")
+    if job.failed:
+        print(f"Не обработано диапазонов кандидатов: {job.failed}, повторите команду")
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Обработка резюме без графического интерфейса")
+    parser.add_argument('--resume-dir', default=RESUME_DIR, help="рабочая директория резюме")
+    parser.add_argument('--workers', type=int, default=None, help="число процессов разбора")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="загрузка резюме из папки")
+    ingest.add_argument('directory')
+    ingest.add_argument('-r', '--recursive', action='store_true', help="включая вложенные папки")
+    ingest.set_defaults(func=cmd_ingest)
+
+    reclassify = commands.add_parser('reclassify', help="повторный разбор и классификация загруженных резюме")
+    reclassify.set_defaults(func=cmd_reclassify)
+
+    filters = commands.add_parser('filter', help="отбор кандидатов")
+    filters.add_argument('--status', choices=('all', 'suitable', 'not_suitable'), default='all')
+    filters.add_argument('--age-from', type=int, default=0)
+    filters.add_argument('--age-to', type=int, default=0, help="0 - не важно")
+    filters.add_argument('--exp-from', type=int, default=0)
+    filters.add_argument('--exp-to', type=int, default=0, help="0 - не важно")
+    filters.add_argument('--salary-from', type=int, default=0)
+    filters.add_argument('--salary-to', type=int, default=0, help="0 - не важно")
+    filters.add_argument('--education', type=int, nargs='*', choices=(1, 2, 3, 4),
+                         help="уровни образования: 1 - среднее, 2 - среднее проф., 3 - высшее, 4 - послевузовское")
+    filters.add_argument('--text', default='',
+                         help="поиск по тексту резюме, например: kubernetes \"data science\" -java")
+    filters.add_argument('--limit', type=int, default=0, help="только лучшие N кандидатов по оценке (0 - все)")
+    filters.add_argument('--format', choices=('json', 'csv'), default='json')
+    filters.add_argument('-o', '--output', default='-', help="файл результата (по умолчанию stdout)")
+    filters.set_defaults(func=cmd_filter)
+
+    sort = commands.add_parser('sort', help="раскладка файлов резюме по папкам категорий")
+    sort.add_argument('--rollback', action='store_true',
+                      help="откатить прерванную сортировку вместо ее завершения")
+    sort.set_defaults(func=cmd_sort)
+
+    rescore = commands.add_parser('rescore', help="пересчет оценок кандидатов для вакансии без повторного разбора")
+    rescore.add_argument('--keywords', nargs='+', required=True,
+                         help="ключевые слова вакансии, вес через двоеточие: python:2 sql django")
+    rescore.add_argument('--experience', type=int, default=0, help="требуемый стаж, лет")
+    rescore.add_argument('--education', type=int, default=0, choices=(0, 1, 2, 3, 4),
+                         help="требуемый уровень образования (0 - не важно)")
+    rescore.add_argument('--salary-from', type=int, default=0)
+    rescore.add_argument('--salary-to', type=int, default=0, help="0 - без вилки")
+    rescore.add_argument('--top', type=int, default=10, help="сколько лучших кандидатов напечатать")
+    rescore.set_defaults(func=cmd_rescore)
+
+    profile = commands.add_parser('profile', help="профили вакансий: ключевые слова, порог, обязательные поля")
+    profile.add_argument('action', choices=('list', 'save', 'delete'))
+    profile.add_argument('name', nargs='?', help="имя профиля (для save и delete)")
+    profile.add_argument('--keywords', nargs='+', help="ключевые слова, вес через двоеточие: python:2 sql django")
+    profile.add_argument('--threshold', type=float, default=1.0,
+                         help="сумма весов найденных слов, с которой резюме подходит")
+    profile.add_argument('--require', nargs='*', choices=('fio', 'age', 'experience', 'education', 'salary'),
+                         help="поля, без которых резюме не подходит")
+    profile.add_argument('--experience', type=int, default=0, help="требуемый стаж, лет (для оценки)")
+    profile.add_argument('--education', type=int, default=0, choices=(0, 1, 2, 3, 4),
+                         help="требуемый уровень образования (0 - не важно)")
+    profile.add_argument('--salary-from', type=int, default=0)
+    profile.add_argument('--salary-to', type=int, default=0, help="0 - без вилки")
+    profile.add_argument('--activate', action='store_true', help="классифицировать новые резюме по профилю")
+    profile.set_defaults(func=cmd_profile)
+
+    screen = commands.add_parser('screen', help="классификация всех кандидатов по профилю по тексту из БД")
+    screen.add_argument('name', nargs='?', help="имя профиля (по умолчанию - активный); профиль становится активным")
+    screen.add_argument('--show', type=int, default=20, help="сколько изменений категорий напечатать")
+    screen.set_defaults(func=cmd_screen)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
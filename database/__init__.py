@@ -1,4 +1,21 @@
-from .connection import db
-from .models import Candidate, ResumeParser
+import importlib
 
-__all__ = ['db', 'Candidate', 'ResumeParser']
\ No newline at end of file
+__all__ = ['db', 'Candidate', 'ResumeParser', 'KeywordClassifier']
+
+# Имена пакета подгружаются при первом обращении: импорт database.config или
+# database.classifier не тянет за собой lxml (models) и psycopg2 (connection)
+_LAZY = {
+    'Candidate': '.models',
+    'ResumeParser': '.models',
+    'KeywordClassifier': '.classifier',
+    'db': '.connection',
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,217 @@
+"""
+Хранилище кандидатов в памяти с колонками NumPy.
+
+Числовые поля и категория каждого кандидата хранятся в массивах NumPy,
+поэтому фильтрация выполняется несколькими векторными сравнениями вместо
+проверки кандидатов по одному. Снаружи хранилище ведет себя как словарь
+{имя файла: Candidate} с порядком добавления.
+
+Удаленные строки помечаются и удаляются из массивов при сжатии, когда их
+становится больше половины.
+"""
+
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .classifier import NOT_SUITABLE, SUITABLE
+
+
+# Коды категорий в колонке status
+STATUS_OTHER = 0
+STATUS_SUITABLE = 1
+STATUS_NOT_SUITABLE = 2
+_STATUS_CODES = {SUITABLE: STATUS_SUITABLE, NOT_SUITABLE: STATUS_NOT_SUITABLE}
+
+_NUMERIC_COLUMNS = ('age', 'experience', 'education', 'salary')
+
+
+class CandidateStore(MutableMapping):
+    """Кандидаты по имени файла с колоночным индексом для фильтрации"""
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self, candidates=None):
+        self._lock = threading.RLock()
+        self._keys: List[Any] = []
+        self._rows: List[Any] = []
+        self._index: Dict[str, int] = {}
+        self._size = 0
+        self._allocate(self.MIN_CAPACITY)
+        if candidates:
+            self.update(candidates)
+
+    def _allocate(self, capacity):
+        self._columns = {name: np.zeros(capacity, dtype=np.int64) for name in _NUMERIC_COLUMNS}
+        self._status = np.zeros(capacity, dtype=np.int8)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        """Увеличение емкости массивов вдвое"""
+        capacity = len(self._alive) * 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        status = np.zeros(capacity, dtype=np.int8)
+        status[:self._size] = self._status[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._status, self._alive = status, alive
+
+    def _write_row(self, row, candidate):
+        for name, column in self._columns.items():
+            column[row] = getattr(candidate, name, 0) or 0
+        self._status[row] = _STATUS_CODES.get(getattr(candidate, 'original_category', None), STATUS_OTHER)
+        self._alive[row] = True
+
+    # Интерфейс словаря
+
+    def __setitem__(self, key, candidate):
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                if self._size == len(self._alive):
+                    self._grow()
+                row = self._size
+                self._size += 1
+                self._index[key] = row
+                self._keys.append(key)
+                self._rows.append(candidate)
+            else:
+                self._rows[row] = candidate
+            self._write_row(row, candidate)
+
+    def __getitem__(self, key):
+        return self._rows[self._index[key]]
+
+    def __delitem__(self, key):
+        with self._lock:
+            row = self._index.pop(key)
+            self._keys[row] = None
+            self._rows[row] = None
+            self._alive[row] = False
+            if self._size > self.MIN_CAPACITY and len(self._index) * 2 < self._size:
+                self._compact()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        with self._lock:
+            return [key for row, key in enumerate(self._keys) if self._rows[row] is not None]
+
+    def values(self):
+        """Кандидаты в порядке добавления (копия списка)"""
+        with self._lock:
+            return [candidate for candidate in self._rows if candidate is not None]
+
+    def items(self):
+        with self._lock:
+            return [(key, candidate) for key, candidate in zip(self._keys, self._rows) if candidate is not None]
+
+    def clear(self):
+        with self._lock:
+            self._keys, self._rows, self._index, self._size = [], [], {}, 0
+            self._allocate(self.MIN_CAPACITY)
+
+    def refresh(self, key):
+        """Обновление колонок после изменения полей кандидата"""
+        with self._lock:
+            row = self._index[key]
+            self._write_row(row, self._rows[row])
+
+    def _compact(self):
+        """Удаление помеченных строк из массивов с сохранением порядка"""
+        alive = np.flatnonzero(self._alive[:self._size])
+        capacity = max(self.MIN_CAPACITY, 1 << int(len(alive)).bit_length())
+
+        columns = {}
+        for name, column in self._columns.items():
+            columns[name] = np.zeros(capacity, dtype=column.dtype)
+            columns[name][:len(alive)] = column[alive]
+        status = np.zeros(capacity, dtype=np.int8)
+        status[:len(alive)] = self._status[alive]
+
+        self._columns, self._status = columns, status
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[:len(alive)] = True
+        self._keys = [self._keys[row] for row in alive]
+        self._rows = [self._rows[row] for row in alive]
+        self._index = {key: row for row, key in enumerate(self._keys)}
+        self._size = len(alive)
+
+    # Фильтрация
+
+    def filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Маска строк, подходящих под фильтры; правила те же, что у прежней
+        построчной фильтрации в FilterHandler.
+        """
+        n = self._size
+        mask = self._alive[:n].copy()
+        age = self._columns['age'][:n]
+        experience = self._columns['experience'][:n]
+        salary = self._columns['salary'][:n]
+        status = self._status[:n]
+
+        # Фильтр по статусу
+        if not filters['show_suitable']:
+            mask &= status != STATUS_SUITABLE
+        if not filters['show_not_suitable']:
+            mask &= status != STATUS_NOT_SUITABLE
+
+        # Фильтр по возрасту (значение 0 = не важно)
+        if filters['age_from'] > 0:
+            mask &= age >= filters['age_from']
+        if filters['age_to'] > 0:
+            mask &= age <= filters['age_to']
+
+        # Фильтр по опыту
+        if filters['exp_from'] > 0:
+            mask &= experience >= filters['exp_from']
+        if filters['exp_to'] > 0:
+            mask &= experience <= filters['exp_to']
+
+        # Фильтр по зарплате (кандидаты без зарплаты не отсекаются)
+        no_salary = salary == 0
+        if filters['sal_from'] > 0:
+            mask &= no_salary | (salary >= filters['sal_from'])
+        if filters['sal_to'] > 0:
+            mask &= no_salary | (salary <= filters['sal_to'])
+
+        # Фильтр по образованию (уровней немного: сравнения с каждым быстрее, чем np.isin)
+        if filters['education_levels']:
+            education = self._columns['education'][:n]
+            selected = np.zeros(n, dtype=bool)
+            for level in filters['education_levels']:
+                selected |= education == level
+            mask &= selected
+
+        return mask
+
+    def filter(self, filters: Dict[str, Any]) -> list:
+        """Кандидаты, подходящие под фильтры, в порядке добавления"""
+        with self._lock:
+            rows = np.flatnonzero(self.filter_mask(filters))
+            return [self._rows[row] for row in rows.tolist()]
+
+    def rescore(self, engine) -> int:
+        """Пересчет оценок всех кандидатов по колонкам (engine - ScoringEngine)"""
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._size])
+            scores = engine.rescore([self._keys[row] for row in rows.tolist()],
+                                    self._columns['experience'][rows],
+                                    self._columns['education'][rows],
+                                    self._columns['salary'][rows])
+            for row, score in zip(rows.tolist(), scores.tolist()):
+                self._rows[row].score = score
+            return len(rows)
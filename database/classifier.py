@@ -0,0 +1,128 @@
+"""
+Классификация резюме по ключевым словам.
+
+Набор ключевых слов один раз компилируется в префиксное дерево, записанное
+одним регулярным выражением. Текст просматривается за один проход, проверка
+идет только с начала слов, поэтому "hr" не находится внутри "chrome".
+Окончание слова по умолчанию не проверяется, чтобы "менеджер" находился
+в "менеджером"; полное совпадение слова включается параметром whole_words.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+SUITABLE = "Подходит"
+NOT_SUITABLE = "Не подходит"
+CATEGORY_COLORS = {
+    SUITABLE: "#2ecc71",      # Зеленый для "Подходит"
+    NOT_SUITABLE: "#e74c3c",  # Красный для "Не подходит"
+}
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _trie_pattern(keywords) -> str:
+    """Регулярное выражение - префиксное дерево ключевых слов (длинные варианты первыми)"""
+    root = {}
+    for keyword in keywords:
+        node = root
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(root)
+
+
+class ClassificationResult:
+    """Результат классификации: позиции, количество, сумма весов и категория"""
+
+    def __init__(self, keywords, positions: Dict[str, List[int]], threshold=1, weights=None):
+        # Найденные слова в порядке исходного списка
+        self.found = [kw for kw in keywords if kw in positions]
+        self.positions = positions
+        self.counts = {kw: len(positions[kw]) for kw in self.found}
+        # Без весов каждое найденное слово весит 1, и порог - число различных слов
+        self.score = sum(weights.get(kw, 1.0) for kw in self.found) if weights else len(self.found)
+        self.set_category(SUITABLE if self.score >= threshold else NOT_SUITABLE)
+
+    def set_category(self, category):
+        self.category = category
+        self.color = CATEGORY_COLORS[category]
+
+    @property
+    def suitable(self) -> bool:
+        return self.category == SUITABLE
+
+
+class KeywordClassifier:
+    """Поиск всех ключевых слов в тексте за один проход"""
+
+    # Увеличивается при изменении правил классификации
+    VERSION = 1
+
+    def __init__(self, keywords: Iterable[str], whole_words=False):
+        self.keywords = list(dict.fromkeys(kw.lower() for kw in keywords if kw))
+        self.whole_words = whole_words
+
+        # Для каждого слова - все слова набора, которые являются его началом:
+        # в одной позиции шаблон находит самое длинное слово, остальные - его префиксы
+        self._prefixes = {
+            kw: [other for other in self.keywords if kw.startswith(other)]
+            for kw in self.keywords
+        }
+
+        if not self.keywords:
+            self._pattern = None
+        elif all(_WORD_CHAR.match(kw) for kw in self.keywords):
+            self._pattern = re.compile(r'\b(?=(' + _trie_pattern(self.keywords) + '))')
+        else:
+            # Слова, начинающиеся не с буквы (".net"), ищутся в любой позиции
+            self._pattern = re.compile(r'(?:(?<!\w)|(?!\w))(?=(' + _trie_pattern(self.keywords) + '))')
+
+    @property
+    def signature(self) -> str:
+        """Подпись классификатора: меняется вместе с набором слов или правилами"""
+        source = f"{self.VERSION}:{self.whole_words}:" + "\n".join(self.keywords)
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+
+    @classmethod
+    def for_keywords(cls, keywords: Iterable[str], whole_words=False) -> 'KeywordClassifier':
+        """Классификатор для набора слов, построенный один раз на процесс"""
+        return _cached_classifier(tuple(keywords), whole_words)
+
+    def find(self, text: str) -> Dict[str, List[int]]:
+        """Позиции всех вхождений каждого найденного ключевого слова"""
+        positions = {}
+        if self._pattern is None:
+            return positions
+
+        text = text.lower()
+        for m in self._pattern.finditer(text):
+            start = m.start()
+            for kw in self._prefixes[m.group(1)]:
+                if self.whole_words and self._continues_word(text, start + len(kw), kw):
+                    continue
+                positions.setdefault(kw, []).append(start)
+        return positions
+
+    def classify(self, text: str, threshold=1, weights: Optional[Dict[str, float]] = None) -> ClassificationResult:
+        """Категория по количеству (или сумме весов weights) различных найденных ключевых слов"""
+        return ClassificationResult(self.keywords, self.find(text), threshold, weights)
+
+    def _continues_word(self, text, end, kw) -> bool:
+        return bool(_WORD_CHAR.match(kw[-1]) and _WORD_CHAR.match(text, end))
+
+
+@lru_cache(maxsize=32)
+def _cached_classifier(keywords, whole_words):
+    return KeywordClassifier(keywords, whole_words)
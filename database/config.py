@@ -0,0 +1,75 @@
+"""
+Настройки подключения к базе данных.
+
+Значения берутся из переменных окружения RESUME_DB_*, а если их нет -
+из секции [database] файла database.ini в корне проекта (путь можно
+задать переменной RESUME_DB_CONFIG).
+"""
+
+import configparser
+import os
+
+
+CONFIG_ENV = "RESUME_DB_CONFIG"
+DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database.ini")
+
+# Параметр: (переменная окружения, значение по умолчанию)
+_SETTINGS = {
+    'host': ("RESUME_DB_HOST", "localhost"),
+    'port': ("RESUME_DB_PORT", "5432"),
+    'dbname': ("RESUME_DB_NAME", "resume_db"),
+    'user': ("RESUME_DB_USER", "postgres"),
+    'password': ("RESUME_DB_PASSWORD", ""),
+    'connect_timeout': ("RESUME_DB_CONNECT_TIMEOUT", "5"),
+    'pool_min': ("RESUME_DB_POOL_MIN", "1"),
+    'pool_max': ("RESUME_DB_POOL_MAX", "8"),
+    'pool_timeout': ("RESUME_DB_POOL_TIMEOUT", "10"),
+    'health_check_interval': ("RESUME_DB_HEALTH_CHECK_INTERVAL", "30"),
+}
+
+
+class DatabaseConfig:
+    """Параметры подключения и пула соединений"""
+
+    def __init__(self, values=None):
+        values = values or {}
+        get = lambda key: values.get(key, _SETTINGS[key][1])
+        self.host = get('host')
+        self.port = str(get('port'))
+        self.dbname = get('dbname')
+        self.user = get('user')
+        self.password = get('password')
+        self.connect_timeout = int(get('connect_timeout'))
+        self.pool_min = int(get('pool_min'))
+        self.pool_max = max(int(get('pool_max')), self.pool_min, 1)
+        self.pool_timeout = float(get('pool_timeout'))
+        self.health_check_interval = float(get('health_check_interval'))
+
+    @classmethod
+    def load(cls, path=None):
+        """Настройки из файла конфигурации и переменных окружения (окружение важнее)"""
+        values = {}
+
+        path = path or os.environ.get(CONFIG_ENV) or DEFAULT_CONFIG_FILE
+        if os.path.exists(path):
+            parser = configparser.ConfigParser()
+            parser.read(path, encoding='utf-8')
+            if parser.has_section('database'):
+                values.update({k: v for k, v in parser.items('database') if k in _SETTINGS})
+
+        for key, (env, _) in _SETTINGS.items():
+            if env in os.environ:
+                values[key] = os.environ[env]
+
+        return cls(values)
+
+    def connect_params(self):
+        """Параметры для psycopg2.connect"""
+        return {
+            'host': self.host,
+            'port': self.port,
+            'dbname': self.dbname,
+            'user': self.user,
+            'password': self.password,
+            'connect_timeout': self.connect_timeout,
+        }
@@ -1,146 +1,347 @@
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+from .config import DatabaseConfig
+from .migrations import Migrator
 
 
 class Database:
-    def __init__(self):
+    """
+    Пул соединений с PostgreSQL. Подключение и миграции выполняются не при
+    создании объекта, а при первом обращении (is_connected, start) или в
+    фоне через start_async - окно приложения не ждет таймаута сервера.
+    """
+
+    def __init__(self, config=None):
         # Инициализация атрибутов
-        self._processed_files = {}
-        
+        self.config = config or DatabaseConfig.load()
+        self.pool = None
+
+        # Ограничение числа одновременно выданных соединений: ThreadedConnectionPool
+        # при исчерпании сразу бросает PoolError, а нужно ожидание
+        self._slots = threading.BoundedSemaphore(self.config.pool_max)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._stats = {
+            'checkouts': 0,
+            'in_use': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+            'timeouts': 0,
+            'reconnects': 0,
+        }
+
+        # Подключение выполняется один раз; другие потоки ждут его завершения
+        self._start_lock = threading.RLock()
+        self._started = False
+        self._ready = threading.Event()
+
+    def start(self):
+        """Подключение к БД и применение миграций (один раз за процесс)"""
+        with self._start_lock:
+            if not self._started:
+                self._started = True
+                try:
+                    # Дочерние процессы пула парсинга не работают с БД
+                    if multiprocessing.current_process().name == "MainProcess" and self.connect():
+                        self.create_tables()
+                finally:
+                    self._ready.set()
+        return self.pool is not None
+
+    def start_async(self, on_done=None):
+        """
+        Подключение в фоновом потоке. on_done(подключена ли БД) вызывается
+        из этого потока, в Qt его нужно передавать через сигнал.
+        """
+        def run():
+            connected = self.start()
+            if on_done is not None:
+                on_done(connected)
+
+        threading.Thread(target=run, name="db-connect", daemon=True).start()
+
+    @property
+    def is_connected(self):
+        """Доступна ли база данных (первое обращение ждет подключения)"""
+        if not self._ready.is_set():
+            self.start()
+        return self.pool is not None
+
+    def connect(self):
+        """Создание пула соединений"""
         try:
-            self.conn = psycopg2.connect(
-                host='localhost', 
-                port='5432', 
-                dbname='resume_db',
-                user='postgres', 
-                password='12345',
+            self.pool = ThreadedConnectionPool(
+                self.config.pool_min,
+                self.config.pool_max,
                 cursor_factory=RealDictCursor,
-                client_encoding='UTF-8'
+                client_encoding='UTF-8',
+                **self.config.connect_params()
             )
-            print("✓ Database connected successfully")
-            self.create_tables()
+            print(f"✓ Database connected successfully "
+                  f"({self.config.host}:{self.config.port}/{self.config.dbname}, пул до {self.config.pool_max})")
+            return True
         except Exception as e:
             print(f"✗ Database connection error: {e}")
             print("Приложение будет работать без базы данных")
-            self.conn = None
-    
-    def is_file_processed(self, file_path):
-        """Проверяет, был ли файл уже обработан"""
-        return file_path in self._processed_files
-    
-    def mark_file_as_processed(self, file_path):
-        """Отмечает файл как обработанный"""
-        self._processed_files[file_path] = True
-    
+            self.pool = None
+            return False
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Соединение из пула на время блока with. При нормальном выходе
+        транзакция фиксируется, при исключении - откатывается.
+        """
+        conn = self._checkout(timeout)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def cursor(self, timeout=None):
+        """Курсор на соединении из пула"""
+        with self.connection(timeout) as conn:
+            with conn.cursor() as cur:
+                yield cur
+
+    def metrics(self):
+        """Состояние пула: размер, занятые соединения, время ожидания"""
+        with self._lock:
+            stats = dict(self._stats)
+        checkouts = stats['checkouts']
+        return {
+            'pool_min': self.config.pool_min,
+            'pool_max': self.config.pool_max,
+            'in_use': stats['in_use'],
+            'checkouts': checkouts,
+            'wait_avg_ms': stats['wait_total'] * 1000 / checkouts if checkouts else 0.0,
+            'wait_max_ms': stats['wait_max'] * 1000,
+            'timeouts': stats['timeouts'],
+            'reconnects': stats['reconnects'],
+        }
+
+    def _checkout(self, timeout=None):
+        """Получение исправного соединения с ожиданием свободного места в пуле"""
+        if not self.pool:
+            raise PoolError("База данных не подключена")
+
+        started = time.monotonic()
+        timeout = self.config.pool_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PoolError(f"Нет свободных соединений в пуле за {timeout} с")
+        waited = time.monotonic() - started
+
+        try:
+            conn = self._get_healthy_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['wait_total'] += waited
+            self._stats['wait_max'] = max(self._stats['wait_max'], waited)
+        return conn
+
+    def _get_healthy_connection(self):
+        """Соединение из пула; разорванные соединения заменяются новыми"""
+        for _ in range(self.config.pool_max + 1):
+            try:
+                conn = self.pool.getconn()
+            except psycopg2.OperationalError:
+                # Сервер был недоступен - пересоздаем пул
+                self._reconnect()
+                continue
+
+            if self._is_healthy(conn):
+                return conn
+
+            print("Соединение с БД потеряно, переподключение...")
+            self.pool.putconn(conn, close=True)
+            with self._lock:
+                self._stats['reconnects'] += 1
+
+        return self.pool.getconn()
+
+    def _is_healthy(self, conn):
+        """Проверка соединения; запрос к серверу - только после долгого простоя"""
+        if conn.closed:
+            return False
+        idle = time.monotonic() - self._last_used.get(id(conn), 0.0)
+        if idle < self.config.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reconnect(self):
+        """Пересоздание пула после потери связи с сервером"""
+        with self._lock:
+            self._stats['reconnects'] += 1
+        old_pool = self.pool
+        if not self.connect():
+            self.pool = old_pool
+            raise PoolError("Не удалось переподключиться к базе данных")
+        if old_pool:
+            old_pool.closeall()
+
+    def _release(self, conn):
+        """Возврат соединения в пул"""
+        try:
+            self._last_used[id(conn)] = time.monotonic()
+            self.pool.putconn(conn, close=bool(conn.closed))
+        except PoolError:
+            # Соединение от старого пула после переподключения
+            conn.close()
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._slots.release()
+
     def create_tables(self):
-        """Создание таблиц в базе данных"""
-        if not self.conn:
+        """Создание и обновление схемы базы данных миграциями (данные сохраняются)"""
+        if not self.is_connected:
             return
-        
+
         try:
-            with self.conn.cursor() as cur:
-                # Удаляем старую таблицу и создаем заново с правильной структурой
-                cur.execute("DROP TABLE IF EXISTS candidates CASCADE")
-                cur.execute("DROP TABLE IF EXISTS processing_logs CASCADE")
-                
-                # Таблица кандидатов (без position)
-                cur.execute("""
-                    CREATE TABLE candidates (
-                        id SERIAL PRIMARY KEY,
-                        filename VARCHAR(255) NOT NULL UNIQUE,
-                        fio VARCHAR(255) NOT NULL,
-                        age INTEGER DEFAULT 0,
-                        experience INTEGER DEFAULT 0,
-                        education INTEGER DEFAULT 0,
-                        salary INTEGER DEFAULT 0,
-                        about TEXT,
-                        status VARCHAR(50) DEFAULT 'На рассмотрении',
-                        category_color VARCHAR(20) DEFAULT '#7f8c8d',
-                        source_file VARCHAR(500),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Таблица логов
-                cur.execute("""
-                    CREATE TABLE processing_logs (
-                        id SERIAL PRIMARY KEY,
-                        filename VARCHAR(255),
-                        operation VARCHAR(50),
-                        status VARCHAR(50),
-                        message TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                self.conn.commit()
-                print("✓ Таблицы базы данных созданы")
-                
+            started = time.perf_counter()
+            with self.connection() as conn:
+                migrator = Migrator(conn, lock_statement="LOCK TABLE schema_version IN EXCLUSIVE MODE")
+                applied = migrator.migrate()
+                version = migrator.current_version()
+
+            elapsed = (time.perf_counter() - started) * 1000
+            if applied:
+                print(f"✓ Схема базы данных обновлена до версии {version} ({elapsed:.1f} мс)")
+            else:
+                print(f"✓ Схема базы данных актуальна, версия {version} ({elapsed:.1f} мс)")
+
         except Exception as e:
-            print(f"Ошибка создания таблиц: {e}")
-            if self.conn:
-                self.conn.rollback()
-    
+            print(f"Ошибка миграции схемы: {e}")
+
     def execute(self, query, params=None):
         """Выполнение SQL запроса"""
-        if not self.conn:
+        if not self.is_connected:
             return None
-        
+
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute(query, params or ())
                 if query.strip().upper().startswith('SELECT'):
                     return cur.fetchall()
-                self.conn.commit()
                 return cur.rowcount
         except Exception as e:
             print(f"Ошибка запроса: {e}")
-            if self.conn:
-                self.conn.rollback()
             return None
-    
+
     def fetch_all(self, query, params=None):
         """Получение всех результатов"""
-        if not self.conn:
+        if not self.is_connected:
             return []
-        
+
         try:
-            with self.conn.cursor() as cur:
+            with self.cursor() as cur:
                 cur.execute(query, params or ())
                 return cur.fetchall()
         except Exception as e:
             print(f"Ошибка получения данных: {e}")
             return []
-    
+
+    def fetch_tuples(self, query, params=None):
+        """Получение всех результатов кортежами (без словаря на каждую строку)"""
+        if not self.is_connected:
+            return []
+
+        try:
+            with self.connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+                    cur.execute(query, params or ())
+                    return cur.fetchall()
+        except Exception as e:
+            print(f"Ошибка получения данных: {e}")
+            return []
+
     def insert(self, table, data):
         """Вставка данных в таблицу"""
-        if not self.conn:
+        if not self.is_connected:
             return None
-        
+
         try:
             # Убираем position, если он есть
             if 'position' in data:
                 del data['position']
-            
+
             columns = ', '.join(data.keys())
             placeholders = ', '.join(['%s'] * len(data))
             query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING id"
-            
-            with self.conn.cursor() as cur:
+
+            with self.cursor() as cur:
                 cur.execute(query, tuple(data.values()))
                 result = cur.fetchone()
-                self.conn.commit()
-                return result['id'] if result else None
+            return result['id'] if result else None
         except Exception as e:
             print(f"Ошибка вставки данных: {e}")
-            if self.conn:
-                self.conn.rollback()
             return None
-    
+
+    def insert_many(self, table, rows, batch_size=500, upsert=False, conflict_column='filename'):
+        """
+        Пакетная вставка строк (словарей с одинаковыми ключами).
+        Каждый пакет - одна транзакция. При upsert=True строки с уже
+        существующим conflict_column обновляются. Возвращает id в порядке
+        строк, для строк неудавшихся пакетов - None.
+        """
+        if not self.is_connected:
+            return []
+
+        rows = [{k: v for k, v in row.items() if k != 'position'} for row in rows]
+        if not rows:
+            return []
+
+        columns = list(rows[0].keys())
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        if upsert:
+            updates = ', '.join(f"{col} = EXCLUDED.{col}" for col in columns if col != conflict_column)
+            query += f" ON CONFLICT ({conflict_column}) DO UPDATE SET {updates}"
+        query += " RETURNING id"
+
+        ids = []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            values = [tuple(row.get(col) for col in columns) for row in batch]
+            try:
+                with self.cursor() as cur:
+                    result = execute_values(cur, query, values, page_size=len(values), fetch=True)
+                ids.extend(row['id'] for row in result)
+            except Exception as e:
+                print(f"Ошибка пакетной вставки данных ({len(batch)} строк): {e}")
+                ids.extend([None] * len(batch))
+        return ids
+
     def close(self):
-        """Закрытие соединения"""
-        if self.conn:
-            self.conn.close()
+        """Закрытие всех соединений пула"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
 
 
 # Создаем глобальный экземпляр БД
@@ -0,0 +1,146 @@
+"""
+Поиск повторно загружаемых резюме по содержимому файла.
+
+Ключ - BLAKE2b от байтов .docx, он считается при потоковом копировании
+файла в рабочую директорию. Индекс "хеш -> имя файла" хранится в БД
+(колонка candidates.content_hash), а без БД - в файле рядом с резюме.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Iterable, Optional, Tuple
+
+
+HASH_DIGEST_SIZE = 16
+CHUNK_SIZE = 1 << 20
+SIDECAR_NAME = ".processed_hashes.json"
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+
+
+def file_hash(path: str) -> str:
+    """Хеш содержимого файла"""
+    digest = _new_hash()
+    with open(path, 'rb') as src:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def unique_path(dest_path: str, content_hash: str) -> str:
+    """Имя для другого резюме с тем же именем файла: к имени добавляется начало хеша"""
+    root, ext = os.path.splitext(dest_path)
+    return f"{root}_{content_hash[:12]}{ext}"
+
+
+def copy_with_hash(src_path: str, dest_path: str, skip_hashes=frozenset()) -> Tuple[str, str, bool]:
+    """
+    Копирование файла с подсчетом хеша за одно чтение. Если хеш оказался
+    в skip_hashes, копия удаляется. Существующий dest_path не
+    перезаписывается: если в нем другое содержимое, файл копируется под
+    именем unique_path. Возвращает (хеш, путь копии, скопирован ли файл).
+    """
+    if os.path.exists(dest_path):
+        content_hash = file_hash(src_path)
+        if content_hash in skip_hashes or file_hash(dest_path) == content_hash:
+            return content_hash, dest_path, False
+        # Другое резюме с тем же именем файла
+        dest_path = unique_path(dest_path, content_hash)
+        if os.path.exists(dest_path) and file_hash(dest_path) == content_hash:
+            return content_hash, dest_path, False
+
+    digest = _new_hash()
+    tmp_path = dest_path + ".part"
+    try:
+        with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dest:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                dest.write(chunk)
+        content_hash = digest.hexdigest()
+        if content_hash in skip_hashes:
+            os.remove(tmp_path)
+            return content_hash, dest_path, False
+        shutil.copystat(src_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+        return content_hash, dest_path, True
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class DedupIndex:
+    """Индекс обработанных резюме: хеш содержимого -> имя файла"""
+
+    def __init__(self, sidecar_path: str):
+        self.sidecar_path = sidecar_path
+        self._by_hash: Dict[str, str] = {}
+        self._dirty = False
+        self.loaded = False
+
+    def load(self):
+        """Загрузка индекса из БД или из файла, если БД недоступна"""
+        # БД импортируется здесь: функции копирования используются в процессах пула без БД
+        from . import db
+
+        if db.is_connected:
+            rows = db.fetch_tuples("SELECT content_hash, filename FROM candidates WHERE content_hash IS NOT NULL")
+            self._by_hash = dict(rows)
+        else:
+            self._by_hash = self._read_sidecar()
+        self.loaded = True
+        print(f"Индекс обработанных резюме: {len(self._by_hash)} записей "
+              f"({'БД' if db.is_connected else self.sidecar_path})")
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Имя файла, под которым уже загружено резюме с таким содержимым"""
+        return self._by_hash.get(content_hash)
+
+    def add(self, content_hash: str, filename: str):
+        """
+        Запись о загруженном резюме. В БД хеш сохраняется вместе с
+        кандидатом, без БД запись попадает в файл при save().
+        """
+        if content_hash and self._by_hash.get(content_hash) != filename:
+            self._by_hash[content_hash] = filename
+            self._dirty = True
+
+    def known_hashes(self, filenames: Optional[Iterable[str]] = None) -> frozenset:
+        """
+        Хеши, файлы с которыми можно не обрабатывать. Если передан
+        filenames, только хеши резюме из этого набора (без БД кандидаты
+        прошлых запусков не сохраняются, и их резюме нужно разобрать заново).
+        """
+        if filenames is None:
+            return frozenset(self._by_hash)
+        return frozenset(h for h, name in self._by_hash.items() if name in filenames)
+
+    def save(self):
+        """Сохранение индекса в файл (когда БД недоступна)"""
+        from . import db
+
+        if not self._dirty or db.is_connected:
+            self._dirty = False
+            return
+        tmp_path = self.sidecar_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._by_hash, f, ensure_ascii=False)
+            os.replace(tmp_path, self.sidecar_path)
+            self._dirty = False
+        except Exception as e:
+            print(f"Ошибка сохранения индекса обработанных резюме: {e}")
+
+    def _read_sidecar(self) -> Dict[str, str]:
+        if not os.path.exists(self.sidecar_path):
+            return {}
+        try:
+            with open(self.sidecar_path, encoding='utf-8') as f:
+                return dict(json.load(f))
+        except Exception as e:
+            print(f"Ошибка чтения индекса обработанных резюме: {e}")
+            return {}
@@ -0,0 +1,150 @@
+"""
+Потоковое чтение текста из DOCX без построения объектной модели python-docx.
+
+word/document.xml читается прямо из zip-архива инкрементальным парсером,
+обработанные абзацы сразу удаляются из дерева. По умолчанию возвращаются
+только абзацы тела документа - так же, как Document(path).paragraphs.
+"""
+
+import re
+import zipfile
+from typing import Callable, Iterator, Optional
+
+from lxml import etree
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+
+def _w(tag):
+    return f"{{{W_NS}}}{tag}"
+
+
+_P = _w("p")
+_R = _w("r")
+_HYPERLINK = _w("hyperlink")
+_T = _w("t")
+_TAB = _w("tab")
+_PTAB = _w("ptab")
+_BR = _w("br")
+_CR = _w("cr")
+_NO_BREAK_HYPHEN = _w("noBreakHyphen")
+_BR_TYPE = _w("type")
+_BODY = _w("body")
+_HDR = _w("hdr")
+_TBL = _w("tbl")
+_SDT = _w("sdt")
+_TXBX = _w("txbxContent")
+_FALLBACK = f"{{{MC_NS}}}Fallback"
+
+DOCUMENT_PART = "word/document.xml"
+_HEADER_PART = re.compile(r"^word/header(\d*)\.xml$")
+
+
+def _run_text(run) -> str:
+    """Текст прогона w:r (как CT_R.text в python-docx)"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or "")
+        elif tag == _TAB or tag == _PTAB:
+            parts.append("\t")
+        elif tag == _CR:
+            parts.append("\n")
+        elif tag == _BR:
+            # Разрывы страницы и колонки текста не дают
+            if child.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == _NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def paragraph_text(p) -> str:
+    """Текст абзаца w:p: прогоны и видимый текст гиперссылок"""
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(r) for r in child if r.tag == _R)
+    return "".join(parts)
+
+
+def _paragraph_source(p) -> Optional[str]:
+    """Откуда абзац: 'body', 'table', 'textbox' или None (не выдается)"""
+    parent = p.getparent()
+    if parent is not None and parent.tag in (_BODY, _HDR):
+        return "body"
+
+    source = None
+    for ancestor in p.iterancestors():
+        tag = ancestor.tag
+        # Запасная копия надписи для старых версий Word - дубликат
+        if tag == _FALLBACK:
+            return None
+        if source is None:
+            if tag == _TXBX:
+                source = "textbox"
+            elif tag == _TBL:
+                source = "table"
+    return source
+
+
+def _iter_part(stream, sources) -> Iterator[str]:
+    """Абзацы одной XML-части документа"""
+    for _, elem in etree.iterparse(stream, events=("end",), tag=(_P, _TBL, _SDT)):
+        if elem.tag == _P and _paragraph_source(elem) in sources:
+            yield paragraph_text(elem)
+
+        # Освобождаем память за прочитанными элементами верхнего уровня
+        parent = elem.getparent()
+        if parent is not None and parent.tag in (_BODY, _HDR):
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def iter_paragraphs(path, tables=False, textboxes=False, headers=False) -> Iterator[str]:
+    """
+    Потоковая выдача текста абзацев DOCX.
+
+    tables, textboxes и headers включают абзацы из таблиц, надписей и
+    верхних колонтитулов. Прекращение итерации прекращает чтение файла.
+    """
+    sources = {"body"}
+    if tables:
+        sources.add("table")
+    if textboxes:
+        sources.add("textbox")
+
+    with zipfile.ZipFile(path) as zf:
+        if headers:
+            header_parts = sorted(
+                (name for name in zf.namelist() if _HEADER_PART.match(name)),
+                key=lambda name: int(_HEADER_PART.match(name).group(1) or 0)
+            )
+            for name in header_parts:
+                with zf.open(name) as stream:
+                    yield from _iter_part(stream, sources)
+
+        with zf.open(DOCUMENT_PART) as stream:
+            yield from _iter_part(stream, sources)
+
+
+def read_text(path, stop_when: Optional[Callable[[str], bool]] = None,
+              tables=False, textboxes=False, headers=False) -> str:
+    """
+    Текст DOCX, абзацы разделены переводом строки.
+
+    stop_when получает очередной абзац; если вернул True, чтение
+    прекращается после этого абзаца.
+    """
+    paragraphs = []
+    for text in iter_paragraphs(path, tables=tables, textboxes=textboxes, headers=headers):
+        paragraphs.append(text)
+        if stop_when is not None and stop_when(text):
+            break
+    return "\n".join(paragraphs)
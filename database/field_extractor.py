@@ -0,0 +1,170 @@
+"""
+Извлечение полей резюме заранее скомпилированными шаблонами.
+
+Каждый шаблон начинается с буквального ключевого слова, поэтому движок re
+находит кандидатов быстрым поиском подстроки, а не пробует шаблон в каждой
+позиции текста. Шаблоны с альтернативой в начале ("стаж|опыт работы")
+разбиты на отдельные, из совпадений берется самое левое - как у re.search
+по исходному шаблону. Год рождения и "о себе" ищутся по ключевому слову,
+стоящему после переменной части шаблона.
+
+Текст ожидается в нижнем регистре, как его возвращает
+ResumeParser.extract_text_from_word.
+
+У каждого поля есть номер версии (FieldExtractor.VERSIONS): при изменении
+шаблонов поля номер увеличивается, и при разборе из кэша заново
+извлекается только это поле.
+"""
+
+import re
+
+
+_FIO = re.compile(r'фио[:\s]*([^:\n]+)')
+_FIO_LINE = re.compile(r'^[А-ЯЁ]{2,}\s+[А-ЯЁ]+\s+[А-ЯЁ]+', re.I)
+
+_BIRTH_ANCHORS = (re.compile(r'год\s*рождения'), re.compile(r'д\.р'))
+_AGE = re.compile(r'возраста?:\s*(\d+)')
+_EXPERIENCE = (re.compile(r'стаж[\s:]*(\d+)'), re.compile(r'опыт\s*работы[\s:]*(\d+)'))
+_SALARY = (re.compile(r'зарплат[аы][\s:]*(\d+)'), re.compile(r'salary[\s:]*(\d+)'))
+_PHD = re.compile(r'ph\.?d')
+
+# Уровни образования ниже докторского: (уровень, подстроки), от старшего к младшему
+_EDUCATION = (
+    (3, ('магистр', 'master')),
+    (2, ('бакалавр', 'bachelor')),
+    (1, ('среднее', 'колледж')),
+)
+
+_ABOUT_ANCHOR = re.compile(r'себе')
+_ABOUT = re.compile(r'о\s*себе[:\s]*([^.?!]{20,})')
+_QUALITIES = re.compile(r'личные\s*качества[:\s]*([^.?!]{20,})')
+
+ABOUT_MAX_LENGTH = 300
+
+
+def _first(patterns, text):
+    """Самое левое совпадение среди нескольких шаблонов"""
+    best = None
+    for pattern in patterns:
+        m = pattern.search(text)
+        if m and (best is None or m.start() < best.start()):
+            best = m
+    return best
+
+
+def _skip_space_back(text, pos):
+    """Начало пробельного промежутка, который заканчивается в pos"""
+    while pos > 0 and text[pos - 1].isspace():
+        pos -= 1
+    return pos
+
+
+class FieldExtractor:
+    """Извлечение ФИО, возраста, стажа, образования, зарплаты и "о себе" из текста резюме"""
+
+    # Версии извлечения полей: увеличивается при любом изменении шаблонов поля
+    VERSIONS = {
+        'fio': 1,
+        'age': 1,
+        'experience': 1,
+        'education': 1,
+        'salary': 1,
+        'about': 1,
+    }
+
+    def __init__(self, current_date):
+        self.current_date = current_date
+        self._extractors = {
+            'fio': self.fio,
+            'age': self.age,
+            'experience': self.experience,
+            'education': self.education,
+            'salary': self.salary,
+            'about': self.about,
+        }
+
+    def extract(self, text, cached=None):
+        """
+        Все поля резюме в виде словаря. cached - {поле: (версия, значение)}
+        из кэша разбора: поля текущей версии берутся оттуда без поиска.
+        """
+        data = {}
+        for name, version in self.VERSIONS.items():
+            entry = cached.get(name) if cached else None
+            if entry is not None and entry[0] == version:
+                data[name] = entry[1]
+            else:
+                data[name] = self._extractors[name](text)
+        return data
+
+    @classmethod
+    def versioned(cls, data):
+        """Поля с версиями для кэша разбора: {поле: (версия, значение)}"""
+        return {name: (version, data[name]) for name, version in cls.VERSIONS.items()}
+
+    def fio(self, text):
+        m = _FIO.search(text)
+        if m:
+            return m.group(1).strip().title()
+
+        # Ищем ФИО в первых строках
+        for line in text.split('\n', 6)[:6]:
+            line = line.strip()
+            if _FIO_LINE.match(line):
+                return line.title()
+        return "ФИО не указано"
+
+    def age(self, text):
+        year = self._birth_year(text)
+        if year is not None:
+            return self.current_date.year - year
+
+        m = _AGE.search(text)
+        return int(m.group(1)) if m else 0
+
+    def _birth_year(self, text):
+        """Год по шаблону '(\\d{4})\\s*(год рождения|д.р)', самое левое совпадение"""
+        best = None
+        for anchor in _BIRTH_ANCHORS:
+            for m in anchor.finditer(text):
+                end = _skip_space_back(text, m.start())
+                if end >= 4 and text[end - 4:end].isdecimal():
+                    if best is None or end - 4 < best[0]:
+                        best = (end - 4, int(text[end - 4:end]))
+                    break
+        return best[1] if best else None
+
+    def experience(self, text):
+        return self._number(_EXPERIENCE, text)
+
+    def salary(self, text):
+        return self._number(_SALARY, text)
+
+    def education(self, text):
+        if 'доктор' in text or _PHD.search(text):
+            return 4
+        for level, words in _EDUCATION:
+            if any(word in text for word in words):
+                return level
+        return 0
+
+    def about(self, text):
+        m = self._about_match(text) or _QUALITIES.search(text)
+        if not m:
+            return ""
+        value = m.group(1)
+        return value.strip()[:ABOUT_MAX_LENGTH] + ("..." if len(value) > ABOUT_MAX_LENGTH else "")
+
+    def _about_match(self, text):
+        """Совпадение шаблона 'о\\s*себе...' с самым левым началом"""
+        for anchor in _ABOUT_ANCHOR.finditer(text):
+            start = _skip_space_back(text, anchor.start()) - 1
+            if start >= 0 and text[start] == 'о':
+                m = _ABOUT.match(text, start)
+                if m:
+                    return m
+        return None
+
+    def _number(self, patterns, text):
+        m = _first(patterns, text)
+        return int(m.group(1)) if m else 0
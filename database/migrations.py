@@ -0,0 +1,203 @@
+"""
+Версионированные миграции схемы базы данных.
+
+Текущая версия схемы хранится в таблице schema_version. При запуске
+применяются только миграции с большим номером, каждая в своей транзакции
+вместе с записью о ней, поэтому повторный запуск ничего не меняет и
+данные между запусками сохраняются.
+
+Новая миграция добавляется в конец списка MIGRATIONS со следующим
+номером. Уже выпущенные миграции не изменяются.
+
+Миграции MIGRATIONS написаны для PostgreSQL (ADD COLUMN IF NOT EXISTS,
+tsvector, JSONB). Проверка на временной схеме PostgreSQL: обновление с
+каждой выпущенной версии и повторный запуск -
+python benchmarks/bench_migrations.py.
+"""
+
+import time
+
+
+class Migration:
+    """Одна миграция: номер, описание и SQL-команды"""
+
+    def __init__(self, version, description, statements):
+        self.version = version
+        self.description = description
+        self.statements = statements
+
+
+MIGRATIONS = [
+    Migration(1, "Таблицы кандидатов и логов обработки", [
+        """
+        CREATE TABLE IF NOT EXISTS candidates (
+            id SERIAL PRIMARY KEY,
+            filename VARCHAR(255) NOT NULL UNIQUE,
+            fio VARCHAR(255) NOT NULL,
+            age INTEGER DEFAULT 0,
+            experience INTEGER DEFAULT 0,
+            education INTEGER DEFAULT 0,
+            salary INTEGER DEFAULT 0,
+            about TEXT,
+            status VARCHAR(50) DEFAULT 'На рассмотрении',
+            category_color VARCHAR(20) DEFAULT '#7f8c8d',
+            source_file VARCHAR(500),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS processing_logs (
+            id SERIAL PRIMARY KEY,
+            filename VARCHAR(255),
+            operation VARCHAR(50),
+            status VARCHAR(50),
+            message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    Migration(2, "Индексы для фильтров кандидатов", [
+        # Сортировка списка по дате без фильтров
+        "CREATE INDEX IF NOT EXISTS idx_candidates_created_at ON candidates (created_at DESC)",
+        # Фильтр по категории с той же сортировкой
+        "CREATE INDEX IF NOT EXISTS idx_candidates_status_created_at ON candidates (status, created_at DESC)",
+        # Уровни образования (IN) вместе с диапазоном возраста
+        "CREATE INDEX IF NOT EXISTS idx_candidates_education_age ON candidates (education, age)",
+        # Диапазоны по отдельным полям, планировщик объединяет их через BitmapAnd
+        "CREATE INDEX IF NOT EXISTS idx_candidates_age ON candidates (age)",
+        "CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates (experience)",
+        # Зарплата не указана (0) у многих резюме. Частичный индекс используется, только когда
+        # задана минимальная зарплата (salary >= sal_from > 0); условие salary <= sal_to без
+        # нижней границы включает и нули, для него индекс не подходит
+        "CREATE INDEX IF NOT EXISTS idx_candidates_salary ON candidates (salary) WHERE salary > 0",
+        "ANALYZE candidates",
+    ]),
+    Migration(3, "Индекс для постраничной загрузки кандидатов", [
+        # Ключ страницы (created_at, id); индекс заменяет idx_candidates_created_at
+        "CREATE INDEX IF NOT EXISTS idx_candidates_created_at_id ON candidates (created_at DESC, id DESC)",
+        "DROP INDEX IF EXISTS idx_candidates_created_at",
+    ]),
+    Migration(4, "Хеш содержимого резюме для поиска повторных загрузок", [
+        "ALTER TABLE candidates ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32)",
+        "CREATE INDEX IF NOT EXISTS idx_candidates_content_hash ON candidates (content_hash)",
+    ]),
+    Migration(5, "Полный текст резюме и полнотекстовый поиск", [
+        "ALTER TABLE candidates ADD COLUMN IF NOT EXISTS resume_text TEXT",
+        # Резюме бывают на русском и на английском: текст разбирается обеими конфигурациями,
+        # ФИО весит больше текста. Колонка вычисляется самой БД при вставке и обновлении
+        """
+        ALTER TABLE candidates ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('russian', coalesce(fio, '')), 'A') ||
+            setweight(to_tsvector('russian', coalesce(resume_text, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(resume_text, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_candidates_search_vector ON candidates USING GIN (search_vector)",
+    ]),
+    Migration(6, "Оценка кандидата для вакансии", [
+        "ALTER TABLE candidates ADD COLUMN IF NOT EXISTS score REAL NOT NULL DEFAULT 0",
+        # Лучшие кандидаты без фильтров и с фильтром по категории: первые строки индекса
+        "CREATE INDEX IF NOT EXISTS idx_candidates_score ON candidates (score DESC, created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_candidates_status_score ON candidates (status, score DESC)",
+    ]),
+    Migration(7, "Профили вакансий", [
+        # keywords - пары [слово, вес], score_weights - веса частей оценки кандидата
+        """
+        CREATE TABLE IF NOT EXISTS vacancy_profiles (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(255) UNIQUE NOT NULL,
+            keywords JSONB NOT NULL,
+            threshold REAL NOT NULL DEFAULT 1,
+            required_fields JSONB NOT NULL DEFAULT '[]',
+            experience INTEGER NOT NULL DEFAULT 0,
+            education INTEGER NOT NULL DEFAULT 0,
+            salary_from INTEGER NOT NULL DEFAULT 0,
+            salary_to INTEGER NOT NULL DEFAULT 0,
+            score_weights JSONB NOT NULL DEFAULT '{}',
+            is_active BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        # Активным может быть только один профиль
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_vacancy_profiles_active ON vacancy_profiles (is_active) WHERE is_active",
+    ]),
+]
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description VARCHAR(255),
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class Migrator:
+    """Применение миграций к базе данных"""
+
+    def __init__(self, conn, migrations=None, placeholder='%s', lock_statement=None):
+        self.conn = conn
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+        self.placeholder = placeholder
+        # Блокировка на время миграции, чтобы два запуска не применяли ее одновременно
+        self.lock_statement = lock_statement
+
+    def current_version(self):
+        """Номер последней примененной миграции (0 - схема пустая)"""
+        cur = self.conn.cursor()
+        try:
+            cur.execute(SCHEMA_VERSION_TABLE)
+            cur.execute("SELECT MAX(version) AS version FROM schema_version")
+            row = cur.fetchone()
+        finally:
+            cur.close()
+        self.conn.commit()
+
+        version = row['version'] if isinstance(row, dict) else row[0]
+        return version or 0
+
+    def pending(self):
+        """Миграции, которые еще не применены"""
+        current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+
+    def migrate(self):
+        """Применение всех новых миграций; возвращает список примененных номеров"""
+        applied = []
+        for migration in self.pending():
+            started = time.perf_counter()
+            cur = self.conn.cursor()
+            try:
+                if self.lock_statement:
+                    cur.execute(self.lock_statement)
+
+                # Миграцию мог уже применить параллельный запуск
+                cur.execute(
+                    f"SELECT 1 FROM schema_version WHERE version = {self.placeholder}",
+                    (migration.version,)
+                )
+                if cur.fetchone():
+                    self.conn.commit()
+                    continue
+
+                for statement in migration.statements:
+                    cur.execute(statement)
+                cur.execute(
+                    f"INSERT INTO schema_version (version, description) "
+                    f"VALUES ({self.placeholder}, {self.placeholder})",
+                    (migration.version, migration.description)
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                print(f"✗ Ошибка миграции {migration.version}: {migration.description}")
+                raise
+            finally:
+                cur.close()
+
+            applied.append(migration.version)
+            print(f"✓ Миграция {migration.version} применена: {migration.description} "
+                  f"({(time.perf_counter() - started) * 1000:.1f} мс)")
+        return applied
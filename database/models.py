@@ -1,10 +1,25 @@
 from datetime import datetime
-import re
-from docx import Document
+
+from .classifier import CATEGORY_COLORS
+from .docx_reader import read_text
+from .field_extractor import FieldExtractor
+from .parse_cache import CacheEntry
+from .profiles import VacancyProfile
 
 
 class Candidate:
     """Модель кандидата"""
+    
+    # Без __dict__ у каждого экземпляра: при сотнях тысяч кандидатов это основная часть памяти
+    __slots__ = ('filename', 'fio', 'age', 'experience', 'education', 'salary',
+                 'about', 'source_file', 'original_category', 'category_color', 'content_hash',
+                 'resume_text', 'resume_terms', 'score')
+    
+    # Колонки таблицы candidates в порядке полей from_row
+    COLUMNS = ('filename', 'fio', 'age', 'experience', 'education', 'salary',
+               'about', 'source_file', 'status', 'category_color', 'score')
+    SQL_COLUMNS = ', '.join(COLUMNS)
+    
     def __init__(self, data=None):
         data = data or {}
         self.filename = data.get('filename', '')
@@ -17,13 +32,119 @@ class Candidate:
         self.source_file = data.get('source_file', '')
         self.original_category = data.get('original_category', 'Не подходит')
         self.category_color = data.get('category_color', '#888')
+        self.content_hash = data.get('content_hash')
+        # Полный текст резюме для полнотекстового поиска; после сохранения в БД в памяти не держится
+        self.resume_text = data.get('resume_text')
+        # Основы слов текста (database.stemmer.terms): считаются один раз в процессе
+        # разбора и нужны и оценке, и поисковому индексу; в БД не пишутся
+        self.resume_terms = data.get('resume_terms')
+        # Оценка для вакансии (database.scoring), по ней упорядочен результат фильтрации
+        self.score = data.get('score', 0.0)
+    
+    @classmethod
+    def from_row(cls, row):
+        """Кандидат из кортежа значений в порядке Candidate.COLUMNS"""
+        candidate = cls.__new__(cls)
+        (candidate.filename, candidate.fio, candidate.age, candidate.experience,
+         candidate.education, candidate.salary, candidate.about, candidate.source_file,
+         candidate.original_category, candidate.category_color, candidate.score) = row
+        candidate.content_hash = None
+        candidate.resume_text = None
+        candidate.resume_terms = None
+        return candidate
+    
+    @classmethod
+    def from_rows(cls, rows):
+        """Кандидаты из строк запроса 'SELECT Candidate.SQL_COLUMNS ...' без промежуточных словарей"""
+        from_row = cls.from_row
+        return [from_row(row) for row in rows]
+    
+    def db_row(self):
+        """Строка таблицы candidates для вставки"""
+        return {
+            'filename': self.filename,
+            'fio': self.fio,
+            'age': self.age,
+            'experience': self.experience,
+            'education': self.education,
+            'salary': self.salary,
+            'about': self.about,
+            'status': self.original_category,
+            'category_color': self.category_color,
+            'source_file': self.source_file,
+            'content_hash': self.content_hash,
+            'resume_text': self.resume_text,
+            'score': self.score
+        }
+
+
+class ParseResult:
+    """Результат чтения резюме: текст, распознанные поля и классификация"""
+    
+    def __init__(self, filepath, text, parser, cached=None):
+        self.filepath = filepath
+        self.text = text
+        self.found_keywords = []
+        self.classifier = None
+        # Прошлый разбор того же содержимого из кэша (CacheEntry)
+        self.cached = cached
+        self._parser = parser
+        self._candidate = None
+        self._parsed = False
+    
+    @property
+    def candidate(self):
+        """Кандидат с распознанными полями (разбор выполняется при первом обращении)"""
+        if not self._parsed:
+            cached_fields = self.cached.fields if self.cached else None
+            self._candidate = self._parser.parse_text(self.text, self.filepath, cached_fields)
+            self._parsed = True
+        return self._candidate
+    
+    def classify(self, profile):
+        """Классификация кандидата по профилю вакансии (или списку слов) на уже извлеченном тексте"""
+        candidate = self.candidate
+        if candidate is None:
+            return []
+        
+        if not isinstance(profile, VacancyProfile):
+            profile = VacancyProfile.default(profile)
+        self.classifier = profile.signature
+        cached = self.cached
+        if cached and cached.classifier == self.classifier and cached.category in CATEGORY_COLORS:
+            # Те же ключевые слова и правила: категория из кэша
+            candidate.original_category = cached.category
+            candidate.category_color = CATEGORY_COLORS[cached.category]
+            return self.found_keywords
+        
+        self.found_keywords = self._parser.classify(candidate, self.text, profile)
+        return self.found_keywords
+    
+    def cache_entry(self):
+        """Запись для кэша разбора (None - резюме не разобрано)"""
+        candidate = self.candidate
+        if candidate is None:
+            return None
+        fields = FieldExtractor.versioned({name: getattr(candidate, name) for name in FieldExtractor.VERSIONS})
+        category = candidate.original_category if self.classifier else None
+        return CacheEntry(self.text, fields, category, self.classifier)
 
 
 class ResumeParser:
     """Парсер резюме"""
     
+    # Поля шапки резюме: варианты написания каждого поля
+    HEADER_MARKERS = (
+        ('фио',),
+        ('возраст', 'год рождения', 'д.р'),
+        ('стаж', 'опыт работы'),
+        ('образование',),
+        ('зарплат', 'salary'),
+    )
+    
     def __init__(self, current_date=None):
         self.current_date = current_date or datetime.now()
+        self.extractor = FieldExtractor(self.current_date)
         self.edu_levels = {
             "Послевузовское образование": 4,
             "Высшее образование": 3,
@@ -31,31 +152,47 @@ class ResumeParser:
             "Среднее общее образование": 1
         }
     
-    def extract_text_from_word(self, path):
-        """Извлечение текста из DOCX"""
+    def extract_text_from_word(self, path, header_only=False):
+        """Извлечение текста из DOCX (header_only - читать только до конца шапки)"""
         try:
-            doc = Document(path)
-            text = "\n".join(p.text for p in doc.paragraphs)
+            stop_when = self._header_stop() if header_only else None
+            text = read_text(path, stop_when=stop_when)
             return text.lower()  # Возвращаем в нижнем регистре
         except Exception as e:
             print(f"Ошибка чтения файла {path}: {e}")
             return ""
     
+    def _header_stop(self):
+        """Условие остановки чтения: встречены все поля шапки"""
+        remaining = list(self.HEADER_MARKERS)
+        
+        def stop_when(paragraph):
+            line = paragraph.lower()
+            remaining[:] = [markers for markers in remaining if not any(m in line for m in markers)]
+            return not remaining
+        
+        return stop_when
+    
+    def read(self, filepath, cached=None):
+        """
+        Однократное чтение резюме: текст извлекается один раз, поля и
+        классификация - по запросу. С записью кэша разбора файл не читается.
+        """
+        if cached is not None and cached.text:
+            return ParseResult(filepath, cached.text, self, cached)
+        return ParseResult(filepath, self.extract_text_from_word(filepath), self)
+    
     def parse_resume(self, filepath):
         """Парсинг резюме из файла"""
-        text = self.extract_text_from_word(filepath)
+        return self.read(filepath).candidate
+    
+    def parse_text(self, text, filepath='', cached_fields=None):
+        """Парсинг резюме из уже извлеченного текста (cached_fields - поля из кэша разбора)"""
         if not text:
             print(f"Пустой текст файла: {filepath}")
             return None
         
-        data = {
-            'fio': self._extract_fio(text),
-            'age': self._extract_age(text),
-            'experience': self._extract_experience(text),
-            'education': self._extract_education(text),
-            'salary': self._extract_salary(text),
-            'about': self._extract_about_section(text),
-        }
+        data = self.extractor.extract(text, cached_fields)
         
         # Отладочная информация
         print(f"\n=== ПАРСИНГ РЕЗЮМЕ: {filepath} ===")
@@ -67,85 +204,26 @@ class ResumeParser:
         print(f"  О себе: {data['about'][:100]}...")
         
         return Candidate(data)
-    
-    def _extract_fio(self, text):
-        m = re.search(r'фио[:\s]*([^:\n]+)', text, re.IGNORECASE)
-        if m: 
-            fio = m.group(1).strip().title()
-            print(f"    Найден ФИО через шаблон 'фио': {fio}")
-            return fio
-        
-        # Ищем ФИО в первых строках
-        for line in text.split('\n')[:6]:
-            line = line.strip()
-            if re.match(r'^[А-ЯЁ]{2,}\s+[А-ЯЁ]+\s+[А-ЯЁ]+', line, re.I):
-                fio = line.title()
-                print(f"    Найден ФИО в строке: {fio}")
-                return fio
-        
-        print("    ФИО не найден, используем 'ФИО не указано'")
-        return "ФИО не указано"
-    
-    def _extract_age(self, text):
-        m = re.search(r'(\d{4})\s*(год\s*рождения|д\.р\.?)', text)
-        if m: 
-            age = self.current_date.year - int(m.group(1))
-            print(f"    Найден год рождения: {m.group(1)}, возраст: {age}")
-            return age
-        
-        m = re.search(r'возраст[а]?:\s*(\d+)', text)
-        if m: 
-            age = int(m.group(1))
-            print(f"    Найден возраст: {age}")
-            return age
-        
-        print("    Возраст не найден, используем 0")
-        return 0
-    
-    def _extract_experience(self, text):
-        m = re.search(r'(стаж|опыт\s*работы)[\s:]*(\d+)', text)
-        if m: 
-            exp = int(m.group(2))
-            print(f"    Найден опыт работы: {exp} лет")
-            return exp
-        
-        print("    Опыт работы не найден, используем 0")
-        return 0
-    
-    def _extract_education(self, text):
-        if re.search(r'ph\.?d|доктор', text): 
-            print("    Образование: PhD/Доктор (уровень 4)")
-            return 4
-        if re.search(r'магистр|master', text): 
-            print("    Образование: Магистр (уровень 3)")
-            return 3
-        if re.search(r'бакалавр|bachelor', text): 
-            print("    Образование: Бакалавр (уровень 2)")
-            return 2
-        if re.search(r'среднее|колледж', text): 
-            print("    Образование: Среднее (уровень 1)")
-            return 1
-        
-        print("    Образование не распознано, используем 0")
-        return 0
-    
-    def _extract_salary(self, text):
-        m = re.search(r'(зарплат[аы]|salary)[\s:]*(\d+)', text)
-        if m: 
-            salary = int(m.group(2))
-            print(f"    Найдена зарплата: {salary}")
-            return salary
-        
-        print("    Зарплата не найдена, используем 0")
-        return 0
-    
-    def _extract_about_section(self, text):
-        for pat in [r'о\s*себе[:\s]*([^.?!]{20,})', r'личные\s*качества[:\s]*([^.?!]{20,})']:
-            m = re.search(pat, text, re.I | re.S)
-            if m: 
-                about = m.group(1).strip()[:300] + ("..." if len(m.group(1)) > 300 else "")
-                print(f"    Найдено 'о себе': {about[:100]}...")
-                return about
-        
-        print("    Раздел 'о себе' не найден")
-        return ""
\ No newline at end of file
+
+    def classify(self, candidate, text, profile):
+        """Классификация кандидата по профилю вакансии (или списку слов), возвращает найденные слова"""
+        if not isinstance(profile, VacancyProfile):
+            profile = VacancyProfile.default(profile)
+        result = profile.classify(text, candidate.fio, candidate.age, candidate.experience,
+                                  candidate.education, candidate.salary)
+        cnt = len(result.found)
+
+        print(f"Найдено ключевых слов: {cnt}")
+        print(f"Найденные слова: {result.counts}")
+        if result.missing:
+            print(f"Не указаны обязательные поля: {', '.join(result.missing)}")
+
+        # По умолчанию классификация мягкая: достаточно 1 ключевого слова
+        candidate.original_category = result.category
+        candidate.category_color = result.color
+        if result.suitable:
+            print(f"Категория: ПОДХОДИТ (найдено {cnt} ключевых слов)")
+        else:
+            print(f"Категория: НЕ ПОДХОДИТ (найдено {cnt} ключевых слов)")
+
+        return result.found
@@ -0,0 +1,62 @@
+"""
+Постраничная загрузка кандидатов из БД.
+
+Страницы выбираются по ключу (created_at, id) от новых к старым: каждая
+следующая страница начинается после последней строки предыдущей, поэтому
+запрос не пропускает OFFSET строк и не держит открытый курсор между
+страницами. Загружаются только поля для списка кандидатов, поле "о себе"
+читается отдельно, когда понадобится.
+"""
+
+from typing import List, Optional
+
+from . import db
+from .models import Candidate
+
+
+PAGE_SIZE = 500
+
+# Поля кандидата без тяжелых текстовых колонок (about остается None до загрузки)
+LIGHT_SQL_COLUMNS = ', '.join('NULL' if column == 'about' else column for column in Candidate.COLUMNS)
+
+
+class CandidatePager:
+    """Последовательная выдача страниц кандидатов, от новых к старым"""
+
+    def __init__(self, page_size=PAGE_SIZE):
+        self.page_size = page_size
+        self.loaded = 0
+        self.exhausted = False
+        self._last_key = None
+
+    def next_page(self) -> List[Candidate]:
+        """Следующая страница кандидатов (пустой список - все загружены)"""
+        if self.exhausted:
+            return []
+
+        sql = f"SELECT {LIGHT_SQL_COLUMNS}, created_at, id FROM candidates"
+        params = []
+        if self._last_key is not None:
+            sql += " WHERE (created_at, id) < (%s, %s)"
+            params.extend(self._last_key)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT %s"
+        params.append(self.page_size)
+
+        rows = db.fetch_tuples(sql, tuple(params))
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if not rows:
+            return []
+
+        self._last_key = rows[-1][-2:]
+        self.loaded += len(rows)
+        width = len(Candidate.COLUMNS)
+        return Candidate.from_rows(row[:width] for row in rows)
+
+
+def load_about(candidate: Candidate) -> Optional[str]:
+    """Поле "о себе" кандидата; для постранично загруженных читается из БД один раз"""
+    if candidate.about is None:
+        rows = db.fetch_tuples("SELECT about FROM candidates WHERE filename = %s", (candidate.filename,))
+        candidate.about = (rows[0][0] if rows else None) or ""
+    return candidate.about
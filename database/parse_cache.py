@@ -0,0 +1,153 @@
+"""
+Кэш разбора резюме по хешу содержимого файла.
+
+Для каждого резюме хранится извлеченный текст, распознанные поля с
+версиями шаблонов (FieldExtractor.VERSIONS) и категория с подписью
+классификатора. При изменении ключевых слов категория пересчитывается по
+сохраненному тексту без чтения .docx, при изменении шаблона одного поля
+заново извлекается только это поле.
+
+Кэш - файл SQLite рядом с резюме, к нему обращаются и процессы пула
+парсинга. Общий объем текстов ограничен max_bytes: при превышении
+удаляются записи, которые дольше всего не использовались.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Optional
+
+
+PARSE_CACHE_NAME = ".parse_cache.sqlite3"
+TEXT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS parse_cache (
+        content_hash TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        fields TEXT NOT NULL,
+        category TEXT,
+        classifier TEXT,
+        used_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_parse_cache_used_at ON parse_cache (used_at)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+class CacheEntry:
+    """Сохраненный разбор одного резюме"""
+
+    def __init__(self, text, fields, category=None, classifier=None):
+        self.text = text
+        self.fields = fields          # {поле: (версия, значение)}
+        self.category = category
+        self.classifier = classifier  # подпись классификатора, которым получена категория
+
+
+class ParseCache:
+    """Кэш текста и полей резюме в файле SQLite"""
+
+    def __init__(self, path: str, max_bytes: int = TEXT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            # Запись из нескольких процессов: WAL и ожидание блокировки вместо ошибки
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, content_hash: str) -> Optional[CacheEntry]:
+        """Разбор резюме с таким содержимым (None - нет в кэше)"""
+        if not content_hash:
+            return None
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT text, fields, category, classifier FROM parse_cache WHERE content_hash = ?",
+                (content_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE parse_cache SET used_at = ? WHERE content_hash = ?",
+                         (time.time(), content_hash))
+            conn.commit()
+            text, fields, category, classifier = row
+            fields = {name: tuple(value) for name, value in json.loads(fields).items()}
+            return CacheEntry(text, fields, category, classifier)
+        except Exception as e:
+            print(f"Ошибка чтения кэша разбора: {e}")
+            return None
+
+    def put(self, content_hash: str, entry: CacheEntry):
+        """Сохранение разбора резюме"""
+        if not content_hash or not entry.text:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache "
+                "(content_hash, text, size, fields, category, classifier, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, entry.text, len(entry.text.encode('utf-8')),
+                 json.dumps(entry.fields, ensure_ascii=False),
+                 entry.category, entry.classifier, time.time())
+            )
+            conn.commit()
+        except Exception as e:
+            print(f"Ошибка записи кэша разбора: {e}")
+
+    def evict(self) -> int:
+        """Удаление давно не использованных записей сверх max_bytes; возвращает число удаленных"""
+        try:
+            conn = self._connect()
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            evicted = []
+            for content_hash, size in conn.execute(
+                    "SELECT content_hash, size FROM parse_cache ORDER BY used_at"):
+                if total <= self.max_bytes:
+                    break
+                evicted.append((content_hash,))
+                total -= size
+            conn.executemany("DELETE FROM parse_cache WHERE content_hash = ?", evicted)
+            conn.commit()
+            print(f"Кэш разбора: удалено {len(evicted)} записей, "
+                  f"осталось {total / (1024 * 1024):.1f} МБ")
+            return len(evicted)
+        except Exception as e:
+            print(f"Ошибка очистки кэша разбора: {e}")
+            return 0
+
+    def get_meta(self, key: str) -> Optional[str]:
+        try:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"Ошибка чтения кэша разбора: {e}")
+            return None
+
+    def set_meta(self, key: str, value: str):
+        try:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+            conn.commit()
+        except Exception as e:
+            print(f"Ошибка записи кэша разбора: {e}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,187 @@
+"""
+Профили вакансий для классификации и оценки кандидатов.
+
+Профиль - это ключевые слова с весами, порог (сумма весов найденных слов,
+с которой резюме подходит), обязательные поля (без них резюме не подходит)
+и требования для оценки кандидатов (стаж, образование, вилка зарплаты).
+Профили хранятся в БД, в таблице vacancy_profiles; один из них активный -
+по нему классифицируются загружаемые резюме. Без БД и без активного
+профиля используется профиль по умолчанию из общего списка слов.
+
+Для всех уже загруженных кандидатов профиль применяется пакетно
+(handlers.screening), по сохраненному в БД тексту резюме.
+"""
+
+import hashlib
+import json
+from typing import Iterable, List, Optional
+
+from .classifier import KeywordClassifier, NOT_SUITABLE, ClassificationResult
+from .scoring import Vacancy
+
+
+DEFAULT_PROFILE_NAME = "По умолчанию"
+
+# Поля кандидата, которые профиль может требовать, и их названия
+REQUIRED_FIELDS = {
+    'fio': "ФИО",
+    'age': "возраст",
+    'experience': "стаж",
+    'education': "образование",
+    'salary': "зарплата",
+}
+
+# ФИО, которое подставляет разбор, если его не удалось найти
+_NO_FIO = ('', 'ФИО не указано')
+
+_PROFILE_COLUMNS = ('name', 'keywords', 'threshold', 'required_fields', 'experience', 'education',
+                    'salary_from', 'salary_to', 'score_weights')
+_JSON_COLUMNS = ('keywords', 'required_fields', 'score_weights')
+
+
+def missing_fields(required: Iterable[str], fio, age, experience, education, salary) -> List[str]:
+    """Обязательные поля, которые не заполнены в резюме"""
+    values = {'fio': fio not in _NO_FIO, 'age': bool(age), 'experience': bool(experience),
+              'education': bool(education), 'salary': bool(salary)}
+    return [field for field in required if not values[field]]
+
+
+class VacancyProfile(Vacancy):
+    """Профиль вакансии: классификация (слова, веса, порог, обязательные поля) и оценка"""
+
+    def __init__(self, name, keywords, threshold=1.0, required_fields=(), experience=0, education=0,
+                 salary_from=0, salary_to=0, weights=None):
+        super().__init__(keywords, experience, education, salary_from, salary_to, weights)
+        self.name = name
+        self.threshold = float(threshold)
+        self.required_fields = tuple(field for field in required_fields if field in REQUIRED_FIELDS)
+
+    @classmethod
+    def default(cls, keywords) -> 'VacancyProfile':
+        """Профиль из списка слов: каждое весит 1, достаточно одного найденного слова"""
+        return cls(DEFAULT_PROFILE_NAME, list(keywords))
+
+    @property
+    def classifier(self) -> KeywordClassifier:
+        return KeywordClassifier.for_keywords(tuple(self.keywords))
+
+    @property
+    def signature(self) -> str:
+        """
+        Подпись правил классификации и оценки: при ее изменении кандидаты
+        классифицируются и оцениваются заново. У профиля без весов слов,
+        порога, обязательных полей и требований для оценки она совпадает с
+        подписью списка слов: такой профиль классифицирует так же, и резюме
+        не разбираются заново.
+        """
+        base = self.classifier.signature
+        weights = {kw: weight for kw, weight in self.keywords.items() if weight != 1.0}
+        scoring = [self.experience, self.education, self.salary_from, self.salary_to]
+        if (not weights and self.threshold == 1.0 and not self.required_fields
+                and not any(scoring) and self.weights == self.WEIGHTS):
+            return base
+        source = json.dumps([base, sorted(weights.items()), self.threshold, sorted(self.required_fields),
+                             scoring, sorted(self.weights.items())], ensure_ascii=False)
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+
+    def classify(self, text: str, fio=None, age=0, experience=0, education=0, salary=0) -> ClassificationResult:
+        """Категория резюме по тексту (в нижнем регистре) и распознанным полям"""
+        result = self.classifier.classify(text, self.threshold, self.keywords)
+        result.missing = missing_fields(self.required_fields, fio, age, experience, education, salary)
+        if result.missing:
+            result.set_category(NOT_SUITABLE)
+        return result
+
+    def to_row(self) -> dict:
+        """Строка таблицы vacancy_profiles"""
+        return {
+            'name': self.name,
+            # Пары [слово, вес]: в JSONB-объекте порядок слов не сохраняется, а от него зависит подпись
+            'keywords': json.dumps(list(self.keywords.items()), ensure_ascii=False),
+            'threshold': self.threshold,
+            'required_fields': json.dumps(list(self.required_fields)),
+            'experience': self.experience,
+            'education': self.education,
+            'salary_from': self.salary_from,
+            'salary_to': self.salary_to,
+            'score_weights': json.dumps(self.weights),
+        }
+
+    @classmethod
+    def from_row(cls, row) -> 'VacancyProfile':
+        """Профиль из кортежа значений в порядке _PROFILE_COLUMNS"""
+        (name, keywords, threshold, required_fields, experience, education,
+         salary_from, salary_to, score_weights) = row
+        return cls(name, dict(map(tuple, keywords)), threshold, required_fields or (), experience, education,
+                   salary_from, salary_to, score_weights or None)
+
+    def describe(self) -> str:
+        words = ', '.join(kw if weight == 1.0 else f"{kw}:{weight:g}" for kw, weight in self.keywords.items())
+        parts = [f"слова: {words}", f"порог {self.threshold:g}"]
+        if self.required_fields:
+            parts.append("обязательно: " + ', '.join(REQUIRED_FIELDS[f] for f in self.required_fields))
+        if self.experience:
+            parts.append(f"стаж от {self.experience} лет")
+        if self.education:
+            parts.append(f"образование от уровня {self.education}")
+        if self.salary_from or self.salary_to:
+            parts.append(f"зарплата {self.salary_from or 0}-{self.salary_to or '...'}")
+        return '; '.join(parts)
+
+
+class ProfileStore:
+    """Профили вакансий в БД (таблица vacancy_profiles)"""
+
+    def __init__(self, database=None):
+        if database is None:
+            from .connection import db as database
+        self.db = database
+
+    def list(self) -> List[VacancyProfile]:
+        rows = self.db.fetch_tuples(f"SELECT {', '.join(_PROFILE_COLUMNS)} FROM vacancy_profiles ORDER BY name")
+        return [VacancyProfile.from_row(row) for row in rows]
+
+    def get(self, name: str) -> Optional[VacancyProfile]:
+        rows = self.db.fetch_tuples(
+            f"SELECT {', '.join(_PROFILE_COLUMNS)} FROM vacancy_profiles WHERE name = %s", (name,))
+        return VacancyProfile.from_row(rows[0]) if rows else None
+
+    def active(self) -> Optional[VacancyProfile]:
+        """Активный профиль (None - не выбран или нет БД)"""
+        if not self.db.is_connected:
+            return None
+        try:
+            rows = self.db.fetch_tuples(
+                f"SELECT {', '.join(_PROFILE_COLUMNS)} FROM vacancy_profiles WHERE is_active")
+        except Exception as e:
+            print(f"Ошибка загрузки профиля вакансии: {e}")
+            return None
+        return VacancyProfile.from_row(rows[0]) if rows else None
+
+    def active_or_default(self, keywords) -> VacancyProfile:
+        return self.active() or VacancyProfile.default(keywords)
+
+    def save(self, profile: VacancyProfile):
+        """Добавление профиля или замена профиля с тем же именем"""
+        row = profile.to_row()
+        columns = ', '.join(row)
+        placeholders = ', '.join('%s::jsonb' if column in _JSON_COLUMNS else '%s' for column in row)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in row if column != 'name')
+        with self.db.cursor() as cur:
+            cur.execute(
+                f"INSERT INTO vacancy_profiles ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT (name) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP",
+                tuple(row.values())
+            )
+
+    def activate(self, name: str) -> bool:
+        """Выбор активного профиля (остальные перестают быть активными)"""
+        with self.db.cursor() as cur:
+            cur.execute("UPDATE vacancy_profiles SET is_active = FALSE WHERE is_active AND name <> %s", (name,))
+            cur.execute("UPDATE vacancy_profiles SET is_active = TRUE WHERE name = %s", (name,))
+            return cur.rowcount > 0
+
+    def delete(self, name: str) -> bool:
+        with self.db.cursor() as cur:
+            cur.execute("DELETE FROM vacancy_profiles WHERE name = %s", (name,))
+            return cur.rowcount > 0
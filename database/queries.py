@@ -0,0 +1,87 @@
+"""
+SQL-запросы к таблице кандидатов.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from .classifier import NOT_SUITABLE, SUITABLE
+
+
+# Верхние границы фильтров, которые означают "не важно"
+AGE_MAX = 100
+EXPERIENCE_MAX = 50
+SALARY_MAX = 9999999
+
+# Поисковый запрос по тексту резюме: слова в обеих конфигурациях (русские и английские
+# основы), синтаксис как в поисковиках - "фраза в кавычках", or, -исключить
+SEARCH_QUERY_SQL = "websearch_to_tsquery('russian', %s) || websearch_to_tsquery('english', %s)"
+
+
+def build_filter_query(filters: Dict[str, Any], columns="*") -> Tuple[str, List[Any]]:
+    """
+    SQL запрос и параметры для фильтров панели поиска. Кандидаты
+    упорядочены по оценке для вакансии (score), с текстом поиска
+    (filters['text']) - сначала по релевантности тексту (колонка rank).
+    filters['limit'] ограничивает результат лучшими кандидатами: БД
+    выбирает их частичной сортировкой (top-N heapsort), не сортируя все строки.
+    """
+    conditions = []
+    params = []
+    text = (filters.get('text') or '').strip()
+
+    # Фильтр по статусу
+    if filters['show_suitable'] and not filters['show_not_suitable']:
+        conditions.append("status = %s")
+        params.append(SUITABLE)
+    elif filters['show_not_suitable'] and not filters['show_suitable']:
+        conditions.append("status = %s")
+        params.append(NOT_SUITABLE)
+
+    # Фильтр по возрасту (только если указано значение > 0)
+    if filters['age_from'] > 0:
+        conditions.append("age >= %s")
+        params.append(filters['age_from'])
+    if filters['age_to'] > 0 and filters['age_to'] < AGE_MAX:
+        conditions.append("age <= %s")
+        params.append(filters['age_to'])
+
+    # Фильтр по опыту
+    if filters['exp_from'] > 0:
+        conditions.append("experience >= %s")
+        params.append(filters['exp_from'])
+    if filters['exp_to'] > 0 and filters['exp_to'] < EXPERIENCE_MAX:
+        conditions.append("experience <= %s")
+        params.append(filters['exp_to'])
+
+    # Фильтр по зарплате
+    if filters['sal_from'] > 0:
+        conditions.append("salary >= %s")
+        params.append(filters['sal_from'])
+    if filters['sal_to'] > 0 and filters['sal_to'] < SALARY_MAX:
+        conditions.append("salary <= %s")
+        params.append(filters['sal_to'])
+
+    # Фильтр по образованию
+    if filters['education_levels']:
+        placeholders = ', '.join(['%s'] * len(filters['education_levels']))
+        conditions.append(f"education IN ({placeholders})")
+        params.extend(sorted(filters['education_levels']))
+
+    # Собираем запрос
+    if text:
+        if columns == "*":
+            columns = "candidates.*"
+        conditions.insert(0, "search_vector @@ search.query")
+        sql = (f"SELECT {columns}, ts_rank_cd(search_vector, search.query) AS rank "
+               f"FROM candidates, (SELECT {SEARCH_QUERY_SQL} AS query) AS search")
+        params[:0] = [text, text]
+    else:
+        sql = f"SELECT {columns} FROM candidates"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY rank DESC, score DESC, created_at DESC" if text else " ORDER BY score DESC, created_at DESC"
+    if filters.get('limit'):
+        sql += " LIMIT %s"
+        params.append(filters['limit'])
+
+    return sql, params
@@ -0,0 +1,200 @@
+"""
+Оценка кандидатов для вакансии (от 0 до 1, больше - лучше).
+
+Оценка складывается из частей с весами вакансии (Vacancy.weights):
+
+- ключевые слова: веса найденных слов, умноженные на IDF (слово, которое
+  есть в каждом резюме, значит меньше редкого), в доле от суммы по всем
+  словам вакансии. Слова сравниваются по основам, как в поисковом
+  индексе. Учитывается наличие слова, а не число повторов: в резюме
+  частота слова почти всегда 1-2, и повторы говорят скорее о стиле;
+- стаж: доля от стажа, который требует вакансия (по умолчанию 10 лет);
+- образование: доля от требуемого уровня (по умолчанию - высшее);
+- зарплата: в пределах вилки - 1, выше вилки убывает до 0 при двойной
+  верхней границе, ниже вилки - до 0.5 при нулевой (намного меньшие
+  ожидания обычно означают другой уровень), не указанная - 0.5. Без
+  вилки зарплата не учитывается.
+
+Оценка считается при загрузке резюме и хранится с кандидатом (колонка
+score), результат фильтрации упорядочен по ней. Для другой вакансии все
+оценки пересчитываются векторно (rescore) по числовым полям кандидатов и
+спискам документов поискового индекса, без повторного разбора резюме.
+При пересчете IDF считается по пересчитываемым кандидатам: при загрузке
+он зависит от числа уже загруженных резюме, поэтому после загрузки
+оценки всех кандидатов пересчитываются, чтобы их можно было сравнивать.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .stemmer import terms as text_terms
+
+
+# Стаж и уровень образования, которые дают полную оценку, если вакансия их не задает
+FULL_EXPERIENCE = 10
+FULL_EDUCATION = 3
+
+# Оценка зарплаты, если кандидат ее не указал
+UNKNOWN_SALARY_FIT = 0.5
+
+
+def top_k(items: Iterable, k: Optional[int], key) -> list:
+    """
+    k лучших элементов по убыванию key (при равенстве - в исходном порядке).
+    Частичная сортировка кучей: O(n log k) вместо сортировки всех элементов.
+    """
+    if not k:
+        return sorted(items, key=key, reverse=True)
+    return heapq.nlargest(k, items, key=key)
+
+
+class Vacancy:
+    """Требования вакансии: ключевые слова с весами, стаж, образование, вилка зарплаты"""
+
+    # Веса частей оценки
+    WEIGHTS = {'keywords': 0.6, 'experience': 0.2, 'education': 0.1, 'salary': 0.1}
+
+    def __init__(self, keywords, experience=0, education=0, salary_from=0, salary_to=0, weights=None):
+        # Список слов - все слова с весом 1, иначе словарь {слово: вес}
+        if not isinstance(keywords, dict):
+            keywords = dict.fromkeys(keywords, 1.0)
+        self.keywords: Dict[str, float] = {kw.lower(): float(weight) for kw, weight in keywords.items()
+                                           if kw and weight > 0}
+        self.experience = experience
+        self.education = education
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.weights = dict(self.WEIGHTS, **(weights or {}))
+
+
+class ScoringEngine:
+    """Векторный расчет оценок кандидатов для вакансии"""
+
+    def __init__(self, vacancy: Vacancy, index=None):
+        self.vacancy = vacancy
+        # Поисковый индекс (TextIndex): частоты слов по всем резюме и слова каждого резюме
+        self.index = index
+        self._keywords = []
+        for keyword, weight in vacancy.keywords.items():
+            stems = tuple(text_terms(keyword))
+            if stems:
+                self._keywords.append((keyword, stems, weight))
+        self._weights = None
+        # Кандидаты, по которым считается IDF: (маска номеров документов, число кандидатов)
+        self._population = None
+
+    def use_population(self, filenames: Sequence[str]):
+        """IDF слов - по этим кандидатам (например, всем в БД), а не по всему индексу"""
+        mask = np.zeros(self.index.doc_capacity() + 1, dtype=bool)
+        mask[self.index.doc_ids(filenames)] = True
+        # Последний элемент - резюме, которых нет в индексе: в них слов нет
+        mask[-1] = False
+        self._population = (mask, len(filenames))
+        self._weights = None
+
+    def keyword_weights(self) -> np.ndarray:
+        """Вес каждого слова вакансии с учетом IDF по резюме поискового индекса"""
+        if self._weights is None:
+            weights = np.array([weight for _, _, weight in self._keywords], dtype=np.float64)
+            if self.index is not None:
+                if self._population is None:
+                    n_docs = len(self.index)
+                    df = [len(self.index.documents(stems)) for _, stems, _ in self._keywords]
+                else:
+                    mask, n_docs = self._population
+                    df = [int(mask[self.index.documents(stems)].sum()) for _, stems, _ in self._keywords]
+                weights *= np.log((n_docs + 1) / (np.array(df, dtype=np.float64) + 1)) + 1
+            self._weights = weights
+        return self._weights
+
+    def keywords_from_terms(self, term_sets: Sequence[set]) -> np.ndarray:
+        """Часть оценки за ключевые слова по основам слов каждого резюме"""
+        weights = self.keyword_weights()
+        total = weights.sum()
+        result = np.zeros(len(term_sets), dtype=np.float64)
+        if not total:
+            return result
+        for j, (_, stems, _) in enumerate(self._keywords):
+            hits = np.fromiter((all(stem in found for stem in stems) for found in term_sets),
+                               dtype=bool, count=len(term_sets))
+            result[hits] += weights[j]
+        return result / total
+
+    def keywords_from_index(self, filenames: Sequence[str]) -> np.ndarray:
+        """Часть оценки за ключевые слова по спискам документов поискового индекса"""
+        weights = self.keyword_weights()
+        total = weights.sum()
+        if not total or self.index is None:
+            return np.zeros(len(filenames), dtype=np.float64)
+
+        # Баллы по номерам документов; последний элемент - для резюме, которых нет в индексе
+        doc_ids = self.index.doc_ids(filenames)
+        by_doc = np.zeros(self.index.doc_capacity() + 1, dtype=np.float64)
+        for j, (_, stems, _) in enumerate(self._keywords):
+            by_doc[self.index.documents(stems)] += weights[j]
+        return by_doc[doc_ids] / total
+
+    def combine(self, keywords, experience, education, salary) -> np.ndarray:
+        """Итоговые оценки по частям (массивы одинаковой длины)"""
+        vacancy = self.vacancy
+        experience = np.clip(np.asarray(experience, dtype=np.float64), 0, None)
+        education = np.clip(np.asarray(education, dtype=np.float64), 0, None)
+        salary = np.asarray(salary, dtype=np.float64)
+
+        parts = {
+            'keywords': np.asarray(keywords, dtype=np.float64),
+            'experience': np.minimum(experience / (vacancy.experience or FULL_EXPERIENCE), 1),
+            'education': np.minimum(education / (vacancy.education or FULL_EDUCATION), 1),
+            'salary': self._salary_fit(salary),
+        }
+        total = sum(vacancy.weights.values()) or 1.0
+        score = sum(vacancy.weights[name] * part for name, part in parts.items()) / total
+        return np.round(score, 4)
+
+    def _salary_fit(self, salary: np.ndarray) -> np.ndarray:
+        lower, upper = self.vacancy.salary_from, self.vacancy.salary_to
+        fit = np.ones(len(salary))
+        if upper <= 0 and lower <= 0:
+            return fit
+        if upper > 0:
+            fit = np.clip(2 - salary / upper, 0, 1)
+        if lower > 0:
+            below = salary < lower
+            fit[below] = 0.5 + 0.5 * salary[below] / lower
+        fit[salary <= 0] = UNKNOWN_SALARY_FIT
+        return fit
+
+    def score_candidates(self, candidates: List) -> List[float]:
+        """
+        Оценки кандидатов при загрузке (записываются в candidate.score).
+        Слова берутся из основ текста резюме (resume_terms, посчитанных при
+        разборе), а если текста нет - из поискового индекса.
+        """
+        if not candidates:
+            return []
+        term_sets = [set(c.resume_terms if c.resume_terms is not None else text_terms(c.resume_text))
+                     if c.resume_text else None for c in candidates]
+        keywords = np.zeros(len(candidates), dtype=np.float64)
+
+        with_text = [i for i, found in enumerate(term_sets) if found is not None]
+        if with_text:
+            keywords[with_text] = self.keywords_from_terms([term_sets[i] for i in with_text])
+        without_text = [i for i, found in enumerate(term_sets) if found is None]
+        if without_text:
+            keywords[without_text] = self.keywords_from_index([candidates[i].filename for i in without_text])
+
+        scores = self.combine(keywords,
+                              [c.experience or 0 for c in candidates],
+                              [c.education or 0 for c in candidates],
+                              [c.salary or 0 for c in candidates]).tolist()
+        for candidate, score in zip(candidates, scores):
+            candidate.score = score
+        return scores
+
+    def rescore(self, filenames, experience, education, salary) -> np.ndarray:
+        """Оценки всех кандидатов по колонкам без текстов резюме (для новой вакансии)"""
+        if self.index is not None:
+            self.use_population(filenames)
+        return self.combine(self.keywords_from_index(filenames), experience, education, salary)
@@ -0,0 +1,179 @@
+"""
+Разбиение текста на слова и выделение основ (стемминг) для поиска.
+
+Русские слова обрабатываются алгоритмом Snowball (Портера) для русского
+языка, английские - упрощенным алгоритмом Портера. Язык слова
+определяется по первой букве. Основа нужна только для сравнения слов
+между собой ("менеджером" и "менеджеры" -> "менеджер"), она не обязана
+быть настоящим словом.
+
+При изменении правил увеличивается STEMMER_VERSION: поисковые индексы,
+построенные прежними правилами, перестраиваются.
+"""
+
+import re
+from functools import lru_cache
+from typing import List
+
+
+STEMMER_VERSION = 1
+
+_TOKEN = re.compile(r'[0-9a-zа-яё]+(?:[+#]+|(?:[.\-][0-9a-zа-яё]+)*)')
+_CYRILLIC = re.compile(r'[а-яё]')
+
+# --- Русский (Snowball) ---
+
+_RU_VOWELS = "аеиоуыэюя"
+_RU_RV = re.compile(r'^(.*?[аеиоуыэюя])(.*)$')
+_RU_PERFECTIVE_GERUND = re.compile(r'((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$')
+_RU_REFLEXIVE = re.compile(r'(ся|сь)$')
+_RU_ADJECTIVE = re.compile(r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|ую|юю|ая|яя|ою|ею)$')
+_RU_PARTICIPLE = re.compile(r'((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$')
+_RU_VERB = re.compile(r'((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|ят|ует|уют|ит|ыт|ены|'
+                      r'ить|ыть|ишь|ую|ю)|((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$')
+_RU_NOUN = re.compile(r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|ам|ом|о|у|ах|иях|ях|ы|ь|'
+                      r'ию|ью|ю|ия|ья|я)$')
+_RU_SUPERLATIVE = re.compile(r'(ейше|ейш)$')
+_RU_DERIVATIONAL = re.compile(r'ость?$')
+
+
+def _ru_r2_start(word: str) -> int:
+    """Начало области R2 (после второго сочетания "гласная, согласная")"""
+    found = 0
+    for i in range(1, len(word)):
+        if word[i] not in _RU_VOWELS and word[i - 1] in _RU_VOWELS:
+            found += 1
+            if found == 2:
+                return i + 1
+    return len(word)
+
+
+def _stem_russian(word: str) -> str:
+    word = word.replace('ё', 'е')
+    match = _RU_RV.match(word)
+    if not match:
+        return word
+    start, rv = match.groups()
+
+    # Шаг 1: деепричастие, иначе возвратная частица и прилагательное/причастие, глагол или существительное
+    stripped = _RU_PERFECTIVE_GERUND.sub('', rv, 1)
+    if stripped == rv:
+        rv = _RU_REFLEXIVE.sub('', rv, 1)
+        stripped = _RU_ADJECTIVE.sub('', rv, 1)
+        if stripped != rv:
+            rv = _RU_PARTICIPLE.sub('', stripped, 1)
+        else:
+            stripped = _RU_VERB.sub('', rv, 1)
+            rv = _RU_NOUN.sub('', rv, 1) if stripped == rv else stripped
+    else:
+        rv = stripped
+
+    # Шаг 2: окончание "и"
+    if rv.endswith('и'):
+        rv = rv[:-1]
+
+    # Шаг 3: словообразовательный суффикс "ост(ь)" в области R2
+    word = start + rv
+    match = _RU_DERIVATIONAL.search(rv)
+    if match and len(start) + match.start() >= _ru_r2_start(word):
+        rv = rv[:match.start()]
+
+    # Шаг 4: превосходная степень, двойное "н", мягкий знак
+    if rv.endswith('ь'):
+        rv = rv[:-1]
+    else:
+        rv = _RU_SUPERLATIVE.sub('', rv, 1)
+        if rv.endswith('нн'):
+            rv = rv[:-1]
+    return start + rv
+
+
+# --- Английский (упрощенный Портер) ---
+
+_EN_VOWEL = re.compile(r'[aeiouy]')
+_EN_STEP2 = (
+    ('ational', 'ate'), ('tional', 'tion'), ('ization', 'ize'), ('ation', 'ate'), ('fulness', 'ful'),
+    ('ousness', 'ous'), ('iveness', 'ive'), ('biliti', 'ble'), ('enci', 'ence'), ('anci', 'ance'),
+    ('izer', 'ize'), ('ator', 'ate'), ('alism', 'al'), ('aliti', 'al'), ('iviti', 'ive'), ('ousli', 'ous'),
+    ('entli', 'ent'), ('alli', 'al'), ('bli', 'ble'), ('eli', 'e'),
+)
+_EN_STEP3 = (('icate', 'ic'), ('ative', ''), ('alize', 'al'), ('iciti', 'ic'), ('ical', 'ic'),
+             ('ful', ''), ('ness', ''))
+_EN_STEP4 = ('ement', 'ment', 'able', 'ible', 'ance', 'ence', 'ant', 'ent', 'ism', 'ate', 'iti', 'ous',
+             'ive', 'ize', 'ion', 'al', 'er', 'ic')
+
+
+def _en_measure(stem: str) -> int:
+    """Количество сочетаний "гласные, согласные" в основе"""
+    return len(re.findall(r'[aeiouy]+[^aeiouy]+', stem))
+
+
+def _stem_english(word: str) -> str:
+    if len(word) <= 3:
+        return word
+
+    # Шаг 1: множественное число, -ed, -ing, -y
+    if word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('ies'):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+
+    for suffix in ('eed', 'ed', 'ing'):
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            if suffix == 'eed':
+                if _en_measure(stem) > 0:
+                    word = stem + 'ee'
+            elif _EN_VOWEL.search(stem):
+                word = stem
+                if word.endswith(('at', 'bl', 'iz')):
+                    word += 'e'
+                elif len(word) > 2 and word[-1] == word[-2] and word[-1] not in 'lsz':
+                    word = word[:-1]
+            break
+
+    if word.endswith('y') and _EN_VOWEL.search(word[:-1]):
+        word = word[:-1] + 'i'
+
+    # Шаги 2-4: словообразовательные суффиксы при достаточно длинной основе
+    for table, min_measure in ((_EN_STEP2, 0), (_EN_STEP3, 0)):
+        for suffix, replacement in table:
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                if _en_measure(stem) > min_measure:
+                    word = stem + replacement
+                break
+    for suffix in _EN_STEP4:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            if _en_measure(stem) > 1 and not (suffix == 'ion' and not stem.endswith(('s', 't'))):
+                word = stem
+            break
+
+    if word.endswith('e') and _en_measure(word[:-1]) > 1:
+        word = word[:-1]
+    return word
+
+
+@lru_cache(maxsize=200_000)
+def stem(word: str) -> str:
+    """Основа слова в нижнем регистре"""
+    word = word.lower()
+    # Слова с цифрами и знаками (c++, 1с, node.js) не изменяются
+    if not word.isalpha():
+        return word.replace('ё', 'е')
+    if _CYRILLIC.match(word):
+        return _stem_russian(word)
+    return _stem_english(word)
+
+
+def tokenize(text: str) -> List[str]:
+    """Слова текста в нижнем регистре (c++, c#, node.js, 1с - одним словом)"""
+    return _TOKEN.findall(text.lower())
+
+
+def terms(text: str) -> List[str]:
+    """Различные основы слов текста в порядке первого появления"""
+    return list(dict.fromkeys(stem(token) for token in tokenize(text)))
@@ -0,0 +1,614 @@
+"""
+Поисковый индекс по тексту резюме для работы без БД.
+
+Для каждой основы слова (database.stemmer) хранится отсортированный
+список номеров документов, в которых она встречается. Индекс состоит из
+двух частей:
+
+- основной файл .text_index.bin, который отображается в память (mmap):
+  отсортированные 64-битные хеши основ, смещения списков и сами списки
+  (uint32). Поиск основы - двоичный поиск по хешам, файл не читается
+  целиком и не разбирается при открытии;
+- журнал .text_index.log: резюме, добавленные после построения основного
+  файла. Запись в журнал - дописывание одной строки на резюме, поэтому
+  новые файлы попадают в индекс сразу. Когда журнал становится большим,
+  он сливается с основным файлом (compact). Новый основной файл строится
+  без блокировки индекса, поиск и добавление в это время не ждут.
+
+Запрос - слова через пробел (должны встретиться все), группы через
+"or"/"или"/"|" (любая из групп), "-слово" исключает резюме со словом.
+Слова сравниваются по основам: "менеджером" находит "менеджеры".
+
+Индекс пишет один процесс (приложение или командная строка) - так же,
+как индекс обработанных резюме.
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .stemmer import STEMMER_VERSION, stem, terms as text_terms, tokenize
+
+
+TEXT_INDEX_NAME = ".text_index.bin"
+TEXT_INDEX_LOG_NAME = ".text_index.log"
+
+# Заголовок основного файла: метка, версия, документов, основ, записей в списках
+_MAGIC = b'RTIX'
+_HEADER = struct.Struct('<4sIIIQ')
+_HEADER_SIZE = 32
+INDEX_VERSION = 1 * 1000 + STEMMER_VERSION
+
+# Журнал сливается с основным файлом, когда в нем больше документов, чем
+# max(COMPACT_MIN_DOCS, четверть основного файла)
+COMPACT_MIN_DOCS = 1000
+
+# Списки, различающиеся по длине меньше чем во столько раз, пересекаются
+# через отметки в массиве по номерам документов, а не двоичным поиском
+MASK_INTERSECT_RATIO = 8
+
+_OR_WORDS = {'or', 'или', '|'}
+
+
+@lru_cache(maxsize=200_000)
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """Группы основ (внутри группы - все слова, между группами - любая) и исключенные основы"""
+    groups = [[]]
+    excluded = []
+    for word in query.lower().replace('"', ' ').split():
+        if word in _OR_WORDS:
+            if groups[-1]:
+                groups.append([])
+            continue
+        negative = word.startswith('-') and len(word) > 1
+        stems = [stem(token) for token in tokenize(word)]
+        if negative:
+            excluded.extend(stems)
+        else:
+            groups[-1].extend(stems)
+    return [group for group in groups if group], excluded
+
+
+class SearchResult:
+    """
+    Результат поиска: имена файлов и число совпавших слов запроса, сначала
+    лучшие. Хранится двумя списками - на десятках тысяч найденных резюме
+    это в несколько раз быстрее списка пар.
+    """
+
+    def __init__(self, names: List[str], scores: List[int]):
+        self.names = names
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return zip(self.names, self.scores)
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(zip(self.names, self.scores))
+
+
+class TextIndex:
+    """Инвертированный индекс текстов резюме: основной файл в mmap и журнал добавлений"""
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, log_path: Optional[str] = None):
+        self.path = path
+        self.log_path = log_path or os.path.join(os.path.dirname(path), TEXT_INDEX_LOG_NAME)
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._mmap = None
+        self._file = None
+        self._compacting = False
+        self._reset()
+
+    @classmethod
+    def for_dir(cls, resume_dir: str) -> 'TextIndex':
+        """Общий для процесса индекс рабочей директории (пишут загрузка, читает фильтрация)"""
+        path = os.path.abspath(os.path.join(resume_dir, TEXT_INDEX_NAME))
+        with cls._instances_lock:
+            index = cls._instances.get(path)
+            if index is None:
+                index = cls._instances[path] = cls(path)
+            return index
+
+    def _reset(self):
+        # Основной файл
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._starts = np.zeros(1, dtype=np.uint64)
+        self._postings = np.zeros(0, dtype=np.uint32)
+        self._base_docs = 0
+        # Все документы по номерам: имя файла, хеш содержимого, не удален ли; имя -> номер
+        self._n_docs = 0
+        self._names = np.empty(0, dtype=object)
+        self._content_hashes: List[Optional[str]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._doc_ids: Dict[str, int] = {}
+        # Журнал: хеш основы -> номера документов (по возрастанию)
+        self._delta: Dict[int, List[int]] = {}
+        self._delta_docs = 0
+        self._log_lines: List[str] = []
+
+    def __len__(self):
+        self.load()
+        return len(self._doc_ids)
+
+    def __contains__(self, filename):
+        self.load()
+        return filename in self._doc_ids
+
+    # --- Загрузка ---
+
+    def load(self):
+        """Открытие основного файла и чтение журнала (один раз)"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                self._open_base()
+            except Exception as e:
+                print(f"Поисковый индекс {self.path} не прочитан ({e}), он будет построен заново")
+                self._close_base()
+                self._reset()
+            self._replay_log()
+
+    def _open_base(self, docs=None):
+        """docs - уже разобранный список документов файла (после слияния)"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < _HEADER_SIZE:
+            return
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_docs, n_terms, n_postings = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"версия {version}, нужна {INDEX_VERSION}")
+
+        offset = _HEADER_SIZE
+        self._hashes = np.frombuffer(self._mmap, dtype=np.uint64, count=n_terms, offset=offset)
+        offset += 8 * n_terms
+        self._starts = np.frombuffer(self._mmap, dtype=np.uint64, count=n_terms + 1, offset=offset)
+        offset += 8 * (n_terms + 1)
+        self._postings = np.frombuffer(self._mmap, dtype=np.uint32, count=n_postings, offset=offset)
+        offset = _align(offset + 4 * n_postings)
+
+        if docs is None:
+            docs = self._read_docs(offset, n_docs)
+        names, self._content_hashes, self._doc_ids = docs
+        self._names = np.array(names + [None] * 1024, dtype=object)
+        self._alive = np.zeros(len(self._names), dtype=bool)
+        self._alive[:n_docs] = True
+        self._n_docs = self._base_docs = n_docs
+
+    def _read_docs(self, offset, n_docs):
+        names = []
+        content_hashes = []
+        for line in self._mmap[offset:].decode('utf-8').split('\n')[:n_docs]:
+            filename, _, content_hash = line.partition('\t')
+            names.append(filename)
+            content_hashes.append(content_hash or None)
+        return self._docs_state(names, content_hashes)
+
+    @staticmethod
+    def _docs_state(names, content_hashes):
+        """Имена, хеши содержимого и номера документов по именам"""
+        return names, content_hashes, {filename: i for i, filename in enumerate(names)}
+
+    def _close_base(self):
+        # Представления numpy держат буфер mmap: сначала освобождаются они
+        self._hashes = self._starts = self._postings = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError as e:
+                print(f"Поисковый индекс еще используется: {e}")
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _replay_log(self):
+        if not os.path.exists(self.log_path):
+            return
+        try:
+            with open(self.log_path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry = json.loads(line)
+                    if entry.get('version') != INDEX_VERSION:
+                        continue
+                    if 'remove' in entry:
+                        self._remove(entry['remove'])
+                        self._delta_docs += 1
+                    else:
+                        self._add_terms(entry['add'], entry['terms'], entry.get('hash'))
+        except Exception as e:
+            # Недописанная последняя строка (сбой при записи) пропускается
+            print(f"Ошибка чтения журнала поискового индекса: {e}")
+
+    # --- Изменение ---
+
+    def add(self, filename: str, text: str, content_hash: Optional[str] = None,
+            stems: Optional[List[str]] = None) -> bool:
+        """
+        Добавление (или замена) текста резюме. Резюме с тем же содержимым
+        не переиндексируется. stems - уже посчитанные основы слов текста
+        (Candidate.resume_terms). Изменения пишутся в журнал при save().
+        """
+        if not filename or not text:
+            return False
+        with self._lock:
+            self.load()
+            doc_id = self._doc_ids.get(filename)
+            if doc_id is not None and content_hash and self._content_hashes[doc_id] == content_hash:
+                return False
+            if stems is None:
+                stems = text_terms(text)
+            self._add_terms(filename, stems, content_hash)
+            self._log_lines.append(json.dumps({'version': INDEX_VERSION, 'add': filename,
+                                               'hash': content_hash, 'terms': stems}, ensure_ascii=False))
+            return True
+
+    def remove(self, filename: str):
+        with self._lock:
+            self.load()
+            if filename in self._doc_ids:
+                self._remove(filename)
+                self._delta_docs += 1
+                self._log_lines.append(json.dumps({'version': INDEX_VERSION, 'remove': filename},
+                                                  ensure_ascii=False))
+
+    def _add_terms(self, filename, stems, content_hash):
+        self._remove(filename)
+        doc_id = self._n_docs
+        if doc_id >= len(self._alive):
+            size = max(1024, 2 * len(self._alive))
+            self._alive = np.concatenate((self._alive, np.zeros(size - len(self._alive), dtype=bool)))
+            self._names = np.concatenate((self._names, np.empty(size - len(self._names), dtype=object)))
+        self._n_docs += 1
+        self._names[doc_id] = filename
+        self._content_hashes.append(content_hash)
+        self._alive[doc_id] = True
+        self._doc_ids[filename] = doc_id
+        for term in stems:
+            self._delta.setdefault(term_hash(term), []).append(doc_id)
+        self._delta_docs += 1
+
+    def _remove(self, filename):
+        doc_id = self._doc_ids.pop(filename, None)
+        if doc_id is not None:
+            self._alive[doc_id] = False
+
+    def save(self, compact=True):
+        """
+        Запись новых изменений в журнал; большой журнал сливается с основным
+        файлом. compact=False - слияние откладывается (compact_if_needed),
+        например чтобы выполнить его не в потоке интерфейса.
+        """
+        with self._lock:
+            if not self._log_lines:
+                return
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(self._log_lines) + '\n')
+                self._log_lines = []
+            except Exception as e:
+                print(f"Ошибка записи журнала поискового индекса: {e}")
+                return
+        if compact:
+            self.compact_if_needed()
+
+    def needs_compact(self) -> bool:
+        """Журнал стал большим и его пора слить с основным файлом"""
+        return not self._compacting and self._delta_docs > max(COMPACT_MIN_DOCS, self._base_docs // 4)
+
+    def compact_if_needed(self) -> bool:
+        if not self.needs_compact():
+            return False
+        return self.compact()
+
+    def compact(self) -> bool:
+        """
+        Слияние журнала с основным файлом; удаленные документы выбрасываются.
+
+        Под блокировкой делаются только снимок (какие документы и основы
+        сливать) и замена файлов. Новый основной файл строится и пишется без
+        нее: поиск и добавление резюме в это время не ждут. Изменения,
+        записанные в журнал за время слияния, остаются в журнале и заново
+        применяются поверх нового основного файла.
+        """
+        with self._lock:
+            self.load()
+            self.save(compact=False)
+            if self._compacting or self._log_lines or not self._delta_docs:
+                return False
+            self._compacting = True
+            # Документы с номерами от n_docs и строки журнала после log_size
+            # появятся во время слияния, в новый основной файл они не попадут
+            n_docs = self._n_docs
+            alive = self._alive[:n_docs].copy()
+            names = self._names[:n_docs].tolist()
+            content_hashes = self._content_hashes[:n_docs]
+            base = (self._hashes, self._starts, self._postings)
+            delta_hashes = sorted(self._delta)
+            log_size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        try:
+            hashes, starts, postings = self._merge(n_docs, alive, base, delta_hashes)
+            base = None  # mmap старого файла закрывается при замене, ссылки на него не нужны
+            docs = [(name, content_hash) for name, content_hash, is_alive
+                    in zip(names, content_hashes, alive.tolist()) if is_alive]
+            tmp_path = self._write_base(hashes, starts, postings, docs)
+            # Документы нового файла разбираются здесь же, а не при открытии под блокировкой
+            state = self._docs_state([name for name, _ in docs], [content_hash for _, content_hash in docs])
+            with self._lock:
+                self._swap_base(tmp_path, log_size, state)
+        except Exception as e:
+            print(f"Ошибка слияния поискового индекса: {e}")
+            return False
+        finally:
+            self._compacting = False
+        print(f"Поисковый индекс обновлен: {len(docs)} резюме, {len(hashes)} основ слов")
+        return True
+
+    def _merge(self, n_docs, alive, base, delta_hashes):
+        """Словарь и списки документов нового основного файла (без блокировки, по снимку)"""
+        base_hashes, base_starts, base_postings = base
+
+        # Новые номера документов: по порядку, без удаленных
+        remap = np.full(n_docs, -1, dtype=np.int64)
+        remap[alive] = np.arange(int(alive.sum()))
+
+        # Списки основного файла с новыми номерами
+        base_counts = np.diff(base_starts).astype(np.int64)
+        base_ids = remap[base_postings] if len(base_postings) else np.zeros(0, dtype=np.int64)
+        keep = base_ids >= 0
+        term_of_posting = np.repeat(np.arange(len(base_hashes)), base_counts)
+        base_counts = np.bincount(term_of_posting[keep], minlength=len(base_hashes))
+        base_ids = base_ids[keep]
+
+        # Списки журнала в порядке хешей. Во время слияния в них дописываются
+        # номера новых документов (не меньше n_docs) - берется начало списков
+        delta_lists = []
+        for h in delta_hashes:
+            ids = self._delta[h]
+            ids = np.array(ids[:bisect.bisect_left(ids, n_docs)], dtype=np.int64)
+            ids = remap[ids]
+            delta_lists.append(ids[ids >= 0])
+        delta_hashes = np.array(delta_hashes, dtype=np.uint64)
+        delta_counts = np.array([len(ids) for ids in delta_lists], dtype=np.int64)
+        delta_ids = np.concatenate(delta_lists) if delta_lists else np.zeros(0, dtype=np.int64)
+
+        # Объединение словарей: в каждом списке сначала номера основного файла, затем журнала
+        hashes = np.union1d(np.asarray(base_hashes), delta_hashes).astype(np.uint64)
+        base_pos = np.searchsorted(hashes, base_hashes)
+        delta_pos = np.searchsorted(hashes, delta_hashes)
+        base_part = np.zeros(len(hashes), dtype=np.int64)
+        base_part[base_pos] = base_counts
+        counts = base_part.copy()
+        counts[delta_pos] += delta_counts
+        starts = np.zeros(len(hashes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=starts[1:])
+
+        postings = np.zeros(int(starts[-1]), dtype=np.uint32)
+        postings[self._scatter(starts[base_pos], base_counts)] = base_ids
+        postings[self._scatter(starts[delta_pos] + base_part[delta_pos], delta_counts)] = delta_ids
+
+        # Основы, у которых не осталось документов
+        nonempty = counts > 0
+        if not nonempty.all():
+            hashes = hashes[nonempty]
+            starts = np.concatenate(([0], np.cumsum(counts[nonempty])))
+        return hashes, starts, postings
+
+    def _swap_base(self, tmp_path, log_size, docs):
+        """Замена основного файла; в журнале остаются строки, записанные во время слияния"""
+        tail = b''
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as f:
+                f.seek(log_size)
+                tail = f.read()
+        if self._log_lines:
+            tail += ('\n'.join(self._log_lines) + '\n').encode('utf-8')
+
+        # Отображение старого файла закрывается до замены (Windows не заменяет открытый файл)
+        self._close_base()
+        replaced = False
+        try:
+            os.replace(tmp_path, self.path)
+            replaced = True
+            if tail:
+                log_tmp = self.log_path + ".tmp"
+                with open(log_tmp, 'wb') as f:
+                    f.write(tail)
+                os.replace(log_tmp, self.log_path)
+            else:
+                try:
+                    os.remove(self.log_path)
+                except FileNotFoundError:
+                    pass
+        finally:
+            # Основной файл перечитывается, поверх него - журнал. Если замена
+            # не удалась, это прежние файлы, и изменения не теряются
+            self._reset()
+            self._open_base(docs if replaced else None)
+            self._replay_log()
+
+    @staticmethod
+    def _scatter(starts, counts):
+        """Позиции записей в общем массиве для списков с началами starts и длинами counts"""
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.repeat(np.asarray(starts, dtype=np.int64) - np.concatenate(([0], np.cumsum(counts)[:-1])),
+                            counts)
+        return offsets + np.arange(total)
+
+    def _write_base(self, hashes, starts, postings, docs):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            header = _HEADER.pack(_MAGIC, INDEX_VERSION, len(docs), len(hashes), len(postings))
+            f.write(header.ljust(_HEADER_SIZE, b'\0'))
+            f.write(hashes.astype('<u8').tobytes())
+            f.write(starts.astype('<u8').tobytes())
+            f.write(postings.astype('<u4').tobytes())
+            f.write(b'\0' * (_align(f.tell()) - f.tell()))
+            f.write('\n'.join(f"{name}\t{content_hash or ''}" for name, content_hash in docs).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    # --- Поиск ---
+
+    def _postings_for(self, term: str) -> np.ndarray:
+        """Номера документов с основой (по возрастанию, включая удаленные)"""
+        h = term_hash(term)
+        parts = []
+        i = int(np.searchsorted(self._hashes, np.uint64(h)))
+        if i < len(self._hashes) and int(self._hashes[i]) == h:
+            parts.append(self._postings[int(self._starts[i]):int(self._starts[i + 1])])
+        delta = self._delta.get(h)
+        if delta:
+            parts.append(np.array(delta, dtype=np.uint32))
+        if not parts:
+            return np.zeros(0, dtype=np.uint32)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    @staticmethod
+    def _intersect(lists: List[np.ndarray], n_docs: int) -> np.ndarray:
+        """
+        Пересечение отсортированных списков от самого короткого. Список намного
+        длиннее текущего результата - двоичный поиск в нем, близкой длины -
+        отметки в массиве из n_docs флагов (на десятках тысяч номеров в разы быстрее)
+        """
+        lists = sorted(lists, key=len)
+        result = lists[0]
+        for other in lists[1:]:
+            if not len(result) or not len(other):
+                return result[:0]
+            if len(other) <= MASK_INTERSECT_RATIO * len(result):
+                marks = np.zeros(n_docs, dtype=bool)
+                marks[other] = True
+                result = result[marks[result]]
+            else:
+                pos = np.searchsorted(other, result)
+                pos[pos == len(other)] = 0
+                result = result[other[pos] == result]
+        return result
+
+    def match(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Номера документов, подходящих под запрос, и число совпавших слов:
+        сначала с большим числом совпадений, затем в порядке добавления.
+        """
+        groups, excluded = parse_query(query)
+        if not groups:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        with self._lock:
+            self.load()
+            n_docs = self._n_docs
+            # Списки документов каждой основы запроса (основа может быть в нескольких группах)
+            all_terms = list(dict.fromkeys(term for group in groups for term in group))
+            postings = {term: self._postings_for(term) for term in all_terms + excluded}
+
+            groups = [list(dict.fromkeys(group)) for group in groups]
+            counts = None
+            if len(groups) == 1:
+                doc_ids = self._intersect([postings[term] for term in groups[0]], n_docs).astype(np.int64)
+            else:
+                # Число совпавших слов у каждого документа: один подсчет по всем спискам
+                counts = np.bincount(np.concatenate([postings[term] for term in all_terms]), minlength=n_docs)
+                if all(len(group) == 1 for group in groups):
+                    # Группы из одного слова: найдены все документы хотя бы с одним словом
+                    # (поиск ненулевых среди флагов в разы быстрее, чем среди 64-битных чисел)
+                    doc_ids = np.flatnonzero(counts > 0)
+                else:
+                    # Объединение групп: номера найденных отмечаются в массиве флагов
+                    marks = np.zeros(n_docs, dtype=bool)
+                    for group in groups:
+                        marks[self._intersect([postings[term] for term in group], n_docs)] = True
+                    doc_ids = np.flatnonzero(marks)
+            doc_ids = doc_ids[self._alive[doc_ids]]
+            if excluded:
+                marks = np.zeros(n_docs, dtype=bool)
+                for term in excluded:
+                    marks[postings[term]] = True
+                doc_ids = doc_ids[~marks[doc_ids]]
+
+            # В одной группе все найденные документы содержат все ее слова
+            if counts is None:
+                return doc_ids, np.full(len(doc_ids), len(groups[0]), dtype=np.int64)
+
+            # Устойчивая сортировка 16-битных ключей - поразрядная, за один проход; порядок
+            # добавления внутри одного числа совпадений сохраняется
+            n_terms = len(all_terms)
+            counts = counts[doc_ids].astype(np.uint16)
+            doc_ids = doc_ids[np.argsort(np.uint16(n_terms) - counts, kind='stable')]
+            # После сортировки числа совпадений идут по убыванию: строятся по размерам групп
+            sizes = np.bincount(counts, minlength=n_terms + 1)[n_terms:0:-1]
+            return doc_ids, np.repeat(np.arange(n_terms, 0, -1, dtype=np.int64), sizes)
+
+    def documents(self, stems) -> np.ndarray:
+        """Номера документов, в которых есть все основы (без удаленных)"""
+        with self._lock:
+            self.load()
+            found = self._intersect([self._postings_for(term) for term in dict.fromkeys(stems)], self._n_docs)
+            return found[self._alive[found]]
+
+    def doc_ids(self, filenames) -> np.ndarray:
+        """Номера документов по именам файлов (-1 - резюме нет в индексе)"""
+        with self._lock:
+            self.load()
+            get = self._doc_ids.get
+            return np.fromiter((get(name, -1) for name in filenames), dtype=np.int64, count=len(filenames))
+
+    def stale(self, items) -> List[str]:
+        """Имена файлов из пар (имя, хеш содержимого), которых нет в индексе или у которых другое содержимое"""
+        with self._lock:
+            self.load()
+            result = []
+            for filename, content_hash in items:
+                doc_id = self._doc_ids.get(filename)
+                if doc_id is None or (content_hash and self._content_hashes[doc_id] != content_hash):
+                    result.append(filename)
+            return result
+
+    def doc_capacity(self) -> int:
+        """Число номеров документов, включая удаленные (номера меньше него)"""
+        with self._lock:
+            self.load()
+            return self._n_docs
+
+    def search(self, query: str) -> SearchResult:
+        """Имена файлов резюме, подходящих под запрос, и число совпавших слов (см. match)"""
+        with self._lock:
+            doc_ids, scores = self.match(query)
+            return SearchResult(self._names[doc_ids].tolist(), scores.tolist())
+
+    def close(self):
+        with self._lock:
+            self.save()
+            self._close_base()
+            self._loaded = False
+            self._reset()
+
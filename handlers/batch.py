@@ -0,0 +1,257 @@
+"""
+Загрузка резюме без графического интерфейса.
+
+Тот же конвейер, что и в приложении: копирование с хешем содержимого,
+разбор и классификация в пуле процессов, пакетное сохранение в БД.
+Модуль не импортирует PyQt6 и используется при наблюдении за папкой
+входящих и в командной строке (cli.py).
+"""
+
+import os
+import time
+from typing import List, Optional
+
+from database import db, Candidate
+from database.dedup import DedupIndex, SIDECAR_NAME
+from database.parse_cache import PARSE_CACHE_NAME
+from database.profiles import ProfileStore, VacancyProfile
+from database.scoring import ScoringEngine, Vacancy
+from database.text_index import TextIndex
+from .ingest import DEFAULT_KEYWORDS, RESUME_DIR, IngestEngine
+
+
+# Строк в одном UPDATE при пересчете оценок
+RESCORE_BATCH_SIZE = 20000
+# Резюме в одном запросе текстов при пополнении поискового индекса из БД
+SYNC_BATCH_SIZE = 2000
+
+
+def sync_text_index(index) -> int:
+    """
+    Пополнение локального поискового индекса текстами резюме из БД: в нем
+    нет резюме, загруженных до его появления или на другом компьютере, а
+    по нему считаются ключевые слова в оценках кандидатов. Возвращает
+    число добавленных резюме.
+    """
+    rows = db.fetch_tuples("SELECT filename, content_hash FROM candidates WHERE resume_text <> ''")
+    stale = index.stale(rows)
+    if not stale:
+        return 0
+    started = time.perf_counter()
+    os.makedirs(os.path.dirname(index.path), exist_ok=True)
+    for start in range(0, len(stale), SYNC_BATCH_SIZE):
+        rows = db.fetch_tuples("SELECT filename, resume_text, content_hash FROM candidates WHERE filename = ANY(%s)",
+                               (stale[start:start + SYNC_BATCH_SIZE],))
+        for filename, text, content_hash in rows:
+            index.add(filename, text, content_hash)
+        index.save(compact=False)
+    index.compact_if_needed()
+    print(f"Поисковый индекс пополнен из БД: {len(stale)} резюме за {time.perf_counter() - started:.1f} с")
+    return len(stale)
+
+
+def rescore_database(vacancy, index) -> int:
+    """
+    Пересчет оценок всех кандидатов в БД для вакансии: по числовым полям
+    и поисковому индексу, пополненному текстами из БД. Оценки записываются
+    пакетными UPDATE. Возвращает число кандидатов.
+    """
+    started = time.perf_counter()
+    sync_text_index(index)
+    rows = db.fetch_tuples("SELECT filename, experience, education, salary FROM candidates")
+    if not rows:
+        return 0
+    filenames = [row[0] for row in rows]
+    columns = [[row[i] or 0 for row in rows] for i in (1, 2, 3)]
+    scores = ScoringEngine(vacancy, index).rescore(filenames, *columns).tolist()
+    computed = time.perf_counter()
+
+    # Пакет передается двумя массивами (а не строкой VALUES на кандидата);
+    # строки, у которых оценка не изменилась, не перезаписываются
+    with db.cursor() as cur:
+        for start in range(0, len(rows), RESCORE_BATCH_SIZE):
+            end = start + RESCORE_BATCH_SIZE
+            cur.execute(
+                "UPDATE candidates AS c SET score = v.score "
+                "FROM unnest(%s::text[], %s::real[]) AS v (filename, score) "
+                "WHERE c.filename = v.filename AND c.score IS DISTINCT FROM v.score",
+                (filenames[start:end], scores[start:end])
+            )
+    print(f"Оценки {len(rows)} кандидатов: расчет {(computed - started) * 1000:.0f} мс, "
+          f"запись в БД {(time.perf_counter() - computed) * 1000:.0f} мс")
+    return len(rows)
+
+
+def find_resumes(directory: str, recursive: bool = False) -> List[str]:
+    """Файлы .docx в папке (временные файлы Word пропускаются)"""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        found.extend(os.path.join(root, name) for name in sorted(files)
+                      if name.lower().endswith('.docx') and not name.startswith(('.', '~$')))
+        if not recursive:
+            break
+    return found
+
+
+class BatchIngestor:
+    """Загрузка пачек файлов: разбор, отсев повторов и сохранение в БД"""
+
+    SAVE_BATCH_SIZE = 200
+
+    def __init__(self, resume_dir: str = RESUME_DIR, keywords=None, max_workers: Optional[int] = None,
+                 vacancy: Optional[Vacancy] = None, profile: Optional[VacancyProfile] = None):
+        self.resume_dir = resume_dir
+        # Классификация: явный профиль, иначе активный профиль из БД или список слов
+        if profile is None and keywords is None:
+            profile = ProfileStore().active()
+        self.profile = profile or VacancyProfile.default(keywords or DEFAULT_KEYWORDS)
+        self.vacancy = vacancy or self.profile
+        self.max_workers = max_workers
+        self.dedup = DedupIndex(os.path.join(resume_dir, SIDECAR_NAME))
+        self.cache_path = os.path.join(resume_dir, PARSE_CACHE_NAME)
+        self.text_index = TextIndex.for_dir(resume_dir)
+        os.makedirs(resume_dir, exist_ok=True)
+
+        # Итоги всех пачек
+        self.added = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    def ingest(self, files: List[str]) -> List[Candidate]:
+        """Обработка пачки файлов, возвращает сохраненных кандидатов"""
+        if not files:
+            return []
+        if not self.dedup.loaded:
+            self.dedup.load()
+
+        started = time.perf_counter()
+        # Без БД результат не сохраняется, и повторами считаются только файлы одной пачки
+        online = db.is_connected
+        known_hashes = self.dedup.known_hashes() if online else frozenset()
+        engine = IngestEngine(self.resume_dir, self.profile, self.max_workers,
+                              known_hashes=known_hashes, cache_path=self.cache_path)
+        duplicates = []
+        candidates = engine.run(files, on_duplicate=lambda file, content_hash: duplicates.append(
+            (file, self.dedup.get(content_hash))))
+        self.failed += len(files) - len(candidates) - len(duplicates)
+
+        # Один кандидат на имя файла и на содержимое
+        unique = {}
+        seen = {}
+        for candidate in candidates:
+            known = seen.get(candidate.content_hash) or (self.dedup.get(candidate.content_hash) if online else None)
+            if known and known != candidate.filename:
+                duplicates.append((candidate.source_file, known))
+                continue
+            seen[candidate.content_hash] = candidate.filename
+            unique[candidate.filename] = candidate
+
+        saved = self.save(list(unique.values()))
+        self.dedup.save()
+
+        self._rescore_stored(saved)
+        self.added += len(saved)
+        self.duplicates += len(duplicates)
+        for file, known in duplicates:
+            print(f"  {os.path.basename(file)} - уже загружено как {known}")
+        print(f"Пачка из {len(files)} файлов: добавлено {len(saved)}, повторов {len(duplicates)} "
+              f"({time.perf_counter() - started:.1f} с)")
+        return saved
+
+    def stored_items(self):
+        """
+        Пары (файл, хеш содержимого) загруженных резюме: из БД, а без БД -
+        все .docx рабочей директории, включая разложенные по категориям.
+        """
+        if db.is_connected:
+            rows = db.fetch_tuples("SELECT filename, source_file, content_hash FROM candidates")
+            return [(source_file or os.path.join(self.resume_dir, filename), content_hash)
+                    for filename, source_file, content_hash in rows]
+
+        # Один файл на имя: после сортировки копия может лежать в нескольких папках
+        by_name = {}
+        for path in find_resumes(self.resume_dir, recursive=True):
+            by_name.setdefault(os.path.basename(path), path)
+        return [(path, None) for path in by_name.values()]
+
+    def reprocess(self, items) -> List[Candidate]:
+        """Повторный разбор и классификация загруженных резюме (текст из кэша разбора)"""
+        items = list(items)
+        if not items:
+            return []
+        engine = IngestEngine(self.resume_dir, self.profile, self.max_workers, cache_path=self.cache_path)
+        candidates = engine.reprocess(items)
+        self.failed += len(items) - len(candidates)
+        saved = self.save(candidates)
+        self._rescore_stored(saved)
+        return saved
+
+    def save(self, candidates: List[Candidate]) -> List[Candidate]:
+        """Пакетное сохранение в БД; повторный импорт обновляет запись"""
+        if not candidates:
+            return []
+        # Сначала в индекс, затем оценка: IDF слов считается с учетом этой пачки
+        self._index(candidates)
+        self._score(candidates)
+        if not db.is_connected:
+            print("БД не подключена: кандидаты разобраны, но не сохранены")
+            self._save_index()
+            return candidates
+
+        ids = db.insert_many('candidates', [c.db_row() for c in candidates],
+                             batch_size=self.SAVE_BATCH_SIZE, upsert=True)
+        saved = [c for c, candidate_id in zip(candidates, ids) if candidate_id]
+        for candidate in saved:
+            self.dedup.add(candidate.content_hash, candidate.filename)
+        # Несохраненных резюме нет в БД - и в индексе их быть не должно
+        self._save_index([c.filename for c, candidate_id in zip(candidates, ids) if not candidate_id])
+        if len(saved) < len(candidates):
+            print(f"Ошибка сохранения в БД: {len(candidates) - len(saved)} резюме")
+        return saved
+
+    def _score(self, candidates: List[Candidate]):
+        """Оценка кандидатов для вакансии по тексту резюме"""
+        try:
+            ScoringEngine(self.vacancy, self.text_index).score_candidates(candidates)
+        except Exception as e:
+            print(f"Ошибка расчета оценки кандидатов: {e}")
+
+    def rescore(self, candidates=None) -> int:
+        """
+        Пересчет оценок всех кандидатов для вакансии self.vacancy без
+        повторного разбора: по числовым полям и поисковому индексу. С БД -
+        rescore_database, без БД - в хранилище кандидатов candidates
+        (CandidateStore). Возвращает число кандидатов.
+        """
+        if not db.is_connected:
+            engine = ScoringEngine(self.vacancy, self.text_index)
+            return candidates.rescore(engine) if candidates is not None else 0
+        return rescore_database(self.vacancy, self.text_index)
+
+    def _rescore_stored(self, saved: List[Candidate]):
+        """После загрузки IDF слов изменился: оценки всех кандидатов в БД пересчитываются"""
+        if not saved or not db.is_connected:
+            return
+        try:
+            rescore_database(self.vacancy, self.text_index)
+        except Exception as e:
+            print(f"Ошибка пересчета оценок кандидатов: {e}")
+
+    def _index(self, candidates: List[Candidate]):
+        """Тексты резюме - в поисковый индекс для фильтра без БД"""
+        try:
+            for candidate in candidates:
+                self.text_index.add(candidate.filename, candidate.resume_text, candidate.content_hash,
+                                    stems=candidate.resume_terms)
+        except Exception as e:
+            print(f"Ошибка обновления поискового индекса: {e}")
+
+    def _save_index(self, removed=()):
+        """Запись журнала индекса; removed - резюме, которые не удалось сохранить в БД"""
+        try:
+            for filename in removed:
+                self.text_index.remove(filename)
+            self.text_index.save()
+        except Exception as e:
+            print(f"Ошибка обновления поискового индекса: {e}")
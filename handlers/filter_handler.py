@@ -1,13 +1,45 @@
-import os
+import html
+import time
 from typing import List, Dict, Any
-from database import db
+
+import psycopg2
+
+from database import db, Candidate
+from database.queries import build_filter_query
+from database.scoring import top_k
+from database.text_index import TextIndex
+from .sorter import FileSorter
 
 
 class FilterHandler:
-    """Обработчик фильтрации кандидатов"""
+    """
+    Обработчик фильтрации кандидатов. PyQt6 импортируется только в методах
+    для окна, поэтому run_filters и sort_files работают и без интерфейса.
+    """
+    
+    # Карточек на одной странице результатов
+    RESULTS_PAGE_SIZE = 50
+    # В окне показываются лучшие кандидаты по оценке, а не все подходящие
+    RESULTS_LIMIT = 1000
+    
+    # Общие стили карточек: задаются документу один раз, а не в каждой карточке
+    RESULT_STYLESHEET = """
+        .card { background-color: #111; margin-top: 15px; margin-bottom: 15px; }
+        .fio { margin: 0; color: #e74c3c; font-size: 24px; }
+        .status { margin-top: 8px; font-size: 18px; font-weight: bold; }
+        .info { margin-top: 10px; margin-bottom: 10px; color: #ddd; }
+        .about { margin-top: 10px; color: #aaa; font-style: italic; }
+        .message { text-align: center; color: #e74c3c; font-size: 22px; margin-top: 100px; }
+    """
     
     def __init__(self, app):
         self.app = app
+        self._task = None
+        self._generation = 0
+        self._sort_task = None
+        self._sort_pending = False
+        self._results = []
+        self._page = 0
         self.edu_levels = {
             "Послевузовское образование": 4,
             "Высшее образование": 3,
@@ -16,22 +48,138 @@ class FilterHandler:
         }
     
     def apply_filters(self) -> str:
-        """Применение фильтров и возврат HTML результата"""
-        print("\n=== НАЧАЛО ФИЛЬТРАЦИИ ===")
+        """Применение фильтров и возврат HTML первой страницы результата"""
+        candidates = self.run_filters(self._get_filter_params())
+        return self._format_results(candidates[:self.RESULTS_PAGE_SIZE])
+    
+    def start_filters(self, sort_files=False):
+        """
+        Фильтрация в фоновом потоке. Параметры читаются из UI здесь, в потоке
+        GUI; предыдущий незавершенный запрос отменяется. Сортировка файлов
+        (sort_files=True) идет отдельной задачей и не задерживает результат.
+        """
+        from PyQt6.QtCore import QThreadPool
+        from .workers import FilterTask
+        
+        self.cancel_filters()
+        self._generation += 1
+        
+        task = FilterTask(self, self._get_filter_params(), self._generation)
+        task.signals.finished.connect(self._on_filters_finished)
+        task.signals.failed.connect(self._on_filters_failed)
+        self._task = task
+        QThreadPool.globalInstance().start(task)
+        
+        if sort_files:
+            self.start_sorting()
+    
+    def start_sorting(self, recover_only=False):
+        """
+        Сортировка файлов в фоне. Если сортировка уже идет, следующая
+        запускается после нее (одна, сколько бы раз ни запрашивали).
+        """
+        from PyQt6.QtCore import QThreadPool
+        from .workers import SortTask
         
-        # Получаем настройки фильтров из UI
-        filters = self._get_filter_params()
+        if self._sort_task is not None:
+            self._sort_pending = self._sort_pending or not recover_only
+            return
+        
+        task = SortTask(self._file_sorter(), recover_only)
+        task.signals.finished.connect(self._on_sort_finished)
+        task.signals.failed.connect(self._on_sort_failed)
+        self._sort_task = task
+        QThreadPool.globalInstance().start(task)
+    
+    def recover_sorting(self):
+        """Завершение сортировки, прерванной при прошлом запуске"""
+        if self._file_sorter().has_journal():
+            self.start_sorting(recover_only=True)
+    
+    def _on_sort_finished(self, moved: list):
+        self._sort_task = None
+        print(f"Сортировка файлов: перемещено {len(moved)}")
+        if moved:
+            self.app.statusBar().showMessage(f"Перемещено файлов в {self.app.sorted_dir}: {len(moved)}", 10000)
+        if self._sort_pending:
+            self._sort_pending = False
+            self.start_sorting()
+    
+    def _on_sort_failed(self, message: str):
+        self._sort_task = None
+        self._sort_pending = False
+        self.app.statusBar().showMessage(f"Ошибка сортировки файлов: {message}", 10000)
+    
+    def cancel_filters(self):
+        """Отмена выполняемой фильтрации"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    def _on_filters_finished(self, generation: int, candidates: list):
+        """Вывод результата фильтрации (поток GUI)"""
+        # Результат устаревшего запроса не показываем
+        if generation != self._generation:
+            return
+        self._task = None
+        self._results = candidates
+        self.show_page(0)
+        print("=== АНАЛИЗ ЗАВЕРШЕН ===")
+    
+    def page_count(self) -> int:
+        return max(1, -(-len(self._results) // self.RESULTS_PAGE_SIZE))
+    
+    def show_page(self, page: int):
+        """Отрисовка одной страницы карточек результата"""
+        page = min(max(page, 0), self.page_count() - 1)
+        self._page = page
+        start = page * self.RESULTS_PAGE_SIZE
+        cards = self._results[start:start + self.RESULTS_PAGE_SIZE]
+        
+        started = time.perf_counter()
+        html_result = self._format_results(cards)
+        formatted = time.perf_counter()
+        
+        display = self.app.ui.result_display
+        display.document().setDefaultStyleSheet(self.RESULT_STYLESHEET)
+        display.setHtml(html_result)
+        rendered = time.perf_counter()
+        
+        self.app.ui.set_result_page(page, self.page_count(), len(self._results))
+        print(f"Страница результатов {page + 1}/{self.page_count()}: {len(cards)} карточек, "
+              f"HTML {(formatted - started) * 1000:.1f} мс, отрисовка {(rendered - formatted) * 1000:.1f} мс")
+    
+    def next_page(self):
+        self.show_page(self._page + 1)
+    
+    def prev_page(self):
+        self.show_page(self._page - 1)
+    
+    def _on_filters_failed(self, generation: int, message: str):
+        if generation != self._generation:
+            return
+        self._task = None
+        from PyQt6.QtWidgets import QMessageBox
+        QMessageBox.critical(self.app, "Ошибка", f"Ошибка при анализе: {message}")
+    
+    def run_filters(self, filters: Dict[str, Any], task=None) -> List[Dict[str, Any]]:
+        """Отбор кандидатов по фильтрам; не обращается к UI и может выполняться в любом потоке"""
+        print("\n=== НАЧАЛО ФИЛЬТРАЦИИ ===")
         print(f"Фильтры: {filters}")
         
         # Применяем фильтры
-        if db.conn:
-            filtered_candidates = self._filter_from_database(filters)
+        if db.is_connected:
+            filtered_candidates = self._filter_from_database(filters, task)
         else:
-            filtered_candidates = self._filter_in_memory(filters)
+            filtered_candidates = self._filter_in_memory(filters, task)
+        
+        if task is not None and task.cancelled:
+            print("Фильтрация отменена")
+            return []
         
         print(f"Найдено кандидатов после фильтрации: {len(filtered_candidates)}")
         
-        return self._format_results(filtered_candidates)
+        return filtered_candidates
     
     def _get_filter_params(self) -> Dict[str, Any]:
         """Получение параметров фильтрации из UI"""
@@ -70,7 +218,9 @@ class FilterHandler:
                 'exp_to': exp_to,
                 'sal_from': sal_from,
                 'sal_to': sal_to,
-                'education_levels': self._get_selected_education()
+                'education_levels': self._get_selected_education(),
+                'text': self.app.ui.search_text.text().strip(),
+                'limit': self.RESULTS_LIMIT
             }
         except Exception as e:
             print(f"Ошибка получения параметров фильтрации: {e}")
@@ -83,7 +233,9 @@ class FilterHandler:
                 'exp_to': 50,
                 'sal_from': 0,
                 'sal_to': 9999999,
-                'education_levels': set()
+                'education_levels': set(),
+                'text': '',
+                'limit': self.RESULTS_LIMIT
             }
     
     def _get_selected_education(self):
@@ -98,106 +250,70 @@ class FilterHandler:
             pass
         return selected
     
-    def _filter_from_database(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _filter_from_database(self, filters: Dict[str, Any], task=None) -> List[Dict[str, Any]]:
         """Фильтрация кандидатов из БД"""
         try:
             # Строим SQL запрос с фильтрами
-            conditions = []
-            params = []
-            
-            # Фильтр по статусу
-            if filters['show_suitable'] and not filters['show_not_suitable']:
-                conditions.append("status = %s")
-                params.append("Подходит")
-            elif filters['show_not_suitable'] and not filters['show_suitable']:
-                conditions.append("status = %s")
-                params.append("Не подходит")
-            
-            # Фильтр по возрасту (только если указано значение > 0)
-            if filters['age_from'] > 0:
-                conditions.append("age >= %s")
-                params.append(filters['age_from'])
-            if filters['age_to'] > 0 and filters['age_to'] < 100:
-                conditions.append("age <= %s")
-                params.append(filters['age_to'])
-            
-            # Фильтр по опыту
-            if filters['exp_from'] > 0:
-                conditions.append("experience >= %s")
-                params.append(filters['exp_from'])
-            if filters['exp_to'] > 0 and filters['exp_to'] < 50:
-                conditions.append("experience <= %s")
-                params.append(filters['exp_to'])
-            
-            # Фильтр по зарплате
-            if filters['sal_from'] > 0:
-                conditions.append("salary >= %s")
-                params.append(filters['sal_from'])
-            if filters['sal_to'] > 0 and filters['sal_to'] < 9999999:
-                conditions.append("salary <= %s")
-                params.append(filters['sal_to'])
-            
-            # Фильтр по образованию
-            if filters['education_levels']:
-                placeholders = ', '.join(['%s'] * len(filters['education_levels']))
-                conditions.append(f"education IN ({placeholders})")
-                params.extend(filters['education_levels'])
-            
-            # Собираем запрос
-            sql = "SELECT * FROM candidates"
-            if conditions:
-                sql += " WHERE " + " AND ".join(conditions)
-            sql += " ORDER BY created_at DESC"
+            # Без полного текста резюме и поискового вектора: они не выводятся
+            sql, params = build_filter_query(filters, Candidate.SQL_COLUMNS)
             
             print(f"SQL запрос: {sql}")
             print(f"Параметры: {params}")
             
             # Выполняем запрос
-            results = db.fetch_all(sql, tuple(params))
-            return results
+            if task is None:
+                return db.fetch_all(sql, tuple(params))
+            return self._fetch_cancellable(sql, tuple(params), task)
             
+        except psycopg2.extensions.QueryCanceledError:
+            print("Запрос фильтрации отменен")
+            return []
         except Exception as e:
             print(f"Ошибка фильтрации из БД: {e}")
             import traceback
             traceback.print_exc()
             return []
     
-    def _filter_in_memory(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _fetch_cancellable(self, sql: str, params: tuple, task) -> List[Dict[str, Any]]:
+        """Выполнение запроса, который можно прервать через task.cancel()"""
+        with db.connection() as conn:
+            task.attach(conn)
+            try:
+                if task.cancelled:
+                    return []
+                with conn.cursor() as cur:
+                    cur.execute(sql, params)
+                    return cur.fetchall()
+            finally:
+                task.detach()
+    
+    def _filter_in_memory(self, filters: Dict[str, Any], task=None) -> List[Dict[str, Any]]:
         """Фильтрация кандидатов в памяти"""
-        filtered = []
+        found = []
         
-        for candidate in self.app.candidates.values():
-            # Фильтр по статусу
-            if candidate.original_category == "Подходит" and not filters['show_suitable']:
-                continue
-            if candidate.original_category == "Не подходит" and not filters['show_not_suitable']:
-                continue
-            
-            # Фильтр по возрасту (значение 0 = не важно)
-            if filters['age_from'] > 0 and candidate.age < filters['age_from']:
-                continue
-            if filters['age_to'] > 0 and candidate.age > filters['age_to']:
-                continue
-            
-            # Фильтр по опыту
-            if filters['exp_from'] > 0 and candidate.experience < filters['exp_from']:
-                continue
-            if filters['exp_to'] > 0 and candidate.experience > filters['exp_to']:
-                continue
+        # Текст ищется по локальному поисковому индексу: имя файла -> число совпавших слов
+        text = (filters.get('text') or '').strip()
+        ranks = TextIndex.for_dir(self.app.resume_dir).search(text).as_dict() if text else None
+        
+        # Отбор векторными масками по колонкам хранилища (CandidateStore)
+        for i, candidate in enumerate(self.app.candidates.filter(filters)):
+            if task is not None and i % 1000 == 0 and task.cancelled:
+                return []
             
-            # Фильтр по зарплате
-            if candidate.salary:
-                if filters['sal_from'] > 0 and candidate.salary < filters['sal_from']:
-                    continue
-                if filters['sal_to'] > 0 and candidate.salary > filters['sal_to']:
+            rank = 0
+            if ranks is not None:
+                rank = ranks.get(candidate.filename)
+                if rank is None:
                     continue
-            
-            # Фильтр по образованию
-            if filters['education_levels'] and candidate.education not in filters['education_levels']:
-                continue
-            
-            # Преобразуем кандидата в словарь
+            found.append((rank, candidate))
+        
+        # Лучшие по релевантности тексту и оценке, при равенстве - новые (как ORDER BY в БД);
+        # словари строятся только для них
+        found.reverse()
+        filtered = []
+        for rank, candidate in top_k(found, filters.get('limit'), key=lambda item: (item[0], item[1].score)):
             filtered.append({
+                'filename': candidate.filename,
                 'fio': candidate.fio,
                 'age': candidate.age,
                 'experience': candidate.experience,
@@ -205,9 +321,10 @@ class FilterHandler:
                 'salary': candidate.salary,
                 'about': candidate.about,
                 'status': candidate.original_category,
-                'category_color': candidate.category_color
+                'category_color': candidate.category_color,
+                'score': candidate.score,
+                'rank': rank
             })
-        
         return filtered
     
     def _format_results(self, candidates: List[Dict[str, Any]]) -> str:
@@ -218,22 +335,21 @@ class FilterHandler:
         cards = []
         for candidate in candidates:
             color = candidate.get('category_color', '#e74c3c')
-            about = candidate.get('about') or "—"
+            about = html.escape(candidate.get('about') or "—")
             edu_str = self._edu_level_str(candidate.get('education', 0))
             salary = candidate.get('salary') or '—'
             
-            cards.append(f"""
-            <div style="background:#111;padding:22px;margin:15px 0;border-radius:16px;
-                        border-left:8px solid {color};box-shadow:0 6px 16px rgba(231,76,60,0.4);">
-                <h3 style="margin:0;color:#e74c3c;font-size:24px;">{candidate['fio']}</h3>
-                <p style="margin:8px 0 0;color:{color};font-size:18px;font-weight:bold;">{candidate['status']}</p>
-                <p style="margin:10px 0;color:#ddd;">
-                    Возраст: <b>{candidate['age']}</b>  |  Стаж: <b>{candidate['experience']} лет</b>  |
-                    Образование: <b>{edu_str}</b>  |  ЗП: <b>{salary}</b>
-                </p>
-                <p style="margin:10px 0 0;color:#aaa;font-style:italic;">О себе: {about}</p>
-            </div>
-            """)
+            # Внутри карточки задается только цвет категории, остальное - в RESULT_STYLESHEET
+            cards.append(
+                f'<div class="card">'
+                f'<h3 class="fio">{html.escape(candidate["fio"])}</h3>'
+                f'<p class="status" style="color:{color};">{html.escape(candidate["status"] or "")}</p>'
+                f'<p class="info">Возраст: <b>{candidate["age"]}</b>  |  Стаж: <b>{candidate["experience"]} лет</b>  |  '
+                f'Образование: <b>{edu_str}</b>  |  ЗП: <b>{salary}</b>  |  '
+                f'Оценка: <b>{candidate.get("score") or 0:.2f}</b></p>'
+                f'<p class="about">О себе: {about}</p>'
+                f'</div>'
+            )
         
         return "".join(cards)
     
@@ -246,23 +362,22 @@ class FilterHandler:
     
     def _get_error_html(self, message: str) -> str:
         """HTML для сообщения об ошибке"""
-        return f"""
-        <div style='text-align:center;color:#e74c3c;font-size:22px;margin-top:100px;'>
-            {message}
-        </div>
-        """
+        return f'<div class="message">{message}</div>'
     
-    def sort_files(self):
-        """Сортировка файлов по категориям"""
+    def _file_sorter(self) -> FileSorter:
+        return FileSorter(self.app.resume_dir, self.app.sorted_dir, self.app.candidates)
+    
+    def sort_files(self, rollback=False):
+        """
+        Сортировка файлов по категориям (только тех, что лежат не в папке
+        своей категории), возвращает перемещения (имя файла, откуда, куда).
+        С rollback=True прерванная сортировка откатывается, а не завершается.
+        """
         try:
-            for candidate in self.app.candidates.values():
-                if hasattr(candidate, 'original_category') and hasattr(candidate, 'filename') and hasattr(candidate, 'source_file'):
-                    folder = os.path.join(self.app.sorted_dir, candidate.original_category)
-                    os.makedirs(folder, exist_ok=True)
-                    
-                    new_path = os.path.join(folder, candidate.filename)
-                    if os.path.exists(candidate.source_file) and not os.path.exists(new_path):
-                        os.replace(candidate.source_file, new_path)
-                        candidate.source_file = new_path
+            sorter = self._file_sorter()
+            if rollback:
+                return sorter.recover(rollback=True)
+            return sorter.run()
         except Exception as e:
-            print(f"Ошибка сортировки файлов: {e}")
\ No newline at end of file
+            print(f"Ошибка сортировки файлов: {e}")
+            return []
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""
+Параллельная загрузка резюме через пул процессов.
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, List, Optional
+
+from database.dedup import copy_with_hash, file_hash
+from database.models import Candidate, ResumeParser
+from database.parse_cache import ParseCache
+from database.profiles import VacancyProfile
+from database.stemmer import terms as text_terms
+
+
+# Рабочая директория: сюда копируются загруженные резюме
+RESUME_DIR = "resumes"
+
+# Расширенный список ключевых слов для классификации (профиль вакансии по умолчанию)
+DEFAULT_KEYWORDS = (
+    "python", "sql", "django", "flask", "fastapi",
+    "html", "css", "javascript", "java", "c++", "c#",
+    "hr", "менеджер", "аналитик", "разработчик", "программист",
+    "тестировщик", "дизайнер", "маркетолог", "продавец",
+    "опыт работы", "образование", "университет", "курсы",
+    "коммуникабельность", "ответственность", "целеустремленность"
+)
+
+
+# Состояние дочернего процесса: парсер создается один раз на процесс
+_parser = None
+_profile = None
+_known_hashes = frozenset()
+_cache = None
+
+
+class Duplicate:
+    """Файл, содержимое которого уже загружено: парсинг пропущен"""
+
+    def __init__(self, file, content_hash):
+        self.file = file
+        self.content_hash = content_hash
+
+
+def _init_worker(profile, known_hashes=frozenset(), cache_path=None):
+    """Инициализация дочернего процесса пула"""
+    global _parser, _profile, _known_hashes, _cache
+    _parser = ResumeParser()
+    _profile = profile
+    _known_hashes = known_hashes
+    _cache = ParseCache(cache_path) if cache_path else None
+
+
+def _process_file(file: str, resume_dir: str):
+    """Копирование, парсинг и классификация одного файла (Candidate, Duplicate или None)"""
+    filename = os.path.basename(file)
+
+    # Копируем файл в рабочую директорию, по пути считая хеш содержимого
+    # (другое резюме с тем же именем копируется под новым именем)
+    content_hash, dest, _ = copy_with_hash(file, os.path.join(resume_dir, filename), _known_hashes)
+    if content_hash in _known_hashes:
+        return Duplicate(file, content_hash)
+
+    return _parse(dest, content_hash)
+
+
+def _reprocess_file(path: str, content_hash: Optional[str]):
+    """Повторный разбор файла из рабочей директории (текст - из кэша разбора, если есть)"""
+    if not content_hash:
+        content_hash = file_hash(path)
+    return _parse(path, content_hash)
+
+
+def _parse(path: str, content_hash: str) -> Optional[Candidate]:
+    """Разбор и классификация резюме с использованием кэша разбора"""
+    filename = os.path.basename(path)
+    cached = _cache.get(content_hash) if _cache is not None else None
+
+    # Файл читается один раз: текст используется и для полей, и для классификации
+    result = _parser.read(path, cached)
+    candidate = result.candidate
+    if not candidate:
+        print(f"Ошибка парсинга файла: {filename}")
+        return None
+
+    candidate.filename = filename
+    candidate.source_file = path
+    candidate.content_hash = content_hash
+    candidate.resume_text = result.text
+    # Основы слов - здесь, в процессе пула, а не в потоке интерфейса при сохранении
+    candidate.resume_terms = text_terms(result.text) if result.text else None
+
+    print(f"\n=== АНАЛИЗ ФАЙЛА: {filename} ===")
+    result.classify(_profile)
+
+    if _cache is not None:
+        _cache.put(content_hash, result.cache_entry())
+    return candidate
+
+
+class IngestEngine:
+    """Параллельный парсинг резюме в пуле процессов"""
+
+    # Меньше файлов быстрее обработать в текущем процессе, чем запускать пул
+    MIN_FILES_FOR_POOL = 4
+
+    def __init__(self, resume_dir: str, profile, max_workers: Optional[int] = None,
+                 known_hashes=frozenset(), cache_path: Optional[str] = None):
+        self.resume_dir = resume_dir
+        # Профиль вакансии для классификации (список слов - профиль по умолчанию из них)
+        self.profile = profile if isinstance(profile, VacancyProfile) else VacancyProfile.default(profile)
+        # Хеши уже загруженных резюме: такие файлы не парсятся
+        self.known_hashes = frozenset(known_hashes)
+        # Файл кэша разбора (None - без кэша)
+        self.cache_path = cache_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Отмена обработки: файлы, которые еще не начали парситься, пропускаются"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self, files: List[str],
+            on_result: Optional[Callable[[str, Candidate], None]] = None,
+            on_progress: Optional[Callable[[int, int], None]] = None,
+            on_duplicate: Optional[Callable[[str, str], None]] = None) -> List[Candidate]:
+        """
+        Обработка файлов. Кандидаты передаются в on_result по мере готовности,
+        on_progress получает (обработано, всего), on_duplicate - (файл, хеш)
+        для уже загруженных резюме.
+        """
+        tasks = [(_process_file, file, self.resume_dir) for file in files]
+        return self._execute(files, tasks, on_result, on_progress, on_duplicate)
+
+    def reprocess(self, items,
+                  on_result: Optional[Callable[[str, Candidate], None]] = None,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> List[Candidate]:
+        """
+        Повторный разбор уже загруженных резюме после изменения ключевых слов
+        или шаблонов. items - пары (файл в рабочей директории, хеш содержимого);
+        текст берется из кэша разбора, .docx читается только при промахе.
+        """
+        items = list(items)
+        tasks = [(_reprocess_file, path, content_hash) for path, content_hash in items]
+        return self._execute([path for path, _ in items], tasks, on_result, on_progress, None)
+
+    def _execute(self, files, tasks, on_result, on_progress, on_duplicate) -> List[Candidate]:
+        """Выполнение задач (функция, аргументы...) для файлов в пуле процессов или в текущем"""
+        self._cancelled.clear()
+        os.makedirs(self.resume_dir, exist_ok=True)
+        try:
+            return self._execute_tasks(files, tasks, on_result, on_progress, on_duplicate)
+        finally:
+            if self.cache_path:
+                cache = ParseCache(self.cache_path)
+                cache.evict()
+                cache.close()
+
+    def _execute_tasks(self, files, tasks, on_result, on_progress, on_duplicate) -> List[Candidate]:
+        total = len(files)
+        workers = min(self.max_workers, total)
+        if workers <= 1 or total < self.MIN_FILES_FOR_POOL:
+            return self._run_inline(files, tasks, on_result, on_progress, on_duplicate)
+
+        print(f"Запуск пула парсинга: {workers} процессов, {total} файлов")
+        results = []
+        done = 0
+
+        # spawn вместо fork: родительский процесс многопоточный (Qt)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.profile, self.known_hashes, self.cache_path)
+        )
+        try:
+            pending = {executor.submit(*task): file for file, task in zip(files, tasks)}
+            while pending and not self.cancelled:
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file = pending.pop(future)
+                    done += 1
+                    candidate = self._get_result(future, file)
+                    self._deliver(file, candidate, results, on_result, on_duplicate)
+                    if on_progress:
+                        on_progress(done, total)
+
+            if self.cancelled:
+                print(f"Обработка отменена: готово {done} из {total}")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
+    def _run_inline(self, files, tasks, on_result, on_progress, on_duplicate) -> List[Candidate]:
+        """Обработка небольшого числа файлов без пула процессов"""
+        _init_worker(self.profile, self.known_hashes, self.cache_path)
+        results = []
+        for done, (file, (func, *args)) in enumerate(zip(files, tasks), start=1):
+            if self.cancelled:
+                print(f"Обработка отменена: готово {done - 1} из {len(files)}")
+                break
+            try:
+                candidate = func(*args)
+            except Exception as e:
+                print(f"Ошибка обработки файла {file}: {e}")
+                candidate = None
+            self._deliver(file, candidate, results, on_result, on_duplicate)
+            if on_progress:
+                on_progress(done, len(files))
+        return results
+
+    def _deliver(self, file, result, results, on_result, on_duplicate):
+        """Передача результата обработки файла"""
+        if isinstance(result, Duplicate):
+            if on_duplicate:
+                on_duplicate(file, result.content_hash)
+        elif result is not None:
+            results.append(result)
+            if on_result:
+                on_result(file, result)
+
+    def _get_result(self, future, file):
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Ошибка обработки файла {file}: {e}")
+            return None
@@ -3,37 +3,67 @@
 """
 
 import os
-import shutil
+import time
 from typing import Dict, List, Optional
 
 from database import db, Candidate, ResumeParser
+from database.classifier import CATEGORY_COLORS
+from database.dedup import DedupIndex, SIDECAR_NAME
+from database.field_extractor import FieldExtractor
+from database.parse_cache import ParseCache, PARSE_CACHE_NAME
+from database.profiles import ProfileStore, VacancyProfile
+from database.scoring import ScoringEngine
+from database.text_index import TextIndex
+from .ingest import DEFAULT_KEYWORDS, RESUME_DIR, IngestEngine
 
 
 class ResumeHandler:
     """Обработчик резюме с сохранением в БД"""
     
+    # Кандидаты сохраняются пакетами: по размеру или по времени с прошлого сохранения
+    SAVE_BATCH_SIZE = 200
+    SAVE_INTERVAL = 1.0  # секунды
+    
     def __init__(self, app):
         self.app = app
         self.parser = ResumeParser()
         
-        # Расширенный список ключевых слов для классификации
-        self.keywords = [
-            "python", "sql", "django", "flask", "fastapi",
-            "html", "css", "javascript", "java", "c++", "c#",
-            "hr", "менеджер", "аналитик", "разработчик", "программист",
-            "тестировщик", "дизайнер", "маркетолог", "продавец",
-            "опыт работы", "образование", "университет", "курсы",
-            "коммуникабельность", "ответственность", "целеустремленность"
-        ]
+        # Профиль вакансии: классификация и оценка кандидатов. Активный профиль
+        # читается из БД после подключения (load_profile), до этого - общий список слов
+        self.profile = VacancyProfile.default(DEFAULT_KEYWORDS)
+        self._screening = None
         
         # Создаем необходимые директории
-        self.resume_dir = "resumes"
+        self.resume_dir = RESUME_DIR
         self.sorted_dir = os.path.join(self.resume_dir, "sorted")
         os.makedirs(self.resume_dir, exist_ok=True)
         os.makedirs(self.sorted_dir, exist_ok=True)
+        
+        # Уже загруженные резюме определяются по хешу содержимого, а не по пути
+        self.dedup = DedupIndex(os.path.join(self.resume_dir, SIDECAR_NAME))
+        
+        # Кэш текста и полей: после изменения ключевых слов или шаблонов .docx не перечитываются
+        self.parse_cache_path = os.path.join(self.resume_dir, PARSE_CACHE_NAME)
+        
+        # Поисковый индекс текстов для фильтра без БД (пополняется при любой загрузке)
+        self.text_index = TextIndex.for_dir(self.resume_dir)
+        
+        # Наблюдение за папкой входящих: файлы ждут, пока закончится текущая загрузка
+        self.watcher = None
+        self._inbox_signals = None
+        self._inbox_queue = []
+        
+        # Фоновая загрузка
+        self._worker = None
+        self._reprocessing = None  # подпись разбора, до которой обновляются кандидаты
+        self._reprocess_files = []
+        self._added = []
+        self._duplicates = []
+        self._pending = []
+        self._last_flush = 0.0
     
     def load_resume(self) -> List[str]:
-        """Загрузка резюме через диалог выбора файлов"""
+        """Загрузка резюме через диалог выбора файлов, возвращает файлы, поставленные в обработку"""
         from PyQt6.QtWidgets import QFileDialog
         
         files, _ = QFileDialog.getOpenFileNames(
@@ -43,120 +73,375 @@ class ResumeHandler:
         if not files:
             return []
         
-        added = []
-        for file in files:
-            filename = os.path.basename(file)
-            
-            # Проверяем, не загружали ли уже этот файл
-            if db.is_file_processed(file):
-                print(f"Файл уже обработан: {filename}")
+        if self.is_loading():
+            print("Загрузка резюме уже выполняется")
+            return []
+        
+        # Повторно загруженные файлы отсеиваются при копировании по хешу содержимого
+        self.start_ingest(files)
+        return files
+    
+    def is_loading(self) -> bool:
+        """Выполняется ли фоновая загрузка"""
+        return self._worker is not None and self._worker.isRunning()
+    
+    def start_ingest(self, files: List[str]):
+        """Запуск фоновой параллельной обработки файлов"""
+        from .workers import IngestWorker
+        
+        engine = IngestEngine(self.resume_dir, self.profile, known_hashes=self.known_hashes(),
+                              cache_path=self.parse_cache_path)
+        self._start_worker(IngestWorker(engine, files, self.app))
+    
+    def _start_worker(self, worker):
+        """Запуск фоновой обработки с общими обработчиками результатов"""
+        self._worker = worker
+        self._worker.candidate_ready.connect(self._on_candidate_ready)
+        self._worker.duplicate_found.connect(self._on_duplicate_found)
+        self._worker.progress.connect(self.app.ui.set_progress)
+        self._worker.finished.connect(self._on_ingest_finished)
+        self._added = []
+        self._duplicates = []
+        self._pending = []
+        self._last_flush = time.monotonic()
+        
+        self.app.ui.set_progress(0, len(worker.files))
+        self._worker.start()
+    
+    def parser_signature(self) -> str:
+        """Подпись текущих шаблонов полей и профиля вакансии"""
+        versions = ','.join(f"{name}={version}" for name, version in FieldExtractor.VERSIONS.items())
+        return f"{versions};{self.profile.signature}"
+    
+    def load_profile(self):
+        """Активный профиль вакансии из БД (без БД или без выбранного профиля - общий список слов)"""
+        self.profile = ProfileStore().active_or_default(DEFAULT_KEYWORDS)
+        print(f"Профиль вакансии: {self.profile.name}")
+    
+    def check_parser_version(self):
+        """
+        Повторный разбор загруженных резюме, если с прошлого запуска изменились
+        ключевые слова или шаблоны полей, а также резюме, для которых в БД нет
+        полного текста для поиска. Текст берется из кэша разбора. Если
+        изменился только профиль вакансии, резюме не разбираются заново, а
+        классифицируются по тексту из БД (start_screening).
+        """
+        self.load_profile()
+        cache = ParseCache(self.parse_cache_path)
+        try:
+            previous = cache.get_meta('signature')
+            signature = self.parser_signature()
+            if previous is None:
+                cache.set_meta('signature', signature)
+                previous = signature
+            if self.is_loading():
+                return
+        finally:
+            cache.close()
+        
+        if previous == signature:
+            items = self._reprocess_items(missing_text=True)
+            if items:
+                print(f"Нет полного текста для поиска: обновление {len(items)} резюме")
+                self.start_reprocess(items, signature)
+            return
+        
+        items = self._reprocess_items()
+        if not items:
+            self._save_signature(signature)
+            return
+        if db.is_connected and previous.split(';')[0] == signature.split(';')[0]:
+            print(f"Изменился профиль вакансии: классификация {len(items)} резюме по тексту из БД")
+            self.start_screening(signature)
+            return
+        print(f"Изменились ключевые слова или шаблоны разбора: обновление {len(items)} резюме")
+        self.start_reprocess(items, signature)
+    
+    def start_reprocess(self, items, signature=None):
+        """Фоновый повторный разбор резюме: items - пары (файл, хеш содержимого)"""
+        from .workers import IngestWorker
+        
+        engine = IngestEngine(self.resume_dir, self.profile, cache_path=self.parse_cache_path)
+        self._reprocessing = signature or self.parser_signature()
+        self._reprocess_files = [os.path.basename(path) for path, _ in items]
+        self._start_worker(IngestWorker(engine, items, self.app, reprocess=True))
+    
+    def start_screening(self, signature=None):
+        """Фоновая классификация всех кандидатов в БД по текущему профилю вакансии"""
+        from PyQt6.QtCore import QThreadPool
+        from .screening import ScreeningJob
+        from .workers import ScreenTask
+        
+        if self._screening is not None:
+            return
+        task = ScreenTask(ScreeningJob(self.profile, self.resume_dir))
+        task.signals.finished.connect(lambda changes: self._on_screening_finished(changes, signature))
+        task.signals.failed.connect(self._on_screening_failed)
+        self._screening = task
+        self.app.statusBar().showMessage(f"Классификация резюме по профилю \"{self.profile.name}\"...")
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_screening_finished(self, changes, signature=None):
+        """Новые категории - в загруженный список кандидатов (поток GUI)"""
+        job = self._screening.job
+        self._screening = None
+        for filename, category in changes:
+            candidate = self.app.candidates.get(filename)
+            if candidate is None:
                 continue
-            
-            # Копируем файл в рабочую директорию
-            dest = os.path.join(self.resume_dir, filename)
-            if not os.path.exists(dest):
-                shutil.copy2(file, dest)
-            
-            # Парсим резюме
-            candidate = self.parser.parse_resume(dest)
-            if not candidate:
-                print(f"Ошибка парсинга файла: {filename}")
+            candidate.original_category = category
+            candidate.category_color = CATEGORY_COLORS[category]
+            self.app.candidates.refresh(filename)
+            self.app.ui.update_candidate(candidate)
+        # Подпись не сохраняется после отмены или ошибок: классификация повторится при следующем запуске
+        if signature is not None and not job.cancelled and not job.failed:
+            self._save_signature(signature)
+        self.app.statusBar().showMessage(
+            f"Профиль \"{self.profile.name}\": изменена категория у {len(changes)} из {job.total} резюме", 10000)
+    
+    def _on_screening_failed(self, message: str):
+        self._screening = None
+        self.app.statusBar().showMessage(f"Ошибка классификации по профилю вакансии: {message}", 10000)
+    
+    def _reprocess_items(self, missing_text=False):
+        """Файлы и хеши всех загруженных резюме (missing_text - только сохраненных без полного текста)"""
+        if db.is_connected:
+            try:
+                rows = db.fetch_tuples("SELECT filename, source_file, content_hash FROM candidates"
+                                       + (" WHERE resume_text IS NULL" if missing_text else ""))
+            except Exception as e:
+                print(f"Ошибка загрузки списка резюме из БД: {e}")
+                return []
+        elif missing_text:
+            return []
+        else:
+            rows = [(c.filename, c.source_file, c.content_hash) for c in self.app.candidates.values()]
+        return [(source_file or os.path.join(self.resume_dir, filename), content_hash)
+                for filename, source_file, content_hash in rows]
+    
+    def _mark_without_text(self, filenames):
+        """
+        Резюме, которые не удалось разобрать заново (файла нет или он
+        поврежден), получают пустой текст: иначе они выбираются для
+        заполнения текста при каждом запуске
+        """
+        if not filenames or not db.is_connected:
+            return
+        try:
+            with db.cursor() as cur:
+                cur.execute("UPDATE candidates SET resume_text = '' "
+                            "WHERE resume_text IS NULL AND filename = ANY(%s)", (filenames,))
+                if cur.rowcount:
+                    print(f"Без полного текста (файл не найден или не разобран): {cur.rowcount} резюме")
+        except Exception as e:
+            print(f"Ошибка записи резюме без текста: {e}")
+    
+    def _save_signature(self, signature):
+        cache = ParseCache(self.parse_cache_path)
+        cache.set_meta('signature', signature)
+        cache.close()
+    
+    def known_hashes(self) -> frozenset:
+        """Хеши резюме, которые не нужно обрабатывать повторно"""
+        if not self.dedup.loaded:
+            try:
+                self.dedup.load()
+            except Exception as e:
+                print(f"Ошибка загрузки индекса обработанных резюме: {e}")
+                return frozenset()
+        if db.is_connected:
+            return self.dedup.known_hashes()
+        # Без БД кандидаты прошлых запусков не сохраняются: пропускаем только загруженных сейчас
+        return self.dedup.known_hashes(self.app.candidates)
+    
+    def start_watch(self, config):
+        """Непрерывная загрузка новых резюме из папки входящих (WatchConfig)"""
+        from .watcher import InboxWatcher
+        from .workers import InboxSignals
+        
+        self.stop_watch()
+        self._inbox_signals = InboxSignals()
+        self._inbox_signals.files_ready.connect(self._on_inbox_files)
+        self.watcher = InboxWatcher(config.inbox, self._inbox_signals.files_ready.emit,
+                                    config.settle_seconds, config.poll_interval)
+        self.watcher.start()
+    
+    def stop_watch(self):
+        """Остановка наблюдения за папкой входящих"""
+        if self.watcher is not None:
+            self.watcher.stop(timeout=5)
+            self.watcher = None
+    
+    def _on_inbox_files(self, files: List[str]):
+        """Новые файлы из папки входящих (поток GUI)"""
+        self._inbox_queue.extend(files)
+        if not self.is_loading():
+            self._start_inbox_batch()
+    
+    def _start_inbox_batch(self):
+        """Загрузка всех накопленных файлов из папки входящих одной пачкой"""
+        files, self._inbox_queue = self._inbox_queue, []
+        if files:
+            print(f"Загрузка из папки входящих: {len(files)} файлов")
+            self.start_ingest(files)
+    
+    def cancel_ingest(self):
+        """Отмена фоновой загрузки"""
+        if self.is_loading():
+            print("Отмена загрузки резюме...")
+            self._worker.cancel()
+    
+    def _on_candidate_ready(self, file: str, candidate: Candidate):
+        """Накопление готовых кандидатов для пакетного сохранения (поток GUI)"""
+        self._pending.append((file, candidate))
+        if (len(self._pending) >= self.SAVE_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= self.SAVE_INTERVAL):
+            self._flush_pending()
+    
+    def _on_duplicate_found(self, file: str, content_hash: str):
+        """Файл с уже загруженным содержимым (поток GUI)"""
+        self._duplicates.append((file, self.dedup.get(content_hash)))
+    
+    def _on_ingest_finished(self):
+        """Завершение фоновой загрузки"""
+        self._flush_pending()
+        self.dedup.save()
+        if self._reprocessing is not None:
+            # После отмены подпись не сохраняется: разбор повторится при следующем запуске
+            if not self._worker.engine.cancelled:
+                self._save_signature(self._reprocessing)
+                self._mark_without_text(self._reprocess_files)
+            self._reprocessing = None
+            self._reprocess_files = []
+            action = "Обновлено"
+        else:
+            action = "Добавлено"
+        print(f"{action} {len(self._added)} резюме")
+        message = f"{action} резюме: {len(self._added)}"
+        if self._duplicates:
+            print(f"Пропущено повторных резюме: {len(self._duplicates)}")
+            for file, known in self._duplicates:
+                print(f"  {os.path.basename(file)} - уже загружено как {known}")
+            message += f", пропущено повторных: {len(self._duplicates)}"
+        self.app.statusBar().showMessage(message, 10000)
+        self.app.ui.hide_progress()
+        self._worker = None
+        self._compact_index()
+        if self._added and db.is_connected:
+            self._rescore_stored()
+        
+        # Файлы, пришедшие в папку входящих во время загрузки
+        if self._inbox_queue:
+            self._start_inbox_batch()
+    
+    def _flush_pending(self):
+        """Сохранение накопленных кандидатов одним пакетом"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        
+        # Один файл на имя: повторная вставка того же filename в пакете недопустима
+        batch = list({candidate.filename: (file, candidate) for file, candidate in self._pending}.values())
+        self._pending = []
+        
+        # Без БД кандидаты хранятся только в памяти приложения
+        offline = not db.is_connected
+        
+        # Одинаковые файлы под разными именами в одной загрузке: сохраняется первый
+        unique = []
+        seen = {}
+        for file, candidate in batch:
+            known = seen.get(candidate.content_hash) or self.dedup.get(candidate.content_hash)
+            if known and known != candidate.filename and (not offline or known in self.app.candidates):
+                self._duplicates.append((file, known))
                 continue
-            
-            # Устанавливаем дополнительные поля
-            candidate.filename = filename
-            candidate.source_file = dest
-            
-            # Классифицируем
-            text = self.parser.extract_text_from_word(dest)
-            
-            # ДЕБАГ: Выводим текст для анализа
-            print(f"\n=== АНАЛИЗ ФАЙЛА: {filename} ===")
-            print(f"Текст (первые 300 символов): {text[:300]}...")
-            
-            # Ищем ключевые слова (в нижнем регистре)
-            text_lower = text.lower()
-            cnt = 0
-            found_keywords = []
-            
-            for kw in self.keywords:
-                if kw.lower() in text_lower:
-                    cnt += 1
-                    found_keywords.append(kw)
-            
-            print(f"Найдено ключевых слов: {cnt}")
-            print(f"Найденные слова: {found_keywords}")
-            
-            # Более мягкая классификация: достаточно 1 ключевого слова
-            if cnt >= 1:  # ИЗМЕНЕНО: было cnt >= 2, стало cnt >= 1
-                candidate.original_category = "Подходит"
-                candidate.category_color = "#2ecc71"  # Зеленый для "Подходит"
-                print(f"Категория: ПОДХОДИТ (найдено {cnt} ключевых слов)")
-            else:
-                candidate.original_category = "Не подходит"
-                candidate.category_color = "#e74c3c"  # Красный для "Не подходит"
-                print(f"Категория: НЕ ПОДХОДИТ (найдено {cnt} ключевых слов)")
-            
-            # Сохраняем в БД
-            candidate_id = self._save_to_database(candidate)
-            if candidate_id:
-                added.append(filename)
+            seen[candidate.content_hash] = candidate.filename
+            unique.append((file, candidate))
+        batch = unique
+        
+        # Сначала в индекс, затем оценка: IDF слов считается с учетом этой пачки.
+        # От пачки к пачке IDF меняется, поэтому после загрузки оценки всех
+        # кандидатов пересчитываются (_rescore_stored)
+        for _, candidate in batch:
+            self.text_index.add(candidate.filename, candidate.resume_text, candidate.content_hash,
+                                stems=candidate.resume_terms)
+        self._score([candidate for _, candidate in batch])
+        ids = self._save_to_database([candidate for _, candidate in batch])
+        for (file, candidate), candidate_id in zip(batch, ids):
+            filename = candidate.filename
+            if candidate_id or offline:
+                self._added.append(filename)
+                # Текст для поиска сохранен в БД и в локальном индексе, в памяти он не нужен
+                candidate.resume_text = None
+                candidate.resume_terms = None
+                self.dedup.add(candidate.content_hash, filename)
+                # Повторный импорт уже сохраненного резюме обновляет строку списка, а не дублирует ее
+                is_new = filename not in self.app.candidates
+                if is_new and self._reprocessing is not None:
+                    # Повторный разбор проходит по всей таблице: в список попадают только
+                    # загруженные страницы, остальные кандидаты обновлены в БД
+                    continue
                 self.app.candidates[filename] = candidate
-                db.mark_file_as_processed(file)  # Отмечаем как обработанный
+                if is_new:
+                    self.app.ui.add_candidate(candidate)
+                else:
+                    self.app.ui.update_candidate(candidate)
                 print(f"Файл успешно добавлен: {filename}")
             else:
+                # Несохраненного резюме нет в БД - и в индексе его быть не должно
+                self.text_index.remove(filename)
                 print(f"Ошибка сохранения в БД: {filename}")
+        # Слияние журнала индекса - после загрузки и не в потоке интерфейса (_compact_index)
+        self.text_index.save(compact=False)
+    
+    def _compact_index(self):
+        """Слияние большого журнала поискового индекса в пуле потоков (на 100 тыс. резюме - больше секунды)"""
+        from PyQt6.QtCore import QThreadPool
+        from .workers import IndexCompactTask
+        
+        if self.text_index.needs_compact():
+            QThreadPool.globalInstance().start(IndexCompactTask(self.text_index))
+    
+    def _rescore_stored(self):
+        """
+        Оценки при загрузке считаются с IDF на момент загрузки: после нее
+        оценки всех кандидатов в БД пересчитываются в пуле потоков, чтобы
+        их можно было сравнивать между загрузками
+        """
+        from PyQt6.QtCore import QThreadPool
+        from .workers import RescoreTask
         
-        return added
+        QThreadPool.globalInstance().start(RescoreTask(self.profile, self.text_index))
     
-    def _save_to_database(self, candidate: Candidate) -> Optional[int]:
-        """Сохранение кандидата в базу данных"""
+    def _score(self, candidates: List[Candidate]):
+        """Оценка кандидатов для вакансии по тексту резюме (до того, как текст будет убран из памяти)"""
         try:
-            # Преобразуем в словарь для БД (БЕЗ position)
-            candidate_data = {
-                'filename': candidate.filename,
-                'fio': candidate.fio,
-                'age': candidate.age,
-                'experience': candidate.experience,
-                'education': candidate.education,
-                'salary': candidate.salary,
-                'about': candidate.about,
-                'status': candidate.original_category,
-                'category_color': candidate.category_color,
-                'source_file': candidate.source_file
-            }
+            ScoringEngine(self.profile, self.text_index).score_candidates(candidates)
+        except Exception as e:
+            print(f"Ошибка расчета оценки кандидатов: {e}")
+    
+    def _save_to_database(self, candidates: List[Candidate]) -> List[Optional[int]]:
+        """Пакетное сохранение кандидатов в базу данных, повторный импорт обновляет запись"""
+        try:
+            # Преобразуем в словари для БД (БЕЗ position)
+            rows = [candidate.db_row() for candidate in candidates]
             
             # Сохраняем в БД
-            candidate_id = db.insert('candidates', candidate_data)
-            return candidate_id
+            ids = db.insert_many('candidates', rows, batch_size=self.SAVE_BATCH_SIZE, upsert=True)
+            return ids or [None] * len(candidates)
             
         except Exception as e:
             print(f"Ошибка сохранения в БД: {e}")
-            return None
+            return [None] * len(candidates)
     
     def get_all_candidates(self) -> Dict[str, Candidate]:
         """Получение всех кандидатов из БД"""
-        if not db.conn:
+        if not db.is_connected:
             return self.app.candidates
         
         try:
-            results = db.fetch_all("SELECT * FROM candidates ORDER BY created_at DESC")
-            
-            candidates = {}
-            for row in results:
-                candidate = Candidate({
-                    'filename': row['filename'],
-                    'fio': row['fio'],
-                    'age': row['age'],
-                    'experience': row['experience'],
-                    'education': row['education'],
-                    'salary': row['salary'],
-                    'about': row['about'],
-                    'source_file': row['source_file'],
-                    'original_category': row['status'],
-                    'category_color': row['category_color']
-                })
-                candidates[row['filename']] = candidate
+            rows = db.fetch_tuples(f"SELECT {Candidate.SQL_COLUMNS} FROM candidates ORDER BY created_at DESC")
+            candidates = {c.filename: c for c in Candidate.from_rows(rows)}
             
             return candidates
             
@@ -0,0 +1,266 @@
+"""
+Повторная классификация всех загруженных кандидатов по профилю вакансии.
+
+Текст резюме берется из БД (колонка resume_text): файлы .docx и кэш
+разбора не читаются. Кандидаты делятся на диапазоны id, диапазоны
+обрабатываются в пуле процессов, и каждый процесс сам читает из БД тексты
+своего диапазона - тексты не передаются между процессами. Обратно
+возвращаются только id и категории, а родитель записывает их пакетным
+UPDATE (один запрос на диапазон, неизмененные строки не перезаписываются).
+Диапазон, который не удалось прочитать или записать (обрыв соединения,
+таймаут), повторяется до MAX_RETRIES раз; оставшиеся ошибки считаются
+в ScreeningJob.failed.
+
+В тех же UPDATE записываются оценки кандидатов для вакансии профиля: они
+считаются заранее, векторно по числовым полям и поисковому индексу,
+пополненному текстами резюме из БД (тот же источник текста, что и для
+категорий). Модуль не импортирует PyQt6.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database import db
+from database.classifier import CATEGORY_COLORS
+from database.config import DatabaseConfig
+from database.profiles import VacancyProfile
+from database.scoring import ScoringEngine
+from database.text_index import TextIndex
+from .batch import sync_text_index
+
+
+# Состояние дочернего процесса: профиль и свое соединение с БД
+_profile = None
+_conn = None
+_connect_params = None
+
+# Изменение категории: (имя файла, новая категория)
+Change = Tuple[str, str]
+
+
+def _init_worker(profile, connect_params):
+    global _profile, _connect_params
+    _profile = profile
+    _connect_params = connect_params
+    _connect()
+
+
+def _connect():
+    global _conn
+    import psycopg2
+
+    _conn = psycopg2.connect(**_connect_params)
+    _conn.set_session(readonly=True, autocommit=True)
+
+
+def _classify_range(first_id: int, last_id: int):
+    """Категории кандидатов с id в диапазоне: (id, имя файла, категория или None - нет текста)"""
+    # После обрыва соединения (повтор диапазона) процесс подключается заново
+    if _conn is None or _conn.closed:
+        _connect()
+    with _conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, filename, fio, age, experience, education, salary, resume_text "
+            "FROM candidates WHERE id BETWEEN %s AND %s",
+            (first_id, last_id)
+        )
+        rows = cur.fetchall()
+
+    result = []
+    for candidate_id, filename, fio, age, experience, education, salary, text in rows:
+        category = None
+        if text:
+            # Разбор классифицирует текст в нижнем регистре, так же и здесь
+            category = _profile.classify(text.lower(), fio, age, experience, education, salary).category
+        result.append((candidate_id, filename, category))
+    return result
+
+
+class ScreeningJob:
+    """Применение профиля вакансии ко всем кандидатам в БД"""
+
+    # Кандидатов в одном диапазоне id: одна задача пула и один UPDATE
+    CHUNK_SIZE = 2000
+    # Меньше кандидатов быстрее обработать в текущем процессе, чем запускать пул
+    MIN_ROWS_FOR_POOL = 5000
+    # Повторы диапазона после ошибки чтения или записи и пауза перед повтором (растет с номером)
+    MAX_RETRIES = 2
+    RETRY_DELAY = 1.0
+
+    def __init__(self, profile: VacancyProfile, resume_dir: str, max_workers: Optional[int] = None):
+        self.profile = profile
+        self.resume_dir = resume_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cancelled = threading.Event()
+
+        # Итоги
+        self.total = 0
+        self.updated = 0
+        self.without_text = 0
+        # Диапазоны, которые не удалось классифицировать или записать и после повторов
+        self.failed = 0
+        self.changes: List[Change] = []
+        # Категории до классификации: id -> категория
+        self._previous: Dict[int, str] = {}
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def run(self, on_progress: Optional[Callable[[int, int], None]] = None) -> List[Change]:
+        """Классификация всех кандидатов; возвращает изменения категорий"""
+        if not db.is_connected:
+            print("БД не подключена: профили вакансий и тексты резюме хранятся в БД")
+            return []
+
+        started = time.perf_counter()
+        scores = self._scores()
+        self.total = len(scores)
+        if not scores:
+            return []
+        ranges = self._ranges(sorted(scores))
+        scored = time.perf_counter()
+
+        done = 0
+        for chunk in self._classified(ranges):
+            self._write(chunk, scores)
+            done += len(chunk)
+            if on_progress:
+                on_progress(done, self.total)
+
+        print(f"Профиль \"{self.profile.name}\": {self.total} кандидатов за {time.perf_counter() - started:.2f} с "
+              f"(оценки {(scored - started) * 1000:.0f} мс), изменена категория у {len(self.changes)}, "
+              f"без текста резюме {self.without_text}"
+              + (f", ошибок в диапазонах {self.failed}" if self.failed else ""))
+        return self.changes
+
+    def _scores(self) -> Dict[int, float]:
+        """Оценки всех кандидатов для вакансии профиля: id -> оценка"""
+        rows = db.fetch_tuples("SELECT id, filename, experience, education, salary, status FROM candidates")
+        if not rows:
+            return {}
+        self._previous = {row[0]: row[5] for row in rows}
+        index = TextIndex.for_dir(self.resume_dir)
+        sync_text_index(index)
+        engine = ScoringEngine(self.profile, index)
+        scores = engine.rescore([row[1] for row in rows], *([row[i] or 0 for row in rows] for i in (2, 3, 4)))
+        return dict(zip((row[0] for row in rows), scores.tolist()))
+
+    def _ranges(self, ids: List[int]) -> List[Tuple[int, int]]:
+        """Диапазоны id примерно по CHUNK_SIZE кандидатов"""
+        return [(ids[start], ids[min(start + self.CHUNK_SIZE, len(ids)) - 1])
+                for start in range(0, len(ids), self.CHUNK_SIZE)]
+
+    def _classified(self, ranges):
+        """Результаты диапазонов по мере готовности (в пуле процессов или в текущем)"""
+        connect_params = DatabaseConfig.load().connect_params()
+        workers = min(self.max_workers, len(ranges))
+        if workers <= 1 or self.total < self.MIN_ROWS_FOR_POOL:
+            _init_worker(self.profile, connect_params)
+            try:
+                for first_id, last_id in ranges:
+                    attempt = 0
+                    while not self.cancelled:
+                        try:
+                            chunk = _classify_range(first_id, last_id)
+                        except Exception as e:
+                            attempt += 1
+                            if self._retry(attempt, "классификации", e):
+                                continue
+                            break
+                        yield chunk
+                        break
+                    if self.cancelled:
+                        break
+            finally:
+                _conn.close()
+            return
+
+        print(f"Запуск пула классификации: {workers} процессов, {len(ranges)} диапазонов")
+        # spawn вместо fork: родительский процесс может быть многопоточным (Qt)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.profile, connect_params)
+        )
+        try:
+            # Задача пула -> (диапазон, число неудачных попыток)
+            pending = {executor.submit(_classify_range, *bounds): (bounds, 0) for bounds in ranges}
+            while pending and not self.cancelled:
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    bounds, attempt = pending.pop(future)
+                    try:
+                        chunk = future.result()
+                    except Exception as e:
+                        attempt += 1
+                        if self._retry(attempt, "классификации", e):
+                            pending[executor.submit(_classify_range, *bounds)] = (bounds, attempt)
+                        continue
+                    yield chunk
+            if self.cancelled:
+                print("Классификация по профилю отменена")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _write(self, chunk, scores: Dict[int, float]):
+        """Категории, цвета и оценки диапазона - одним UPDATE"""
+        ids, statuses, colors, values = [], [], [], []
+        changes = []
+        for candidate_id, filename, category in chunk:
+            # Резюме, загруженные во время классификации, уже классифицированы при загрузке
+            if candidate_id not in scores:
+                continue
+            ids.append(candidate_id)
+            statuses.append(category)
+            colors.append(CATEGORY_COLORS.get(category))
+            values.append(scores[candidate_id])
+            if category is None:
+                self.without_text += 1
+            elif category != self._previous.get(candidate_id):
+                changes.append((filename, category))
+
+        # Резюме без текста (загружены до появления колонки) сохраняют категорию.
+        # UPDATE одного диапазона - одна транзакция, его можно повторить целиком
+        attempt = 0
+        while True:
+            try:
+                with db.cursor() as cur:
+                    cur.execute(
+                        "UPDATE candidates AS c SET status = coalesce(v.status, c.status), "
+                        "category_color = coalesce(v.color, c.category_color), score = v.score "
+                        "FROM unnest(%s::int[], %s::text[], %s::text[], %s::real[]) AS v (id, status, color, score) "
+                        "WHERE c.id = v.id AND (c.status IS DISTINCT FROM coalesce(v.status, c.status) "
+                        "OR c.score IS DISTINCT FROM v.score)",
+                        (ids, statuses, colors, values)
+                    )
+                    self.updated += cur.rowcount
+                break
+            except Exception as e:
+                attempt += 1
+                if not self._retry(attempt, "записи", e):
+                    return
+        self.changes.extend(changes)
+
+    def _retry(self, attempt: int, stage: str, error) -> bool:
+        """
+        Повторять ли диапазон после неудачной попытки номер attempt (с паузой).
+        Без повтора диапазон считается в failed.
+        """
+        if self.cancelled:
+            return False
+        if attempt <= self.MAX_RETRIES:
+            print(f"Ошибка {stage} диапазона кандидатов, попытка {attempt} из {self.MAX_RETRIES + 1}: {error}")
+            time.sleep(self.RETRY_DELAY * attempt)
+            return True
+        self.failed += 1
+        print(f"Ошибка {stage} диапазона кандидатов: {error}")
+        return False
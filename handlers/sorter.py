@@ -0,0 +1,215 @@
+"""
+Раскладка файлов резюме по папкам категорий.
+
+Перемещаются только файлы, которые лежат не в папке своей категории:
+это сравнение путей без обращения к диску, поэтому уже разложенные
+резюме повторный запуск не трогает. Перемещения группируются по папкам
+назначения - на папку приходится одно создание и одно чтение списка
+файлов, а на файл - одно переименование.
+
+Перед перемещениями план записывается в журнал в папке sorted. Если
+сортировка прервалась, при следующем запуске она доводится до конца
+(recover), либо перемещенные файлы возвращаются на место
+(recover(rollback=True)). Журнал удаляется после сохранения новых путей
+файлов в БД.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from database import db
+
+
+JOURNAL_NAME = ".sort_journal.jsonl"
+
+# Перемещение: (имя файла, откуда, куда)
+Move = Tuple[str, str, str]
+
+
+class FileSorter:
+    """Перемещение файлов резюме в папки категорий с журналом"""
+
+    # Одна сортировка рабочей директории в каждый момент времени
+    _lock = threading.Lock()
+
+    def __init__(self, resume_dir: str, sorted_dir: str, candidates=None):
+        self.resume_dir = resume_dir
+        self.sorted_dir = sorted_dir
+        # Хранилище кандидатов в памяти, в нем обновляется source_file
+        self.candidates = candidates
+        self.journal_path = os.path.join(sorted_dir, JOURNAL_NAME)
+        self.skipped = 0
+
+    def has_journal(self) -> bool:
+        return os.path.exists(self.journal_path)
+
+    def entries(self) -> List[Tuple[str, str, str]]:
+        """Все кандидаты (имя файла, путь к файлу, категория): из БД, а без нее - из памяти"""
+        if db.is_connected:
+            rows = db.fetch_tuples("SELECT filename, source_file, status FROM candidates")
+        elif self.candidates is not None:
+            rows = [(c.filename, c.source_file, c.original_category) for c in list(self.candidates.values())]
+        else:
+            rows = []
+        return [(filename, source_file or os.path.join(self.resume_dir, filename), category)
+                for filename, source_file, category in rows if filename and category]
+
+    def plan(self, entries: Iterable[Tuple[str, str, str]]) -> Dict[str, List[Move]]:
+        """Перемещения, сгруппированные по папке назначения"""
+        cwd = os.getcwd()
+        groups = defaultdict(list)
+        for filename, source_file, category in entries:
+            folder = os.path.join(self.sorted_dir, category)
+            src = os.path.join(cwd, source_file)
+            if os.path.normpath(os.path.dirname(src)) == os.path.normpath(os.path.join(cwd, folder)):
+                continue
+            groups[folder].append((filename, source_file, os.path.join(folder, filename)))
+        return dict(groups)
+
+    def run(self, entries: Optional[Iterable[Tuple[str, str, str]]] = None) -> List[Move]:
+        """
+        Сортировка (по умолчанию - всех кандидатов). Незавершенная прошлая
+        сортировка сначала доводится до конца. Возвращает выполненные перемещения.
+        """
+        with self._lock:
+            moved = self._recover(rollback=False)
+            groups = self.plan(self.entries() if entries is None else entries)
+            if not groups:
+                return moved
+
+            self._write_journal([move for group in groups.values() for move in group])
+            done = []
+            for folder, group in groups.items():
+                done.extend(self._move_group(folder, group))
+            self._commit(done)
+            return moved + done
+
+    def recover(self, rollback: bool = False) -> List[Move]:
+        """Завершение (или откат) сортировки, прерванной на середине"""
+        with self._lock:
+            return self._recover(rollback)
+
+    def _recover(self, rollback: bool) -> List[Move]:
+        plan = self._read_journal()
+        if plan is None:
+            return []
+
+        # Переименование атомарно: по наличию файлов видно, выполнено ли перемещение
+        done, pending = [], []
+        for move in plan:
+            _, src, dst = move
+            if os.path.exists(src):
+                pending.append(move)
+            elif os.path.exists(dst):
+                done.append(move)
+
+        if rollback:
+            undo = [(filename, dst, src) for filename, src, dst in done]
+            result = self._move_files(undo)
+            print(f"Откат прерванной сортировки: возвращено {len(result)} из {len(done)} файлов")
+        else:
+            groups = defaultdict(list)
+            for move in pending:
+                groups[os.path.dirname(move[2])].append(move)
+            result = list(done)
+            for folder, group in groups.items():
+                result.extend(self._move_group(folder, group))
+            print(f"Завершение прерванной сортировки: перемещено {len(result)} из {len(plan)} файлов")
+
+        self._commit(result)
+        return result
+
+    def _move_group(self, folder: str, group: List[Move]) -> List[Move]:
+        """Перемещения в одну папку: одно создание папки и одно чтение списка файлов"""
+        try:
+            os.makedirs(folder, exist_ok=True)
+            existing = set(os.listdir(folder))
+        except OSError as e:
+            print(f"Ошибка создания папки {folder}: {e}")
+            return []
+
+        moves = []
+        for move in group:
+            filename, src, dst = move
+            if filename not in existing:
+                moves.append(move)
+            elif not os.path.exists(src):
+                # Файл уже разложен, но путь к нему не был сохранен
+                moves.append((filename, dst, dst))
+            else:
+                self.skipped += 1
+                print(f"Файл {dst} уже существует, {src} не перемещен")
+        return self._move_files(moves)
+
+    def _move_files(self, moves: List[Move]) -> List[Move]:
+        done = []
+        for move in moves:
+            _, src, dst = move
+            try:
+                if src != dst:
+                    os.replace(src, dst)
+                done.append(move)
+            except FileNotFoundError:
+                self.skipped += 1
+                print(f"Файл {src} не найден")
+            except OSError as e:
+                self.skipped += 1
+                print(f"Ошибка перемещения {src}: {e}")
+        return done
+
+    def _commit(self, moves: List[Move]):
+        """Новые пути файлов - в память и в БД, после этого журнал больше не нужен"""
+        if self.candidates is not None:
+            for filename, _, dst in moves:
+                candidate = self.candidates.get(filename)
+                if candidate is not None:
+                    candidate.source_file = dst
+
+        if moves and db.is_connected:
+            from psycopg2.extras import execute_values
+            try:
+                with db.cursor() as cur:
+                    execute_values(
+                        cur,
+                        "UPDATE candidates AS c SET source_file = v.source_file "
+                        "FROM (VALUES %s) AS v (filename, source_file) WHERE c.filename = v.filename",
+                        [(filename, dst) for filename, _, dst in moves]
+                    )
+            except Exception as e:
+                # Журнал остается: пути будут сохранены при следующем запуске
+                print(f"Ошибка сохранения путей файлов в БД: {e}")
+                return
+
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Ошибка удаления журнала сортировки: {e}")
+
+    def _write_journal(self, moves: List[Move]):
+        os.makedirs(self.sorted_dir, exist_ok=True)
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for filename, src, dst in moves:
+                f.write(json.dumps({'filename': filename, 'src': src, 'dst': dst}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def _read_journal(self) -> Optional[List[Move]]:
+        if not os.path.exists(self.journal_path):
+            return None
+        plan = []
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        plan.append((entry['filename'], entry['src'], entry['dst']))
+        except Exception as e:
+            print(f"Ошибка чтения журнала сортировки: {e}")
+        return plan
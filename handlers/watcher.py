@@ -0,0 +1,292 @@
+"""
+Наблюдение за папкой входящих резюме.
+
+Изменения в папке отслеживаются через inotify (Linux), а если он
+недоступен - периодическим просмотром папки. Файл считается дописанным,
+когда его размер и время изменения не менялись settle_seconds секунд:
+так не читаются .docx, которые еще копирует интеграция с сайтом вакансий.
+
+Готовые файлы передаются в on_files одной пачкой. Пока пачка
+обрабатывается, новые события накапливаются, и следующий поток файлов
+тоже приходит пачкой - сохранение в БД идет пакетами, а не по файлу.
+
+Без окна наблюдение запускается командой
+    python -m handlers.watcher --inbox <папка>
+В приложении папка берется из переменной RESUME_INBOX_DIR или из секции
+[watch] файла database.ini.
+"""
+
+import argparse
+import configparser
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, List, Optional
+
+from database.config import CONFIG_ENV, DEFAULT_CONFIG_FILE
+
+
+SETTLE_SECONDS = 2.0
+POLL_INTERVAL = 1.0
+
+# События inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Параметр: (переменная окружения, значение по умолчанию)
+_SETTINGS = {
+    'inbox': ("RESUME_INBOX_DIR", ""),
+    'settle_seconds': ("RESUME_INBOX_SETTLE", str(SETTLE_SECONDS)),
+    'poll_interval': ("RESUME_INBOX_POLL", str(POLL_INTERVAL)),
+}
+
+
+class WatchConfig:
+    """Настройки папки входящих"""
+
+    def __init__(self, values=None):
+        values = values or {}
+        get = lambda key: values.get(key, _SETTINGS[key][1])
+        self.inbox = get('inbox')
+        self.settle_seconds = float(get('settle_seconds'))
+        self.poll_interval = float(get('poll_interval'))
+
+    @classmethod
+    def load(cls, path=None):
+        """Настройки из секции [watch] файла конфигурации и переменных окружения"""
+        values = {}
+
+        path = path or os.environ.get(CONFIG_ENV) or DEFAULT_CONFIG_FILE
+        if os.path.exists(path):
+            parser = configparser.ConfigParser()
+            parser.read(path, encoding='utf-8')
+            if parser.has_section('watch'):
+                values.update({k: v for k, v in parser.items('watch') if k in _SETTINGS})
+
+        for key, (env, _) in _SETTINGS.items():
+            if env in os.environ:
+                values[key] = os.environ[env]
+
+        return cls(values)
+
+
+class _Inotify:
+    """Минимальная обертка над inotify через ctypes"""
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch {path}")
+
+    def read(self, timeout: float):
+        """События [(имя файла, маска)], ожидание не дольше timeout секунд"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((os.fsdecode(name), mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class InboxWatcher:
+    """Поиск новых дописанных .docx в папке и передача их пачками"""
+
+    def __init__(self, inbox_dir: str, on_files: Callable[[List[str]], None],
+                 settle_seconds: float = SETTLE_SECONDS, poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool = True):
+        self.inbox_dir = os.path.abspath(inbox_dir)
+        self.on_files = on_files
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None
+
+        self._pending = {}    # путь -> (размер, mtime_ns, время последнего изменения)
+        self._delivered = {}  # путь -> (размер, mtime_ns) на момент передачи
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Наблюдение в фоновом потоке"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="inbox-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self):
+        """Цикл наблюдения в текущем потоке (до stop())"""
+        os.makedirs(self.inbox_dir, exist_ok=True)
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(self.inbox_dir)
+            except Exception as e:
+                print(f"inotify недоступен ({e}), папка просматривается каждые {self.poll_interval} с")
+        self.backend = "inotify" if inotify else "polling"
+        print(f"Наблюдение за папкой {self.inbox_dir} ({self.backend})")
+
+        # Файлы, которые уже лежат в папке
+        self._scan()
+        try:
+            while not self._stop.is_set():
+                if inotify is not None:
+                    timeout = min(self.poll_interval, self.settle_seconds / 2)
+                    for name, mask in inotify.read(timeout):
+                        if mask & IN_Q_OVERFLOW:
+                            # Очередь событий переполнена - часть изменений потеряна
+                            self._scan()
+                        elif name:
+                            self._touch(os.path.join(self.inbox_dir, name),
+                                        removed=bool(mask & (IN_DELETE | IN_MOVED_FROM)))
+                else:
+                    self._stop.wait(self.poll_interval)
+                    self._scan()
+                self._deliver_settled()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    @staticmethod
+    def _accepts(name: str) -> bool:
+        # Скрытые и временные файлы Word (~$name.docx) не обрабатываются
+        return name.lower().endswith('.docx') and not name.startswith(('.', '~$'))
+
+    def _scan(self):
+        """Просмотр всей папки"""
+        present = set()
+        try:
+            with os.scandir(self.inbox_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and self._accepts(entry.name):
+                        present.add(entry.path)
+                        self._touch(entry.path)
+        except OSError as e:
+            print(f"Ошибка просмотра папки {self.inbox_dir}: {e}")
+            return
+
+        for path in list(self._delivered):
+            if path not in present:
+                del self._delivered[path]
+
+    def _touch(self, path: str, removed: bool = False):
+        """Учет изменения файла: отсчет времени до готовности начинается заново"""
+        if not self._accepts(os.path.basename(path)):
+            return
+        if removed:
+            self._pending.pop(path, None)
+            self._delivered.pop(path, None)
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._pending.pop(path, None)
+            return
+
+        state = (st.st_size, st.st_mtime_ns)
+        if self._delivered.get(path) == state:
+            return
+        previous = self._pending.get(path)
+        if previous is None or previous[:2] != state:
+            self._pending[path] = (*state, time.monotonic())
+
+    def _deliver_settled(self):
+        """Передача файлов, которые не менялись settle_seconds секунд"""
+        if not self._pending:
+            return
+
+        now = time.monotonic()
+        ready = []
+        for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            state = (st.st_size, st.st_mtime_ns)
+            if state != (size, mtime_ns):
+                self._pending[path] = (*state, now)
+            elif size > 0 and now - changed_at >= self.settle_seconds:
+                del self._pending[path]
+                self._delivered[path] = state
+                ready.append(path)
+
+        if ready:
+            ready.sort()
+            print(f"Новые резюме в папке входящих: {len(ready)}")
+            try:
+                self.on_files(ready)
+            except Exception as e:
+                print(f"Ошибка обработки новых резюме: {e}")
+
+
+def main(argv=None):
+    """Наблюдение за папкой входящих без графического интерфейса"""
+    config = WatchConfig.load()
+    parser = argparse.ArgumentParser(description="Загрузка резюме из папки входящих без интерфейса")
+    parser.add_argument('--inbox', default=config.inbox, help="папка входящих резюме")
+    parser.add_argument('--settle', type=float, default=config.settle_seconds,
+                        help="сколько секунд файл не должен меняться перед загрузкой")
+    parser.add_argument('--poll', type=float, default=config.poll_interval,
+                        help="интервал просмотра папки без inotify, секунды")
+    parser.add_argument('--workers', type=int, default=None, help="число процессов разбора")
+    parser.add_argument('--no-inotify', action='store_true', help="только периодический просмотр папки")
+    args = parser.parse_args(argv)
+    if not args.inbox:
+        parser.error("папка входящих не задана (--inbox или RESUME_INBOX_DIR)")
+
+    from .batch import BatchIngestor
+
+    ingestor = BatchIngestor(max_workers=args.workers)
+    watcher = InboxWatcher(args.inbox, ingestor.ingest, args.settle, args.poll,
+                           use_inotify=not args.no_inotify)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print(f"\nНаблюдение остановлено: добавлено {ingestor.added}, "
+              f"повторов {ingestor.duplicates}, ошибок {ingestor.failed}")
+
+
+if __name__ == '__main__':
+    main()
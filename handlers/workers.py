@@ -0,0 +1,175 @@
+"""
+Фоновые потоки Qt для долгих операций.
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThread, pyqtSignal
+
+from .ingest import IngestEngine
+
+
+class IngestWorker(QThread):
+    """Поток, выполняющий параллельную загрузку резюме"""
+
+    candidate_ready = pyqtSignal(str, object)  # исходный файл, Candidate
+    progress = pyqtSignal(int, int)            # обработано, всего
+    duplicate_found = pyqtSignal(str, str)     # исходный файл, хеш содержимого
+
+    def __init__(self, engine: IngestEngine, files, parent=None, reprocess=False):
+        super().__init__(parent)
+        self.engine = engine
+        # При reprocess=True files - пары (файл в рабочей директории, хеш содержимого)
+        self.files = list(files)
+        self.reprocess = reprocess
+
+    def run(self):
+        try:
+            if self.reprocess:
+                self.engine.reprocess(self.files, self.candidate_ready.emit, self.progress.emit)
+            else:
+                self.engine.run(self.files, self.candidate_ready.emit, self.progress.emit,
+                                self.duplicate_found.emit)
+        except Exception as e:
+            print(f"Ошибка фоновой загрузки резюме: {e}")
+
+    def cancel(self):
+        """Запрос отмены загрузки"""
+        self.engine.cancel()
+
+
+class InboxSignals(QObject):
+    """Передача новых файлов из потока наблюдения за папкой в поток GUI"""
+
+    files_ready = pyqtSignal(list)
+
+
+class FilterSignals(QObject):
+    """Сигналы задачи фильтрации (QRunnable сам сигналы иметь не может)"""
+
+    finished = pyqtSignal(int, object)    # номер запроса, список найденных кандидатов
+    failed = pyqtSignal(int, str)         # номер запроса, текст ошибки
+
+
+class FilterTask(QRunnable):
+    """Фильтрация кандидатов в пуле потоков Qt"""
+
+    def __init__(self, handler, filters, generation):
+        super().__init__()
+        self.handler = handler
+        self.filters = filters
+        self.generation = generation
+        self.signals = FilterSignals()
+        self._cancelled = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        try:
+            candidates = self.handler.run_filters(self.filters, self)
+            if not self._cancelled:
+                self.signals.finished.emit(self.generation, candidates)
+        except Exception as e:
+            if not self._cancelled:
+                print(f"Ошибка фоновой фильтрации: {e}")
+                self.signals.failed.emit(self.generation, str(e))
+
+    def attach(self, conn):
+        """Соединение, на котором выполняется запрос (для отмены)"""
+        with self._lock:
+            self._conn = conn
+            if self._cancelled:
+                conn.cancel()
+
+    def detach(self):
+        with self._lock:
+            self._conn = None
+
+    def cancel(self):
+        """Отмена задачи и выполняемого SQL запроса"""
+        with self._lock:
+            self._cancelled = True
+            if self._conn is not None:
+                try:
+                    self._conn.cancel()
+                except Exception as e:
+                    print(f"Не удалось отменить запрос: {e}")
+
+
+class SortSignals(QObject):
+    finished = pyqtSignal(object)    # выполненные перемещения (имя файла, откуда, куда)
+    failed = pyqtSignal(str)
+
+
+class SortTask(QRunnable):
+    """Сортировка файлов по папкам категорий в пуле потоков Qt"""
+
+    def __init__(self, sorter, recover_only=False):
+        super().__init__()
+        self.sorter = sorter
+        self.recover_only = recover_only
+        self.signals = SortSignals()
+
+    def run(self):
+        try:
+            moved = self.sorter.recover() if self.recover_only else self.sorter.run()
+            self.signals.finished.emit(moved)
+        except Exception as e:
+            print(f"Ошибка фоновой сортировки файлов: {e}")
+            self.signals.failed.emit(str(e))
+
+
+class IndexCompactTask(QRunnable):
+    """Слияние журнала поискового индекса с основным файлом в пуле потоков Qt"""
+
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+
+    def run(self):
+        try:
+            self.index.compact_if_needed()
+        except Exception as e:
+            print(f"Ошибка обновления поискового индекса: {e}")
+
+
+class RescoreTask(QRunnable):
+    """Пересчет оценок всех кандидатов в БД в пуле потоков Qt"""
+
+    def __init__(self, vacancy, index):
+        super().__init__()
+        self.vacancy = vacancy
+        self.index = index
+
+    def run(self):
+        from .batch import rescore_database
+
+        try:
+            rescore_database(self.vacancy, self.index)
+        except Exception as e:
+            print(f"Ошибка пересчета оценок кандидатов: {e}")
+
+
+class ScreenSignals(QObject):
+    finished = pyqtSignal(object)    # изменения категорий (имя файла, категория)
+    failed = pyqtSignal(str)
+
+
+class ScreenTask(QRunnable):
+    """Классификация всех кандидатов по профилю вакансии в пуле потоков Qt"""
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = ScreenSignals()
+
+    def run(self):
+        try:
+            self.signals.finished.emit(self.job.run())
+        except Exception as e:
+            print(f"Ошибка классификации по профилю вакансии: {e}")
+            self.signals.failed.emit(str(e))
@@ -1,18 +1,21 @@
 """
 Главный файл запуска приложения.
+
+Запуск идет в две части: сначала создается и отрисовывается окно, затем
+(finish_startup) загружаются обработчики с numpy, lxml и psycopg2, а
+подключение к БД выполняется в фоне. Время до первой отрисовки измеряет
+benchmarks/bench_startup.py.
 """
 
 import sys
 import os
+import time
 from PyQt6.QtWidgets import QMainWindow, QApplication, QMessageBox
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QEvent, QTimer, pyqtSignal
 
-# Сначала импортируем базу данных
-from database.connection import db
-print("База данных:", "подключена" if db.conn else "не подключена")
 
-# Теперь импортируем UI
+# Импортируем UI
 try:
     from ui.main_window import MainWindowUI
     print("UI модуль загружен")
@@ -21,20 +24,15 @@ except ImportError as e:
     QMessageBox.critical(None, "Ошибка", f"Не удалось загрузить интерфейс: {e}")
     sys.exit(1)
 
-# Импортируем обработчики
-try:
-    from handlers.resume_handler import ResumeHandler
-    from handlers.filter_handler import FilterHandler
-    print("Обработчики загружены")
-except ImportError as e:
-    print(f"Ошибка загрузки обработчиков: {e}")
-    QMessageBox.critical(None, "Ошибка", f"Не удалось загрузить обработчики: {e}")
-    sys.exit(1)
-
 
 class ResumeSorterApp(QMainWindow):
     """Главный класс приложения"""
     
+    FILTER_DELAY_MS = 300
+    
+    # Результат фонового подключения к БД (из потока подключения в поток GUI)
+    database_ready = pyqtSignal(bool)
+    
     def __init__(self):
         super().__init__()
         print("Инициализация приложения...")
@@ -43,7 +41,6 @@ class ResumeSorterApp(QMainWindow):
         self.setGeometry(100, 100, 1350, 900)
         
         # Настройки приложения
-        self.keywords_suitable = ["python", "sql", "django", "flask", "hr", "менеджер", "аналитик"]
         self.resume_dir = "resumes"
         self.sorted_dir = os.path.join(self.resume_dir, "sorted")
         
@@ -52,8 +49,14 @@ class ResumeSorterApp(QMainWindow):
         os.makedirs(self.sorted_dir, exist_ok=True)
         print(f"Директории созданы: {self.resume_dir}, {self.sorted_dir}")
         
-        # Данные кандидатов
-        self.candidates = {}
+        # Данные кандидатов (CandidateStore: словарь имя файла -> Candidate с колонками
+        # для фильтрации) и обработчики создаются в finish_startup
+        self.candidates = None
+        self.candidate_pager = None
+        self.resume_handler = None
+        self.filter_handler = None
+        self._startup_finished = False
+        self._created_at = time.perf_counter()
         
         try:
             # Инициализация UI
@@ -62,6 +65,37 @@ class ResumeSorterApp(QMainWindow):
             self.setCentralWidget(self.ui)
             print("Интерфейс создан")
             
+            # Остальная инициализация - после первой отрисовки окна
+            self.ui.installEventFilter(self)
+            self.database_ready.connect(self._on_database_ready)
+            
+        except Exception as e:
+            print(f"✗ Ошибка инициализации приложения: {e}")
+            import traceback
+            traceback.print_exc()
+            QMessageBox.critical(self, "Ошибка инициализации", str(e))
+    
+    def eventFilter(self, obj, event):
+        if obj is self.ui and event.type() == QEvent.Type.Paint and not self._startup_finished:
+            self.ui.removeEventFilter(self)
+            QTimer.singleShot(0, self.finish_startup)
+        return super().eventFilter(obj, event)
+    
+    def finish_startup(self):
+        """Вторая часть запуска: обработчики, сигналы и фоновое подключение к БД"""
+        if self._startup_finished:
+            return
+        self._startup_finished = True
+        print(f"Окно отрисовано через {(time.perf_counter() - self._created_at) * 1000:.0f} мс")
+        
+        try:
+            from database import db
+            from database.candidate_store import CandidateStore
+            from handlers.resume_handler import ResumeHandler
+            from handlers.filter_handler import FilterHandler
+            
+            self.candidates = CandidateStore()
+            
             # Инициализация обработчиков
             print("Инициализация обработчиков...")
             self.resume_handler = ResumeHandler(self)
@@ -73,12 +107,27 @@ class ResumeSorterApp(QMainWindow):
             self.ui.btn_load.clicked.connect(self.load_resume)
             self.ui.btn_analyze.clicked.connect(self.analyze_and_sort)
             self.ui.btn_reset.clicked.connect(self.reset_filters)  # Новая кнопка
+            self.ui.btn_cancel_load.clicked.connect(self.resume_handler.cancel_ingest)
+            self.ui.btn_prev_page.clicked.connect(self.filter_handler.prev_page)
+            self.ui.btn_next_page.clicked.connect(self.filter_handler.next_page)
+            
+            # Повторная фильтрация после паузы в изменении фильтров
+            self.filter_timer = QTimer(self)
+            self.filter_timer.setSingleShot(True)
+            self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+            self.filter_timer.timeout.connect(self.filter_handler.start_filters)
             print("Сигналы подключены")
             
-            # Загружаем кандидатов из БД если есть
-            self.load_candidates_from_db()
+            # Подключение в фоне: окно не ждет таймаута недоступного сервера. Загрузка,
+            # анализ и фильтры обращаются к БД (db.is_connected ждет подключения),
+            # поэтому они включаются только в _on_database_ready
+            for button in (self.ui.btn_load, self.ui.btn_analyze, self.ui.btn_reset):
+                button.setEnabled(False)
+            self.statusBar().showMessage("Подключение к базе данных...")
+            db.start_async(self.database_ready.emit)
             
-            print("✓ Приложение инициализировано успешно")
+            print(f"✓ Приложение инициализировано успешно "
+                  f"({(time.perf_counter() - self._created_at) * 1000:.0f} мс)")
             
         except Exception as e:
             print(f"✗ Ошибка инициализации приложения: {e}")
@@ -86,49 +135,79 @@ class ResumeSorterApp(QMainWindow):
             traceback.print_exc()
             QMessageBox.critical(self, "Ошибка инициализации", str(e))
     
+    def _on_database_ready(self, connected):
+        """Завершение фонового подключения к БД (поток GUI)"""
+        from handlers.watcher import WatchConfig
+        
+        print("База данных:", "подключена" if connected else "не подключена")
+        self.statusBar().showMessage("База данных подключена" if connected
+                                     else "База данных недоступна, данные хранятся только в памяти", 10000)
+        for button in (self.ui.btn_load, self.ui.btn_analyze, self.ui.btn_reset):
+            button.setEnabled(True)
+        self.ui.filters_changed.connect(self.filter_timer.start)
+        try:
+            # Загружаем кандидатов из БД если есть
+            self.load_candidates_from_db()
+            # Кандидаты, разобранные прежними ключевыми словами или шаблонами, обновляются в фоне
+            self.resume_handler.check_parser_version()
+            # Сортировка файлов, прерванная при прошлом запуске, доводится до конца
+            self.filter_handler.recover_sorting()
+            
+            # Папка входящих (RESUME_INBOX_DIR или секция [watch] в database.ini)
+            watch_config = WatchConfig.load()
+            if watch_config.inbox:
+                self.resume_handler.start_watch(watch_config)
+        except Exception as e:
+            print(f"Ошибка загрузки данных после подключения к БД: {e}")
+    
     def load_candidates_from_db(self):
-        """Загрузка кандидатов из базы данных"""
-        if not db.conn:
+        """Загрузка первой страницы кандидатов из базы данных, остальные - при прокрутке"""
+        from database import db
+        from database.pager import CandidatePager
+        
+        if not db.is_connected:
             print("БД не подключена, пропускаем загрузку кандидатов")
             return
         
+        self.candidate_pager = CandidatePager()
+        model = self.ui.candidate_model
+        model.details_provider = self.get_candidate_about
+        model.set_fetcher(lambda: not self.candidate_pager.exhausted, self.load_more_candidates)
+        self.load_more_candidates()
+        if not self.candidates:
+            print("В базе данных пока нет кандидатов")
+    
+    def load_more_candidates(self):
+        """Загрузка следующей страницы кандидатов в список"""
+        if self.candidate_pager is None or self.candidate_pager.exhausted:
+            return
+        
         try:
-            from database.models import Candidate
-            
-            results = db.fetch_all("SELECT * FROM candidates ORDER BY created_at DESC")
-            if results:
-                print(f"Загружено {len(results)} кандидатов из БД")
-                for row in results:
-                    candidate = Candidate({
-                        'filename': row['filename'],
-                        'fio': row['fio'],
-                        'age': row['age'],
-                        'experience': row['experience'],
-                        'education': row['education'],
-                        'salary': row['salary'],
-                        'about': row['about'],
-                        'source_file': row['source_file'],
-                        'original_category': row['status'],
-                        'category_color': row['category_color']
-                    })
-                    self.candidates[row['filename']] = candidate
-                
-                # Обновляем список в UI
-                self.ui.update_candidate_list(self.candidates)
-            else:
-                print("В базе данных пока нет кандидатов")
-                
+            page = self.candidate_pager.next_page()
+            # Загруженные в этом сеансе резюме уже есть в списке
+            new = [c for c in page if c.filename not in self.candidates]
+            self.candidates.update((c.filename, c) for c in new)
+            self.ui.add_candidates(new)
+            if page:
+                print(f"Загружено {self.candidate_pager.loaded} кандидатов из БД"
+                      + ("" if self.candidate_pager.exhausted else ", остальные - при прокрутке списка"))
         except Exception as e:
             print(f"Ошибка загрузки кандидатов из БД: {e}")
     
+    def get_candidate_about(self, filename):
+        """Поле "о себе" кандидата (для постранично загруженных - из БД по запросу)"""
+        from database.pager import load_about
+        
+        candidate = self.candidates.get(filename)
+        return load_about(candidate) if candidate is not None else ""
+    
     def load_resume(self):
         """Загрузка резюме"""
         print("Загрузка резюме...")
         try:
-            added = self.resume_handler.load_resume()
-            if added:
-                print(f"Добавлено {len(added)} резюме")
-                self.ui.update_candidate_list(self.candidates)
+            queued = self.resume_handler.load_resume()
+            if queued:
+                print(f"Поставлено в обработку {len(queued)} резюме")
             else:
                 print("Резюме не добавлены")
         except Exception as e:
@@ -146,10 +225,9 @@ class ResumeSorterApp(QMainWindow):
         """Анализ и сортировка"""
         print("\n=== НАЧАЛО АНАЛИЗА ===")
         try:
-            html_result = self.filter_handler.apply_filters()
-            self.ui.result_display.setHtml(html_result)
-            self.filter_handler.sort_files()
-            print("=== АНАЛИЗ ЗАВЕРШЕН ===")
+            # Фильтрация и сортировка файлов в фоне, результат выводит FilterHandler
+            self.filter_timer.stop()
+            self.filter_handler.start_filters(sort_files=True)
         except Exception as e:
             print(f"Ошибка анализа: {e}")
             QMessageBox.critical(self, "Ошибка", f"Ошибка при анализе: {e}")
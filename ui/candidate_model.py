@@ -0,0 +1,102 @@
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class CandidateListModel(QAbstractListModel):
+    """
+    Модель списка кандидатов для QListView.
+
+    Представление запрашивает данные только видимых строк, поэтому объекты
+    строк не создаются на каждого кандидата. Изменения приходят точечными
+    уведомлениями о вставке, изменении и удалении строк.
+    """
+
+    FilenameRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._candidates = []
+        self._rows = {}  # имя файла -> номер строки
+        # "О себе" для всплывающей подсказки: функция(имя файла) -> текст
+        self.details_provider = None
+        self._can_fetch_more = None
+        self._fetch_more = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._candidates)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._candidates):
+            return None
+
+        candidate = self._candidates[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return candidate.fio
+        if role == self.FilenameRole:
+            return candidate.filename
+        if role == Qt.ItemDataRole.ToolTipRole and self.details_provider is not None:
+            try:
+                return f"О себе: {self.details_provider(candidate.filename) or '—'}"
+            except Exception as e:
+                print(f"Ошибка загрузки данных кандидата: {e}")
+        return None
+
+    # Подгрузка страниц: QListView вызывает fetchMore при прокрутке к концу
+
+    def set_fetcher(self, can_fetch_more, fetch_more):
+        """Функции проверки и загрузки следующей страницы кандидатов"""
+        self._can_fetch_more = can_fetch_more
+        self._fetch_more = fetch_more
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._can_fetch_more is None:
+            return False
+        return bool(self._can_fetch_more())
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid() and self._fetch_more is not None:
+            self._fetch_more()
+
+    # Изменение списка
+
+    def reset(self, candidates):
+        """Полная замена списка"""
+        self.beginResetModel()
+        self._candidates = list(candidates)
+        self._rows = {c.filename: row for row, c in enumerate(self._candidates)}
+        self.endResetModel()
+
+    def append(self, candidates):
+        """Добавление кандидатов в конец списка"""
+        candidates = [c for c in candidates if c.filename not in self._rows]
+        if not candidates:
+            return
+        first = len(self._candidates)
+        self.beginInsertRows(QModelIndex(), first, first + len(candidates) - 1)
+        for row, candidate in enumerate(candidates, first):
+            self._rows[candidate.filename] = row
+        self._candidates.extend(candidates)
+        self.endInsertRows()
+
+    def update(self, candidate):
+        """Замена данных кандидата, который уже есть в списке (иначе - добавление)"""
+        row = self._rows.get(candidate.filename)
+        if row is None:
+            self.append([candidate])
+            return
+        self._candidates[row] = candidate
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove(self, filename):
+        """Удаление кандидата из списка"""
+        row = self._rows.pop(filename, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._candidates[row]
+        for candidate in self._candidates[row:]:
+            self._rows[candidate.filename] -= 1
+        self.endRemoveRows()
+
+    def filename_at(self, row):
+        return self._candidates[row].filename
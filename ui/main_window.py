@@ -1,11 +1,16 @@
-from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt
-from .widgets import StyledButton, FilterSpinBox
+from PyQt6.QtWidgets import (
+    QAbstractItemView, QCheckBox, QGridLayout, QGroupBox, QHBoxLayout, QLabel,
+    QListView, QProgressBar, QPushButton, QTextEdit, QVBoxLayout, QWidget
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from .widgets import StyledButton, FilterLineEdit, FilterSpinBox
+from .candidate_model import CandidateListModel
 
 
 class MainWindowUI(QWidget):
     """Пользовательский интерфейс главного окна"""
     
+    filters_changed = pyqtSignal()  # изменен любой фильтр
     def __init__(self, parent):
         super().__init__(parent)
         self.parent_app = parent
@@ -92,6 +97,9 @@ class MainWindowUI(QWidget):
         # Образование - все выбраны по умолчанию
         for chk in self.edu_checkboxes.values():
             chk.setChecked(True)
+        
+        # Поиск по тексту
+        self.search_text.clear()
     
     def create_filter_box(self):
         """Создание панели фильтров"""
@@ -177,8 +185,22 @@ class MainWindowUI(QWidget):
             self.edu_checkboxes[name] = chk
             row += 1
 
+        # Поиск по полному тексту резюме (правая колонка под образованием)
+        search_title = QLabel("Поиск по тексту резюме")
+        search_title.setStyleSheet("color:#e74c3c; font-weight:bold; font-size:16px; margin-top:10px;")
+        grid.addWidget(search_title, row, 2, 1, 2, Qt.AlignmentFlag.AlignCenter)
+        self.search_text = FilterLineEdit("например: kubernetes python")
+        grid.addWidget(self.search_text, row + 1, 2, 1, 2)
+
         # Добавляем немного растяжения внизу
         grid.setRowStretch(8, 1)
+        
+        # Любое изменение фильтра - сигнал для повторной фильтрации
+        for chk in [self.chk_suitable, self.chk_not, *self.edu_checkboxes.values()]:
+            chk.toggled.connect(self.filters_changed.emit)
+        for spin in (self.age_from, self.age_to, self.exp_from, self.exp_to, self.sal_from, self.sal_to):
+            spin.valueChanged.connect(self.filters_changed.emit)
+        self.search_text.textChanged.connect(self.filters_changed.emit)
 
         filter_box.setLayout(grid)
         return filter_box
@@ -207,24 +229,60 @@ class MainWindowUI(QWidget):
         c_layout = QVBoxLayout()
         c_layout.setContentsMargins(20, 35, 20, 20)
 
-        self.file_list = QListWidget()
+        # Список на модели: отрисовываются только видимые строки, следующая
+        # страница из БД подгружается через fetchMore при прокрутке к концу
+        self.candidate_model = CandidateListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.candidate_model)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.file_list.setStyleSheet("""
             background:#111;
             color:white;
             border-radius:12px;
             font-size:15px;
-            QListWidget::item {
+            QListView::item {
                 padding:12px;
                 background:#222;
                 margin:3px;
                 border-radius:8px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background:#e74c3c;
                 color:white;
             }
         """)
         c_layout.addWidget(self.file_list)
+
+        # Прогресс фоновой загрузки
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                background:#222;
+                color:white;
+                border:2px solid #e74c3c;
+                border-radius:8px;
+                text-align:center;
+            }
+            QProgressBar::chunk {
+                background:#e74c3c;
+                border-radius:6px;
+            }
+        """)
+        self.btn_cancel_load = QPushButton("Отмена")
+        self.btn_cancel_load.setStyleSheet("""
+            background:#333;
+            color:white;
+            border:2px solid #e74c3c;
+            border-radius:8px;
+            padding:4px 12px;
+        """)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.btn_cancel_load)
+        c_layout.addLayout(progress_layout)
+        self.hide_progress()
+
         cand_box.setLayout(c_layout)
         
         return cand_box
@@ -267,12 +325,67 @@ class MainWindowUI(QWidget):
             </div>
         """)
         res_layout.addWidget(self.result_display)
+        
+        # Переключение страниц результата
+        page_layout = QHBoxLayout()
+        self.btn_prev_page = QPushButton("◀")
+        self.btn_next_page = QPushButton("▶")
+        self.result_page_label = QLabel()
+        self.result_page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        for btn in (self.btn_prev_page, self.btn_next_page):
+            btn.setStyleSheet("""
+                background:#333;
+                color:white;
+                border:2px solid #e74c3c;
+                border-radius:8px;
+                padding:4px 16px;
+            """)
+        page_layout.addWidget(self.btn_prev_page)
+        page_layout.addWidget(self.result_page_label, stretch=1)
+        page_layout.addWidget(self.btn_next_page)
+        res_layout.addLayout(page_layout)
+        self.set_result_page(0, 1, 0)
         res_box.setLayout(res_layout)
         
         return res_box
     
     def update_candidate_list(self, candidates):
         """Обновление списка кандидатов"""
-        self.file_list.clear()
-        for candidate in candidates.values():
-            self.file_list.addItem(candidate.fio)
\ No newline at end of file
+        self.candidate_model.reset(candidates.values())
+    
+    def add_candidate(self, candidate):
+        """Добавление одного кандидата в список"""
+        self.candidate_model.append([candidate])
+    
+    def add_candidates(self, candidates):
+        """Добавление кандидатов в конец списка"""
+        self.candidate_model.append(candidates)
+    
+    def update_candidate(self, candidate):
+        """Обновление кандидата в списке (повторный импорт резюме)"""
+        self.candidate_model.update(candidate)
+    
+    def remove_candidate(self, filename):
+        """Удаление кандидата из списка"""
+        self.candidate_model.remove(filename)
+    
+    def set_result_page(self, page, pages, total):
+        """Подпись и кнопки страниц результата; при одной странице скрыты"""
+        self.result_page_label.setText(f"Страница {page + 1} из {pages}  (найдено {total})")
+        self.btn_prev_page.setEnabled(page > 0)
+        self.btn_next_page.setEnabled(page < pages - 1)
+        for widget in (self.btn_prev_page, self.btn_next_page, self.result_page_label):
+            widget.setVisible(pages > 1)
+    
+    def set_progress(self, done, total):
+        """Отображение прогресса загрузки резюме"""
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"{done} / {total}")
+        self.progress_bar.show()
+        self.btn_cancel_load.show()
+    
+    def hide_progress(self):
+        """Скрытие прогресса загрузки"""
+        self.progress_bar.hide()
+        self.btn_cancel_load.hide()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import *
+from PyQt6.QtWidgets import QLineEdit, QPushButton, QSpinBox
 from PyQt6.QtCore import Qt
 
 
@@ -52,4 +52,23 @@ class FilterSpinBox(QSpinBox):
                 width:20px;
             }
         """)
-        self.setSpecialValueText("Не важно")  # Изменено с " " на "Не важно"
\ No newline at end of file
+        self.setSpecialValueText("Не важно")  # Изменено с " " на "Не важно"
+
+
+class FilterLineEdit(QLineEdit):
+    """Стилизованное поле ввода для фильтров"""
+    
+    def __init__(self, placeholder="", parent=None):
+        super().__init__(parent)
+        self.setPlaceholderText(placeholder)
+        self.setClearButtonEnabled(True)
+        self.setStyleSheet("""
+            QLineEdit {
+                background:#222;
+                color:white;
+                border:2px solid #e74c3c;
+                border-radius:8px;
+                padding:8px;
+                font-size:14px;
+            }
+        """)